@@ -1,5 +1,5 @@
 import streamlit as st
-from .rut_parser import generar_ruts_validos, limpiar_ruts, es_rut_valido
+from .rut_parser import generar_ruts_validos, limpiar_ruts, separar_ruts_por_validez
 
 
 def encabezado_html(titulo: str, descripcion: str):
@@ -108,8 +108,7 @@ def mostrar_columna_acciones(ruts_limpios):
 # 💡 Agrega esta función para validar los RUTs ingresados
 def obtener_ruts_validos_y_invalidos(texto_input):
     ruts_limpios, ruts_cortos = limpiar_ruts(texto_input)
-    ruts_validos = [rut for rut in ruts_limpios if es_rut_valido(rut)]
-    ruts_invalidos = [rut for rut in ruts_limpios if not es_rut_valido(rut)]
+    ruts_validos, ruts_invalidos = separar_ruts_por_validez(ruts_limpios)
     return ruts_validos, ruts_invalidos, ruts_cortos
 
 
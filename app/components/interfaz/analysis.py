@@ -1,9 +1,36 @@
 import streamlit as st
-from components.simulador import (analizar_colisiones_detallado, resolver_colisiones_multiples)
+from components.simulador import (analizar_colisiones_detallado, resolver_colisiones_multiples,
+    simular_trayectorias, conflictos_legibles)
 from core.Graph_ellipse import Grafico_3D_multiple, grafico_2d_interactivo
-from core.collision.CollisionAnalysis import tipo_colision, analizar_colision_detallada
+from core.collision.CollisionMatrix import contar_colisiones
+from core.collision.CollisionPipeline import PIPELINE_COLISIONES
 from components.Contenedor import encabezado_html
 
+# Métodos de resolución ofrecidos en la interfaz (claves de MODOS_RESOLUCION)
+METODOS_RESOLUCION = {
+    'secuencial': "Secuencial (par por par)",
+    'vectorizado': "Vectorizado (toda la flota por paso)",
+    'cluster': "Por clusters de conflicto",
+    'optimizado': "Optimizado (desplazamiento mínimo)",
+}
+
+# Ventajas y costos de cada método (ayuda del selector)
+AYUDA_METODOS = (
+    "Secuencial: separa par por par; desplazamientos menores que el vectorizado.\n\n"
+    "Vectorizado: mueve toda la flota en cada paso y no depende del orden de los drones. "
+    "En promedio necesita menos iteraciones, pero no en todas las flotas, y desplaza "
+    "alrededor de un 20 % más a los drones.\n\n"
+    "Por clusters: resuelve cada grupo en conflicto por separado; los demás drones no se mueven.\n\n"
+    "Optimizado: desplazamiento mínimo; más lento, limitado a unos segundos."
+)
+
+# Mensajes para los motivos de parada del resolvedor con plazo
+MOTIVOS_PARADA = {
+    'plazo': "Se agotó el tiempo límite; se muestra la mejor configuración encontrada.",
+    'estancado': "El resolvedor dejó de mejorar; se muestra la mejor configuración encontrada.",
+    'max_iter': "Se alcanzó el máximo de iteraciones; se muestra la mejor configuración encontrada.",
+}
+
 def mostrar_analisis_colisiones(elipses, ruts_limpios):
     """Pestaña original de análisis de colisiones"""
     st.markdown(encabezado_html("Comparación visual y detección de colisiones", "Sección visual de gráfica 2D, 3D, colisión (si existe)"), unsafe_allow_html=True)
@@ -28,14 +55,11 @@ def mostrar_analisis_colisiones(elipses, ruts_limpios):
         mensaje = f"- {r['rut1']} vs {r['rut2']}: {estado}"
         
         if r["colision"]:
-            elipse1 = next(e for e, rut in zip(elipses, ruts_limpios) if rut == r['rut1'])
-            elipse2 = next(e for e, rut in zip(elipses, ruts_limpios) if rut == r['rut2'])
-            
-            tipo = tipo_colision(elipse1, elipse2)
-            st.error(f"{tipo} : {mensaje}")
+            # Reutilizar el análisis ya calculado por analizar_colisiones_detallado
+            analisis = r['analisis_completo']
+            st.error(f"{analisis['tipo']} : {mensaje}")
             
             with st.expander(f"Ver detalles de colisión entre {r['rut1']} y {r['rut2']}"):
-                analisis = analizar_colision_detallada(elipse1, elipse2)
                 
                 # Información básica de colisión
                 st.write(f"**Distancia entre centros:** {analisis['distancia_centros']}")
@@ -77,22 +101,37 @@ def mostrar_analisis_colisiones(elipses, ruts_limpios):
             <p><strong>Total de operaciones por detección de colisiones:</strong> {estadisticas['total_comparaciones']}</p>
             <p style="color:red">🔴 <strong>Total de colisiones:</strong> {total_colisiones}</p>
             <p style="color:green">🟢 <strong>Sin colisión:</strong> {total_sin_colisiones}</p>
+            <p>📐 <strong>Intersecciones geométricas exactas:</strong> {estadisticas['colisiones_geometricas']}</p>
         </div>
         """, unsafe_allow_html=True)
 
+    # Pares decididos por cada etapa del pipeline, acumulados con las flotas analizadas
+    with st.expander("⏱️ Etapas de detección exacta"):
+        st.table(PIPELINE_COLISIONES.resumen())
+
 def mostrar_resolucion_colisiones(elipses, ruts_limpios):
     """Nueva pestaña para resolución automática de colisiones"""
     st.markdown(encabezado_html("Resolución automática de colisiones",
             "Sistema inteligente para separar drones en colisión y generar configuraciones seguras"),unsafe_allow_html=True)
 
     # Controles para la resolución
+    col_modo, col_plazo = st.columns(2)
+    with col_modo:
+        modo = st.selectbox("Método de resolución", list(METODOS_RESOLUCION), key="modo_resolucion",
+                            format_func=METODOS_RESOLUCION.get, help=AYUDA_METODOS)
+    with col_plazo:
+        tiempo_limite = st.number_input("Tiempo límite (s)", min_value=0.0, value=0.0, step=0.5,
+                                        key="tiempo_limite_resolucion",
+                                        help="0 = sin límite. Con límite se usa el paso vectorizado y se "
+                                             "devuelve la mejor configuración encontrada dentro del plazo.")
     ejecutar_resolucion = st.button("🔧 Resolver Colisiones", type="primary", key="btn_resolver_colisiones")
 
     if ejecutar_resolucion:
         st.session_state.mostrar_resolucion = True
 
         with st.spinner("Resolviendo colisiones..."):
-            resultado_resolucion = resolver_colisiones_multiples(elipses, ruts_limpios)
+            resultado_resolucion = resolver_colisiones_multiples(elipses, ruts_limpios, modo,
+                                                                 tiempo_limite or None)
 
             # Guardar resultado en session_state
             st.session_state.resultado_resolucion = resultado_resolucion
@@ -105,7 +144,12 @@ def mostrar_resolucion_colisiones(elipses, ruts_limpios):
         if resultado_resolucion.get('colisiones_resueltas'):
             st.success("✅ ¡Todas las colisiones han sido resueltas!")
         else:
-            st.warning("⚠️ Algunas colisiones aún persisten. Intenta aumentar las iteraciones.")
+            st.warning(f"⚠️ Algunas colisiones aún persisten. "
+                       f"{MOTIVOS_PARADA.get(resultado_resolucion.get('motivo_parada'), 'Intenta aumentar las iteraciones.')}")
+
+        traza = resultado_resolucion.get('traza')
+        if traza is not None:
+            mostrar_traza_resolucion(traza, resultado_resolucion['mejor_iteracion'])
 
         # Comparación visual: antes y después
         st.markdown("### Comparación: Antes vs Después")
@@ -141,14 +185,54 @@ def mostrar_resolucion_colisiones(elipses, ruts_limpios):
 
         # Análisis post-resolución
         st.markdown("### Verificación Post-Resolución")
-        resultados_post, _ = analizar_colisiones_detallado(
-            resultado_resolucion.get('elipses_resueltas', []),
-            ruts_limpios
-        )
-
-        colisiones_restantes = sum(1 for r in resultados_post if r.get("colision"))
+        colisiones_restantes = contar_colisiones(resultado_resolucion.get('elipses_resueltas', []))
 
         if colisiones_restantes == 0:
             st.success(f"🎉 Configuración completamente segura: {len(elipses)} drones sin colisiones")
         else:
-            st.error(f"⚠️ Aún quedan {colisiones_restantes} colisiones por resolver")
\ No newline at end of file
+            st.error(f"⚠️ Aún quedan {colisiones_restantes} colisiones por resolver")
+
+def mostrar_traza_resolucion(traza, mejor_iteracion):
+    """Convergencia del resolvedor con plazo: colisiones y solapamiento por iteración"""
+    with st.expander("📈 Traza de convergencia"):
+        st.caption(f"{len(traza)} configuraciones evaluadas en {traza['tiempo'][-1]:.2f} s; "
+                   f"se devuelve la de la iteración {mejor_iteracion}")
+        st.line_chart({'Colisiones': traza['colisiones']})
+        st.line_chart({'Solapamiento máximo': traza['solapamiento_maximo'],
+                       'Desplazamiento total': traza['desplazamiento_total']})
+
+def mostrar_trayectorias(elipses, ruts_limpios):
+    """Pestaña de simulación de trayectorias: cada dron recorre su elipse paso a paso"""
+    st.markdown(encabezado_html("Simulación de trayectorias",
+            "Los drones recorren sus elipses y se registran los acercamientos menores a la distancia segura"),
+            unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        pasos = st.number_input("Pasos de simulación", min_value=10, max_value=10000, value=500, step=10,
+                                key="pasos_trayectorias")
+    with col2:
+        distancia_segura = st.number_input("Distancia segura", min_value=0.1, value=1.0, step=0.1,
+                                           key="distancia_trayectorias")
+
+    if st.button("▶️ Simular trayectorias", key="btn_simular_trayectorias"):
+        with st.spinner("Simulando trayectorias..."):
+            st.session_state.trayectorias_generadas = simular_trayectorias(
+                elipses, ruts_limpios, pasos=int(pasos), distancia_segura=distancia_segura, semilla=0)
+            st.session_state.mostrar_trayectorias = True
+
+    resultado = st.session_state.get("trayectorias_generadas")
+    # Descartar simulaciones de un conjunto de RUTs anterior
+    if st.session_state.get("mostrar_trayectorias") and resultado and resultado['ruts'] == ruts_limpios:
+        resumen = resultado['resumen']
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Conflictos", resumen['conflictos'])
+        col2.metric("Pares en conflicto", resumen['pares_en_conflicto'])
+        col3.metric("Duración máxima (pasos)", resumen['duracion_maxima'])
+
+        if resumen['conflictos'] == 0:
+            st.success(f"🎉 Sin conflictos en {resumen['pasos_simulados']} pasos")
+        else:
+            # Solo se formatean las filas que se muestran
+            conflictos = resultado['conflictos'][:200]
+            st.table(list(conflictos_legibles(conflictos, resultado['ruts'])))
@@ -2,7 +2,7 @@ import streamlit as st
 from core.Items_ellipse import ElipseVisual
 from core.Graph_ellipse import grafico_2d_simple
 from components.Contenedor import encabezado_html
-from .analysis import mostrar_analisis_colisiones, mostrar_resolucion_colisiones
+from .analysis import mostrar_analisis_colisiones, mostrar_resolucion_colisiones, mostrar_trayectorias
 def Mostrar_datos_encapsulado_elipse(elipse, rut):
     try:
         e_canonica = elipse.ecuacion_canonica()
@@ -60,10 +60,11 @@ def Mostrar_datos_encapsulado_elipse(elipse, rut):
 def mostrar_datos(elipses, ruts_limpios):    
     st.markdown("---")
     
-    tab1, tab2, tab3 = st.tabs([
+    tab1, tab2, tab3, tab4 = st.tabs([
         "Datos de elipses", 
         "Gráficos y Colisiones", 
         "Resolución de Colisiones",
+        "Trayectorias",
     ])
     
     with tab1:
@@ -97,4 +98,6 @@ def mostrar_datos(elipses, ruts_limpios):
     with tab2:
         mostrar_analisis_colisiones(elipses, ruts_limpios)
     with tab3:
-        mostrar_resolucion_colisiones(elipses, ruts_limpios)
\ No newline at end of file
+        mostrar_resolucion_colisiones(elipses, ruts_limpios)
+    with tab4:
+        mostrar_trayectorias(elipses, ruts_limpios)
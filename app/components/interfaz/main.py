@@ -1,8 +1,9 @@
 import streamlit as st
 from components.estilo import estilo_add
-from components.Contenedor import mostrar_tarjeta_izquierda, mostrar_entrada_ruts, mostrar_columna_acciones
-from components.rut_parser import limpiar_ruts
+from components.Contenedor import (mostrar_tarjeta_izquierda, mostrar_entrada_ruts, mostrar_columna_acciones,
+    obtener_ruts_validos_y_invalidos)
 from components.simulador import procesar_ruts
+from core.collision.CollisionTracker import claves_por_ocurrencia
 from .state import inicializar_session_state
 from .ellipses import mostrar_datos
 
@@ -25,12 +26,15 @@ def mostrar_interfaz():
 
     with col_der:
         ruts_input = mostrar_entrada_ruts()
-        ruts_limpios, ruts_cortos = limpiar_ruts(ruts_input)
+        ruts_limpios, ruts_invalidos, ruts_cortos = obtener_ruts_validos_y_invalidos(ruts_input)
         
         # Mostrar mensaje para RUTs muy cortos
         if ruts_cortos:
             st.info(f"RUTs muy cortos (requieren al menos 7 dígitos): {', '.join(ruts_cortos)}")
         
+        if ruts_invalidos:
+            st.warning(f"RUTs inválidos detectados: {', '.join(ruts_invalidos)}")
+        
         if mostrar_columna_acciones(ruts_limpios):
             elipses, errores = procesar_ruts(ruts_limpios)
             
@@ -43,6 +47,9 @@ def mostrar_interfaz():
                 st.session_state.mostrar_datos = False
             else:
                 st.success("✅ Elipses generadas correctamente.")
+                seguidor = st.session_state.seguidor_colisiones
+                seguidor.sincronizar(dict(zip(claves_por_ocurrencia(ruts_limpios), elipses)))
+                st.caption(f"Pares en colisión: {seguidor.total_colisiones()}")
                 st.session_state.elipses_generadas = elipses
                 st.session_state.ruts_procesados = ruts_limpios
                 st.session_state.mostrar_datos = True
@@ -1,4 +1,5 @@
 import streamlit as st
+from core.collision.CollisionTracker import SeguidorColisiones
 
 def inicializar_session_state():
     """Inicializa las variables de session_state si no existen"""
@@ -17,4 +18,7 @@ def inicializar_session_state():
     if 'resultado_resolucion' not in st.session_state:
         st.session_state.resultado_resolucion = None
     if 'trayectorias_generadas' not in st.session_state:
-        st.session_state.trayectorias_generadas = None
\ No newline at end of file
+        st.session_state.trayectorias_generadas = None
+    if 'seguidor_colisiones' not in st.session_state:
+        # Colisiones actuales, actualizadas solo para los RUTs que cambian entre reejecuciones
+        st.session_state.seguidor_colisiones = SeguidorColisiones()
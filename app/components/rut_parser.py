@@ -8,6 +8,7 @@ Validación y generación de RUT
 '''
 
 from core.rut_aleatorio import generar_varios_ruts
+from core.rut_vectorizado import validar_ruts
 
 def limpiar_ruts(texto):
     """
@@ -48,22 +49,17 @@ def es_rut_valido(rut):
     """
     Valida sintácticamente un RUT chileno (formato y dígito verificador).
     """
-    rut = rut.upper().replace("-", "").replace(".", "")
-    if len(rut) < 9 or not rut[:-1].isdigit():
-        return False
+    return bool(validar_ruts([rut])[0])
 
-    cuerpo = rut[:-1]
-    dv = rut[-1]
-
-    suma = 0
-    multiplo = 2
-    for d in reversed(cuerpo):
-        suma += int(d) * multiplo
-        multiplo = 9 if multiplo == 7 else multiplo + 1
-
-    resto = 11 - (suma % 11)
-    dv_calc = 'K' if resto == 10 else '0' if resto == 11 else str(resto)
-    return dv == dv_calc
+def separar_ruts_por_validez(ruts):
+    """
+    Valida todos los RUTs en un solo paso y devuelve (válidos, inválidos)
+    conservando el orden de entrada.
+    """
+    mascara = validar_ruts(ruts) if ruts else []
+    ruts_validos = [rut for rut, valido in zip(ruts, mascara) if valido]
+    ruts_invalidos = [rut for rut, valido in zip(ruts, mascara) if not valido]
+    return ruts_validos, ruts_invalidos
 
 def generar_ruts_validos(n=3):
     return generar_varios_ruts(n)
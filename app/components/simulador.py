@@ -3,68 +3,70 @@
 Lógica de simulación principal con todas las funcionalidades integradas
 """
 from core.Math_ellipse import generar_elipse_desde_rut
-from core.collision.CollisionDetection import hay_colision_mejorada
-from core.collision.CollisionAnalysis import (analizar_colision_detallada, tipo_colision)
-from core.collision.CollisionResolver import (resolver_colisiones_automatico, obtener_estadisticas_resolucion)
+from core.Fleet_ellipse import generar_flota_desde_ruts
+from core.Fleet_ellipse import como_flota
+from core.collision.SpatialIndex import filtrar_en_colision
+from core.collision.CollisionCache import analisis_pares_en_cache
+from core.collision.ParallelAnalysis import TAMANO_BLOQUE_PARES
+from core.collision.CollisionTable import tabla_resultados
+from core.collision.CollisionPipeline import PIPELINE_COLISIONES
+from core.collision.CollisionClassification import TIPOS_COLISION, clasificar_lote, estadisticas_tipos
+from core.collision.CollisionResolver import (resolver_colisiones, resolver_colisiones_con_plazo,
+                                              obtener_estadisticas_resolucion)
+from core.Trajectory_ellipse import SimuladorTrayectorias, resumen_conflictos
 
 def procesar_ruts(ruts):
     """
     Intenta generar elipses desde RUTs dados. Devuelve dos listas: elipses válidas y errores.
+    Las elipses se generan en bloque; solo los RUTs inválidos se reprocesan para informar el error.
     """
-    elipses = []
-    errores = []
     par_impar = True if len(ruts) % 2 == 0 else False
+    flota, validos = generar_flota_desde_ruts(ruts, par_impar)
 
-    for rut in ruts:
+    errores = []
+    for rut in (rut for rut, valido in zip(ruts, validos) if not valido):
         try:
-            elipse = generar_elipse_desde_rut(rut,par_impar)
-            elipses.append(elipse)
+            generar_elipse_desde_rut(rut, par_impar)
         except Exception as e:
             errores.append(f"{rut}: {e}")
     
-    return elipses, errores
+    return flota.a_lista(), errores
 
-def analizar_colisiones_detallado(elipses, ruts):
+def analizar_colisiones_detallado(elipses, ruts, trabajadores=1, tamano_bloque=TAMANO_BLOQUE_PARES,
+                                  columnar=False):
     """
     Análisis detallado de colisiones con clasificación por tipos
+    Acepta una lista de Elipse o una ElipseFleet
+    Con trabajadores > 1 (o None = todos los núcleos) los pares se analizan en procesos paralelos
+    Con columnar=True devuelve (tabla, estadisticas): una fila por par en colisión con índices
+    y códigos enteros; los RUTs y etiquetas se obtienen al mostrar con filas_legibles(tabla, ruts)
     """
+    # Fase amplia: solo los pares cercanos llegan al análisis detallado (memoizado entre reejecuciones)
+    pares_i, pares_j, colisiones_geometricas = _pares_en_colision(elipses)
+    if columnar:
+        return _analizar_colisiones_columnar(elipses, pares_i, pares_j, colisiones_geometricas)
+    
+    analisis_pares = analisis_pares_en_cache(elipses, pares_i, pares_j, trabajadores, tamano_bloque)
+    # Clasificación vectorizada con códigos enteros; las estadísticas salen de un bincount
+    codigos_tipo, _ = clasificar_lote(elipses, pares_i, pares_j)
+    colisiones = dict(zip(zip(pares_i.tolist(), pares_j.tolist()), zip(codigos_tipo.tolist(), analisis_pares)))
     resultados_detallados = []
-    estadisticas = {
-        'total_comparaciones': len(elipses) * (len(elipses) - 1) // 2,
-        'sin_colision': 0,
-        'colision_leve': 0,
-        'colision_moderada': 0,
-        'colision_severa': 0,
-        'colision_inclusion': 0
-    }
+    estadisticas = estadisticas_tipos(codigos_tipo, len(elipses) * (len(elipses) - 1) // 2)
+    estadisticas['colisiones_geometricas'] = colisiones_geometricas
     
     for i in range(len(elipses)):
         for j in range(i + 1, len(elipses)):
-            elipse1, elipse2 = elipses[i], elipses[j]
             rut1, rut2 = ruts[i], ruts[j]
             
-            if hay_colision_mejorada(elipse1, elipse2):
-                analisis = analizar_colision_detallada(elipse1, elipse2)
-                tipo = tipo_colision(elipse1, elipse2)
-                
+            if (i, j) in colisiones:
+                codigo, analisis = colisiones[(i, j)]
                 resultado = {
                     "rut1": rut1,
                     "rut2": rut2,
                     "colision": True,
-                    "tipo": tipo,
+                    "tipo": TIPOS_COLISION[codigo],
                     "analisis_completo": analisis
                 }
-                
-                # Clasificar para estadísticas
-                if 'inclusión' in tipo.lower():
-                    estadisticas['colision_inclusion'] += 1
-                elif 'severa' in tipo.lower():
-                    estadisticas['colision_severa'] += 1
-                elif 'moderada' in tipo.lower():
-                    estadisticas['colision_moderada'] += 1
-                elif 'leve' in tipo.lower():
-                    estadisticas['colision_leve'] += 1
-                    
             else:
                 resultado = {
                     "rut1": rut1,
@@ -73,15 +75,37 @@ def analizar_colisiones_detallado(elipses, ruts):
                     "tipo": "Sin colisión",
                     "analisis_completo": None
                 }
-                estadisticas['sin_colision'] += 1
             
             resultados_detallados.append(resultado)
     
     return resultados_detallados, estadisticas
 
-def resolver_colisiones_multiples(elipses, ruts):
+def _analizar_colisiones_columnar(elipses, pares_i, pares_j, colisiones_geometricas):
+    tabla = tabla_resultados(elipses, pares_i, pares_j)
+    estadisticas = estadisticas_tipos(tabla['tipo'], len(elipses) * (len(elipses) - 1) // 2)
+    estadisticas['colisiones_geometricas'] = colisiones_geometricas
+    return tabla, estadisticas
+
+def _pares_en_colision(elipses):
+    """
+    Una sola fase amplia por análisis: el pipeline compartido (que acumula los contadores por
+    etapa con las flotas reales) evalúa los pares cercanos con la prueba exacta, y de esos mismos
+    pares se filtran los que chocan según hay_colision_mejorada.
+    Devuelve (pares_i, pares_j, número de pares que se intersectan geométricamente)
+    """
+    flota = como_flota(elipses)
+    i, j, exacta = PIPELINE_COLISIONES.evaluar(flota)
+    pares_i, pares_j = filtrar_en_colision(flota, i, j)
+    return pares_i, pares_j, int(exacta.sum())
+
+def resolver_colisiones_multiples(elipses, ruts, modo='secuencial', tiempo_limite=None, trabajadores=1):
     """
     NUEVA FUNCIÓN: Resuelve automáticamente las colisiones entre múltiples elipses
+    - modo: 'secuencial' (par por par), 'vectorizado' (toda la flota por paso), 'cluster'
+      u 'optimizado' (desplazamiento mínimo)
+    - tiempo_limite: segundos; si se indica, se usa el resolvedor con plazo (paso vectorizado)
+      y el resultado incluye la traza por iteración y el motivo de parada
+    - trabajadores: procesos para resolver los clusters en paralelo (modo 'cluster')
     """
     if len(elipses) < 2:
         return {
@@ -92,7 +116,13 @@ def resolver_colisiones_multiples(elipses, ruts):
         }
     
     # Resolver colisiones
-    elipses_resueltas = resolver_colisiones_automatico(elipses)
+    seguimiento = {}
+    if tiempo_limite is not None:
+        seguimiento = resolver_colisiones_con_plazo(elipses, tiempo_limite)
+        elipses_resueltas = seguimiento.pop('elipses_resueltas')
+    else:
+        opciones = {'trabajadores': trabajadores} if modo == 'cluster' else {}
+        elipses_resueltas = resolver_colisiones(elipses, modo, **opciones)
     
     # Obtener estadísticas
     estadisticas = obtener_estadisticas_resolucion(elipses, elipses_resueltas)
@@ -102,5 +132,32 @@ def resolver_colisiones_multiples(elipses, ruts):
         'elipses_resueltas': elipses_resueltas,
         'colisiones_resueltas': estadisticas['colisiones_resueltas'] if estadisticas else False,
         'estadisticas': estadisticas,
+        'ruts': ruts,
+        **seguimiento
+    }
+
+def simular_trayectorias(elipses, ruts, pasos=500, distancia_segura=1.0, velocidad_lineal=1.0, semilla=None):
+    """
+    NUEVA FUNCIÓN: Simula el recorrido de cada dron sobre su elipse y registra los conflictos
+    (pares de drones a menos de distancia_segura) como intervalos de pasos
+    """
+    simulador = SimuladorTrayectorias(elipses, velocidad_lineal=velocidad_lineal, semilla=semilla)
+    conflictos = simulador.simular(pasos, distancia_segura)
+    
+    return {
+        'conflictos': conflictos,
+        'resumen': resumen_conflictos(conflictos, pasos),
+        'simulador': simulador,
         'ruts': ruts
     }
+
+def conflictos_legibles(conflictos, ruts):
+    """Filas de texto del registro de conflictos (solo para mostrar)"""
+    for fila in conflictos:
+        yield {
+            'rut1': ruts[fila['i']],
+            'rut2': ruts[fila['j']],
+            'desde_paso': int(fila['inicio']),
+            'hasta_paso': int(fila['fin']),
+            'distancia_minima': round(float(fila['distancia_minima']), 2)
+        }
@@ -0,0 +1,202 @@
+# core/Fleet_ellipse.py
+"""
+Contenedor vectorizado para flotas completas de elipses (struct-of-arrays):
+- h, k, a, b como arreglos contiguos de NumPy (float64)
+- Orientación compacta como arreglo booleano (True = horizontal)
+- Vistas compatibles con Elipse para la API existente
+- Generación masiva de flotas a partir de columnas de RUTs
+
+Las funciones de colisión, resolución y gráficos aceptan indistintamente
+una lista de Elipse o una ElipseFleet (ver como_flota).
+"""
+
+import numpy as np
+from .Math_ellipse import Elipse, muestrear_perimetros
+from .rut_vectorizado import ruts_a_matriz_digitos, validar_ruts
+
+
+def _escalar(valor):
+    """Convierte un valor de NumPy a escalar de Python (int si es entero, para no alterar las ecuaciones)"""
+    valor = float(valor)
+    return int(valor) if valor.is_integer() else valor
+
+
+def _campo(nombre):
+    """Crea una propiedad de la vista que lee y escribe directamente en el arreglo de la flota"""
+    def leer(self):
+        return _escalar(getattr(self._flota, nombre)[self._indice])
+
+    def escribir(self, valor):
+        getattr(self._flota, nombre)[self._indice] = valor
+
+    return property(leer, escribir)
+
+
+class ElipseVista:
+    """
+    Vista de una elipse dentro de una ElipseFleet.
+    Se comporta como Elipse (h, k, a, b, orientacion y sus métodos) sin copiar datos.
+    """
+    __slots__ = ('_flota', '_indice')
+
+    def __init__(self, flota, indice):
+        self._flota = flota
+        self._indice = indice
+
+    h = _campo('h')
+    k = _campo('k')
+    a = _campo('a')
+    b = _campo('b')
+
+    @property
+    def orientacion(self):
+        return "horizontal" if self._flota.horizontal[self._indice] else "vertical"
+
+    @orientacion.setter
+    def orientacion(self, valor):
+        self._flota.horizontal[self._indice] = valor == "horizontal"
+
+    # Reutilizar la lógica matemática de Elipse sobre la vista
+    ecuacion_canonica = Elipse.ecuacion_canonica
+    ecuacion_general = Elipse.ecuacion_general
+    calcular_puntos = Elipse.calcular_puntos
+
+    def a_elipse(self) -> Elipse:
+        """Materializa la vista como una Elipse independiente"""
+        return Elipse(self.h, self.k, self.a, self.b, self.orientacion)
+
+    def __repr__(self):
+        return f"ElipseVista(h={self.h}, k={self.k}, a={self.a}, b={self.b}, orientacion='{self.orientacion}')"
+
+
+class ElipseFleet:
+    """
+    Flota de elipses almacenada como arreglos paralelos.
+    Evita crear un objeto por dron y permite operar sobre toda la flota con NumPy.
+    """
+
+    def __init__(self, h, k, a, b, horizontal):
+        self.h = np.ascontiguousarray(h, dtype=np.float64).copy()
+        self.k = np.ascontiguousarray(k, dtype=np.float64).copy()
+        self.a = np.ascontiguousarray(a, dtype=np.float64).copy()
+        self.b = np.ascontiguousarray(b, dtype=np.float64).copy()
+        self.horizontal = np.ascontiguousarray(horizontal, dtype=bool).copy()
+
+        n = len(self.h)
+        if any(len(arr) != n for arr in (self.k, self.a, self.b, self.horizontal)):
+            raise ValueError("Todos los arreglos de la flota deben tener el mismo largo.")
+        if np.any(self.a <= 0) or np.any(self.b <= 0):
+            raise ValueError("Los valores de 'a' y 'b' deben ser positivos.")
+
+    @classmethod
+    def desde_elipses(cls, elipses):
+        """Construye la flota a partir de cualquier secuencia de objetos tipo Elipse"""
+        return cls(
+            [e.h for e in elipses],
+            [e.k for e in elipses],
+            [e.a for e in elipses],
+            [e.b for e in elipses],
+            [e.orientacion == "horizontal" for e in elipses],
+        )
+
+    def __len__(self):
+        return len(self.h)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, (int, np.integer)):
+            if indice < 0:
+                indice += len(self)
+            if not 0 <= indice < len(self):
+                raise IndexError("Índice fuera del rango de la flota.")
+            return ElipseVista(self, int(indice))
+        # Slices, máscaras o arreglos de índices devuelven una sub-flota (copia)
+        return ElipseFleet(self.h[indice], self.k[indice], self.a[indice], self.b[indice], self.horizontal[indice])
+
+    def __iter__(self):
+        return (ElipseVista(self, i) for i in range(len(self)))
+
+    def copia(self):
+        return ElipseFleet(self.h, self.k, self.a, self.b, self.horizontal)
+
+    def a_lista(self):
+        """Materializa la flota como lista de Elipse (para la interfaz)"""
+        return [vista.a_elipse() for vista in self]
+
+    def semiejes_xy(self):
+        """Semiejes paralelos a los ejes X e Y según la orientación de cada elipse"""
+        sx = np.where(self.horizontal, self.a, self.b)
+        sy = np.where(self.horizontal, self.b, self.a)
+        return sx, sy
+
+    def calcular_puntos(self, n=100):
+        """Perímetros de toda la flota como arreglo (m, n, 2)"""
+        return muestrear_perimetros(self.h, self.k, *self.semiejes_xy(), n=n)
+
+    def radios_efectivos(self):
+        """Radio medio (a+b)/2 usado por hay_colision_mejorada"""
+        return (self.a + self.b) / 2
+
+    def radios_maximos(self):
+        return np.maximum(self.a, self.b)
+
+
+def como_flota(elipses) -> ElipseFleet:
+    """Devuelve la misma flota o construye una a partir de una lista de elipses"""
+    if isinstance(elipses, ElipseFleet):
+        return elipses
+    return ElipseFleet.desde_elipses(elipses)
+
+
+def listas_parametros(elipses):
+    """
+    Devuelve (h, k, a, b, orientaciones) como listas de Python.
+    Para listas de Elipse conserva los valores originales (sin convertir a float).
+    """
+    if isinstance(elipses, ElipseFleet):
+        orientaciones = ["horizontal" if hz else "vertical" for hz in elipses.horizontal.tolist()]
+        return (elipses.h.tolist(), elipses.k.tolist(), elipses.a.tolist(),
+                elipses.b.tolist(), orientaciones)
+    return ([e.h for e in elipses], [e.k for e in elipses], [e.a for e in elipses],
+            [e.b for e in elipses], [e.orientacion for e in elipses])
+
+
+def flota_desde_digitos(digitos, grupo_impar=True):
+    """
+    Aplica las reglas de generar_elipse_desde_rut a una matriz de dígitos (N, 8).
+    Devuelve (flota, validos): la flota contiene solo las filas válidas, en orden,
+    y la máscara marca las filas descartadas (a o b igual a 0).
+    """
+    d = np.asarray(digitos, dtype=np.int64)
+    h, k = d[:, 0], d[:, 1]
+
+    if grupo_impar:
+        a_raw = d[:, 2] + d[:, 3]
+        b_raw = d[:, 4] + d[:, 5]
+        horizontal = d[:, 7] % 2 == 0
+    else:
+        a_raw = d[:, 5] + d[:, 6]
+        b_raw = d[:, 7] + d[:, 2]
+        horizontal = d[:, 3] % 2 == 0
+
+    # Asegurar que a sea mayor o igual que b
+    a = np.maximum(a_raw, b_raw)
+    b = np.minimum(a_raw, b_raw)
+    validos = b > 0
+
+    flota = ElipseFleet(h[validos], k[validos], a[validos], b[validos], horizontal[validos])
+    return flota, validos
+
+
+def generar_flota_desde_ruts(ruts, grupo_impar=True, validar_dv=False):
+    """
+    Versión masiva de generar_elipse_desde_rut para una columna completa de RUTs.
+    Devuelve (flota, validos); los RUTs con menos de 8 dígitos o con a/b nulos
+    quedan en False en la máscara en lugar de lanzar excepciones.
+    Con validar_dv=True también se descartan los RUTs con dígito verificador incorrecto.
+    """
+    digitos, validos = ruts_a_matriz_digitos(ruts)
+    if validar_dv:
+        validos &= validar_ruts(ruts)
+    flota, con_semiejes = flota_desde_digitos(digitos[validos], grupo_impar)
+    validos[validos] = con_semiejes
+    return flota, validos
@@ -1,6 +1,9 @@
 # app/core/Graph_ellipse.py
 from .Math_ellipse import Elipse
 from .Items_ellipse import ElipseVisual
+from .Fleet_ellipse import como_flota
+from .collision.Collision3D import (altitudes_por_capas, elipsoides_desde_flota, colision_elipsoides_lote,
+                                    pares_colision_3d, drones_en_colision)
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go
 import numpy as np
@@ -32,8 +35,8 @@ def grafico_2d_simple(elipse: Elipse, escala=1.0):
         elipse_ext = ElipseVisual(**elipse.__dict__)
         puntos_etiquetados = elipse_ext.puntos_con_etiquetas()
 
-    x_vals = [x * escala for x, _ in puntos]
-    y_vals = [y * escala for _, y in puntos]
+    x_vals = puntos[:, 0] * escala
+    y_vals = puntos[:, 1] * escala
 
     fig, ax = plt.subplots(figsize=(6, 6))
     fig.patch.set_facecolor('#121212')
@@ -99,21 +102,19 @@ def grafico_2d_simple(elipse: Elipse, escala=1.0):
 
 # GRAFICO 2D INTERACTIVO - MULTIPLE ELIPSE =>
 
-def grafico_2d_interactivo(elipses: list, ruts_limpios: list, escala=1.0):
+def grafico_2d_interactivo(elipses, ruts_limpios: list, escala=1.0):
     fig = go.Figure()
     
     # Asegurarse de que tenemos elipses y RUTs
     if not elipses or not ruts_limpios or len(elipses) != len(ruts_limpios):
         return fig
     
+    # Muestrear todos los perímetros de una sola vez (m, 100, 2)
+    perimetros = como_flota(elipses).calcular_puntos(n=100) * escala
+
     for idx, elipse in enumerate(elipses):
-        # Verificar que la elipse tiene los atributos necesarios
-        if not hasattr(elipse, 'calcular_puntos'):
-            continue
-            
-        puntos = elipse.calcular_puntos(n=100)
-        x_vals = [p[0] * escala for p in puntos]
-        y_vals = [p[1] * escala for p in puntos]
+        x_vals = perimetros[idx, :, 0]
+        y_vals = perimetros[idx, :, 1]
         color = colores[idx % len(colores)]
 
         fig.add_trace(go.Scatter(
@@ -168,34 +169,35 @@ def generar_elipsoide(cx, cy, cz, rx, ry, rz, n=30):
     return x, y, z
 
 def detectar_colision(c1, r1, c2, r2):
-    distancia = np.linalg.norm(np.array(c1) - np.array(c2))
-    return distancia < (max(r1) + max(r2))
-
-def Grafico_3D_multiple(elipses: list, ruts_limpios: list, escala=0.5):
+    """Colisión exacta entre dos elipsoides alineados a los ejes (centros y semiejes 3D)"""
+    c1, r1, c2, r2 = (np.asarray(v, dtype=np.float64).reshape(1, 3) for v in (c1, r1, c2, r2))
+    return bool(colision_elipsoides_lote(c1, r1, c2, r2)[0])
+
+def Grafico_3D_multiple(elipses, ruts_limpios: list, escala=0.5, altitudes=None, semieje_vertical=None):
+    """
+    Elipsoides de la flota a su altitud real
+    - altitudes: por defecto una capa por dron (z = idx * 2)
+    - semieje_vertical: por defecto el semieje menor b
+    Los semiejes en X e Y siguen la orientación de cada elipse (semiejes_xy), igual que en 2D
+    Se colorean en rojo ambos drones de cada par que se intersecta en 3D
+    """
     fig = go.Figure()
 
-    centros = []
-    radios = []
-
-    # Construir y guardar datos para colisión
-    for elipse in elipses:
-        centros.append((elipse.h * escala, elipse.k * escala, 0))  # centro en z=0
-        radios.append((elipse.a * escala, elipse.b * escala, elipse.b * escala))  # usar 'b' para Z como aproximación
+    flota = como_flota(elipses)
+    if altitudes is None:
+        altitudes = altitudes_por_capas(len(flota))
+    if semieje_vertical is not None:
+        semieje_vertical = np.asarray(semieje_vertical, dtype=np.float64) * escala
+    centros, radios = elipsoides_desde_flota(flota, altitudes, semieje_vertical, escala)
+    colisiona = drones_en_colision(len(flota), *pares_colision_3d(centros, radios))
 
-    # Recorrer elipses para graficar y detectar colisión
-    for idx, elipse in enumerate(elipses):
+    for idx in range(len(flota)):
         cx, cy, cz = centros[idx]
         rx, ry, rz = radios[idx]
 
-        colisiona = False
-        for jdx in range(idx):
-            if detectar_colision(centros[idx], radios[idx], centros[jdx], radios[jdx]):
-                colisiona = True
-                break
-
-        color = '#FF3D00' if colisiona else colores[idx % len(colores)]
+        color = '#FF3D00' if colisiona[idx] else colores[idx % len(colores)]
 
-        x, y, z = generar_elipsoide(cx, cy, cz + idx * 2, rx, ry, rz)
+        x, y, z = generar_elipsoide(cx, cy, cz, rx, ry, rz)
 
         fig.add_trace(go.Surface(
             x=x, y=y, z=z,
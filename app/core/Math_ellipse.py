@@ -6,12 +6,46 @@ Archivo de lógica matemática para el cálculo de una elipse central:
 - Área
 - Cálculo de puntos sobre la elipse
 - Generación de elipse a partir del RUT
+- Muestreo vectorizado de perímetros (tablas cos/sin cacheadas)
 
-OPTIMIZADO: Usa funciones matemáticas nativas de Python
+OPTIMIZADO: Usa NumPy para muestrear perímetros en bloque
 """
 
 from dataclasses import dataclass
-from math import cos, sin, pi
+from functools import lru_cache
+import numpy as np
+
+@lru_cache(maxsize=32)
+def tabla_trigonometrica(n: int):
+    """
+    Tablas (cos, sin) del círculo unitario para los ángulos 2πi/n, i = 0..n-1.
+    Se calculan una sola vez por n y se comparten (arreglos de solo lectura).
+    """
+    angulos = 2 * np.pi * np.arange(n) / n
+    cosenos, senos = np.cos(angulos), np.sin(angulos)
+    cosenos.flags.writeable = False
+    senos.flags.writeable = False
+    return cosenos, senos
+
+def muestrear_perimetros(h, k, sx, sy, n=100):
+    """
+    Muestrea n puntos del perímetro de una o varias elipses alineadas a los ejes.
+    sx, sy son los semiejes paralelos a X e Y.
+    - Escalares: devuelve un arreglo (n, 2)
+    - Arreglos de largo m: devuelve un arreglo (m, n, 2)
+    """
+    cosenos, senos = tabla_trigonometrica(n)
+    h, k, sx, sy = (np.asarray(v, dtype=np.float64)[..., None] for v in (h, k, sx, sy))
+    puntos = np.empty(np.broadcast(h, cosenos).shape + (2,))
+    puntos[..., 0] = h + sx * cosenos
+    puntos[..., 1] = k + sy * senos
+    return puntos
+
+def semiejes_xy(elipse):
+    """Semiejes paralelos a X e Y según la orientación de la elipse"""
+    if elipse.orientacion == "horizontal":
+        return elipse.a, elipse.b
+    return elipse.b, elipse.a
 
 @dataclass
 class Elipse:
@@ -66,19 +100,9 @@ class Elipse:
     
     def calcular_puntos(self, n=100):
         """
-        OPTIMIZADO: Usa sin y cos para mejor rendimiento
+        OPTIMIZADO: Devuelve un arreglo (n, 2) usando las tablas cos/sin cacheadas
         """
-        puntos = []
-        for i in range(n):
-            angulo = 2 * pi * i / n
-            if self.orientacion == "horizontal":
-                x = self.h + self.a * cos(angulo)
-                y = self.k + self.b * sin(angulo)
-            else:
-                x = self.h + self.b * cos(angulo)
-                y = self.k + self.a * sin(angulo)
-            puntos.append((x, y))
-        return puntos
+        return muestrear_perimetros(self.h, self.k, *semiejes_xy(self), n=n)
 
 def generar_elipse_desde_rut(rut: str, grupo_impar=True) -> Elipse:
     """
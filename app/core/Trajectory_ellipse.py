@@ -0,0 +1,135 @@
+# core/Trajectory_ellipse.py
+"""
+Simulación de trayectorias de drones sobre sus elipses, paso a paso:
+- Cada dron recorre su elipse con velocidad angular y fase propias
+- Las posiciones de toda la flota en un paso se calculan con una sola operación de arreglos
+- Las violaciones de distancia entre drones se detectan con un cKDTree por paso
+- El resultado es un registro compacto de conflictos: un intervalo por par y episodio
+
+OPTIMIZADO: no se guarda la trayectoria completa, solo los conflictos
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+from .Fleet_ellipse import como_flota
+
+DTYPE_CONFLICTOS = np.dtype([
+    ('i', np.int32),
+    ('j', np.int32),
+    ('inicio', np.int32),              # primer paso con conflicto
+    ('fin', np.int32),                 # último paso con conflicto (incluido)
+    ('distancia_minima', np.float64),  # menor distancia observada en el intervalo
+])
+
+def perimetros_aproximados(sx, sy):
+    """Perímetro de cada elipse (aproximación de Ramanujan)"""
+    sx, sy = np.asarray(sx, dtype=np.float64), np.asarray(sy, dtype=np.float64)
+    return np.pi * (3 * (sx + sy) - np.sqrt((3 * sx + sy) * (sx + 3 * sy)))
+
+class SimuladorTrayectorias:
+    """
+    Avanza todos los drones de una flota sobre sus elipses.
+    - velocidades: velocidad angular por dron (rad por paso); por defecto se deriva de
+      velocidad_lineal para que todos recorran la misma distancia por paso
+    - fases: ángulo inicial por dron; por defecto aleatorio con la semilla dada
+    """
+
+    def __init__(self, elipses, velocidades=None, fases=None, velocidad_lineal=1.0, semilla=None):
+        self.flota = como_flota(elipses)
+        n = len(self.flota)
+        self.sx, self.sy = self.flota.semiejes_xy()
+
+        if velocidades is None:
+            velocidades = 2 * np.pi * velocidad_lineal / perimetros_aproximados(self.sx, self.sy)
+        if fases is None:
+            fases = np.random.default_rng(semilla).uniform(0, 2 * np.pi, n)
+        self.velocidades = np.broadcast_to(np.asarray(velocidades, dtype=np.float64), (n,)).copy()
+        self.fases = np.broadcast_to(np.asarray(fases, dtype=np.float64), (n,)).copy()
+
+    def __len__(self):
+        return len(self.flota)
+
+    def posiciones(self, paso):
+        """Posiciones (n, 2) de todos los drones en el paso dado"""
+        angulos = self.fases + self.velocidades * paso
+        posiciones = np.empty((len(self), 2))
+        posiciones[:, 0] = self.flota.h + self.sx * np.cos(angulos)
+        posiciones[:, 1] = self.flota.k + self.sy * np.sin(angulos)
+        return posiciones
+
+    def trayectorias(self, pasos):
+        """Posiciones (pasos, n, 2) para graficar; usar solo con horizontes cortos"""
+        angulos = self.fases + self.velocidades * np.arange(pasos)[:, None]
+        return np.stack((self.flota.h + self.sx * np.cos(angulos),
+                         self.flota.k + self.sy * np.sin(angulos)), axis=-1)
+
+    def simular(self, pasos, distancia_segura):
+        """
+        Recorre los pasos 0..pasos-1 y devuelve el registro de conflictos (DTYPE_CONFLICTOS):
+        una fila por par (i < j) y por intervalo continuo de pasos con distancia < distancia_segura
+        """
+        n = len(self)
+        eventos = []
+        # Conflictos abiertos: clave i*n + j (ordenadas), paso de inicio y distancia mínima
+        claves = np.empty(0, dtype=np.int64)
+        inicios = np.empty(0, dtype=np.int64)
+        minimos = np.empty(0)
+
+        for paso in range(pasos):
+            posiciones = self.posiciones(paso)
+            pares = cKDTree(posiciones).query_pairs(distancia_segura, output_type='ndarray')
+            pares = np.sort(pares, axis=1)
+            distancias = np.hypot(*(posiciones[pares[:, 0]] - posiciones[pares[:, 1]]).T)
+            # query_pairs incluye distancia == distancia_segura; el conflicto es estricto
+            cercanos = distancias < distancia_segura
+            actuales = pares[cercanos, 0].astype(np.int64) * n + pares[cercanos, 1]
+            orden = np.argsort(actuales)
+            actuales, distancias = actuales[orden], distancias[cercanos][orden]
+
+            # Cerrar los conflictos que ya no continúan
+            continua = np.isin(claves, actuales, assume_unique=True)
+            if not continua.all():
+                eventos.append((claves[~continua], inicios[~continua], paso - 1, minimos[~continua]))
+
+            # Extender los que continúan y abrir los nuevos
+            posicion = np.searchsorted(claves[continua], actuales)
+            previas = claves[continua]
+            existe = posicion < len(previas)
+            existe[existe] = previas[posicion[existe]] == actuales[existe]
+            nuevos_inicios = np.full(len(actuales), paso, dtype=np.int64)
+            nuevos_minimos = distancias.copy()
+            nuevos_inicios[existe] = inicios[continua][posicion[existe]]
+            nuevos_minimos[existe] = np.minimum(minimos[continua][posicion[existe]], distancias[existe])
+            claves, inicios, minimos = actuales, nuevos_inicios, nuevos_minimos
+
+        if len(claves):
+            eventos.append((claves, inicios, pasos - 1, minimos))
+        return _registro_conflictos(eventos, n)
+
+def _registro_conflictos(eventos, n):
+    total = sum(len(claves) for claves, _, _, _ in eventos)
+    registro = np.empty(total, dtype=DTYPE_CONFLICTOS)
+    inicio = 0
+    for claves, inicios, fin, minimos in eventos:
+        filas = slice(inicio, inicio + len(claves))
+        registro['i'][filas] = claves // n
+        registro['j'][filas] = claves % n
+        registro['inicio'][filas] = inicios
+        registro['fin'][filas] = fin
+        registro['distancia_minima'][filas] = minimos
+        inicio += len(claves)
+    orden = np.lexsort((registro['j'], registro['i'], registro['inicio']))
+    return registro[orden]
+
+def resumen_conflictos(registro, pasos):
+    """Estadísticas del registro de conflictos"""
+    duraciones = registro['fin'] - registro['inicio'] + 1
+    pares = np.unique(registro['i'].astype(np.int64) * (1 << 32) + registro['j'])
+    return {
+        'pasos_simulados': pasos,
+        'conflictos': len(registro),
+        'pares_en_conflicto': len(pares),
+        'pasos_en_conflicto': int(duraciones.sum()),
+        'duracion_maxima': int(duraciones.max()) if len(registro) else 0,
+        'distancia_minima': float(registro['distancia_minima'].min()) if len(registro) else None,
+    }
@@ -0,0 +1,115 @@
+# core/collision/Collision3D.py
+"""
+Colisiones en 3D: cada zona de dron es un elipsoide alineado a los ejes con
+altitud (centro en Z) y semieje vertical configurables.
+- Fase amplia con cKDTree sobre los centros 3D y rechazo por cajas envolventes
+- Prueba exacta con el haz de cuádricas: con el elipsoide 1 normalizado a la esfera unitaria,
+  f(λ) = det(λA - B) es una cuártica y los elipsoides están separados si y solo si
+  f tiene dos raíces reales negativas distintas (la misma convención que en 2D)
+"""
+from math import sqrt
+import numpy as np
+from scipy.spatial import cKDTree
+from core.Fleet_ellipse import como_flota
+from .IntersectionPoints import _raices_lote
+
+def distancia_centros_3d(e1, e2, z1=0.0, z2=0.0) -> float:
+    """Distancia entre centros con altitudes z1, z2 (las elipses no guardan altitud)"""
+    dx = e1.h - e2.h
+    dy = e1.k - e2.k
+    dz = z1 - z2
+    return sqrt(dx**2 + dy**2 + dz**2)
+
+def altitudes_por_capas(n, separacion=2.0):
+    """Una capa de altitud por dron (la disposición usada por el gráfico 3D)"""
+    return np.arange(n) * separacion
+
+def elipsoides_desde_flota(elipses, altitudes=0.0, semieje_vertical=None, escala=1.0):
+    """
+    Centros (n, 3) y semiejes (n, 3) de los elipsoides de la flota
+    - altitudes: escalar o arreglo por dron (no se escala)
+    - semieje_vertical: escalar o arreglo; por defecto el semieje menor b
+    """
+    flota = como_flota(elipses)
+    n = len(flota)
+    sx, sy = flota.semiejes_xy()
+    if semieje_vertical is None:
+        semieje_vertical = flota.b * escala
+    centros = np.column_stack((flota.h * escala, flota.k * escala,
+                               np.broadcast_to(np.asarray(altitudes, dtype=np.float64), (n,))))
+    semiejes = np.column_stack((sx * escala, sy * escala,
+                                np.broadcast_to(np.asarray(semieje_vertical, dtype=np.float64), (n,))))
+    if np.any(semiejes <= 0):
+        raise ValueError("Los semiejes de los elipsoides deben ser positivos.")
+    return centros, semiejes
+
+def _cuartica_separacion(centros1, semiejes1, centros2, semiejes2):
+    """
+    Coeficientes (m, 5) de f(λ) = Π(λ - g_i)(1 - λ) - λ Σ_i w_i Π_{k≠i}(λ - g_k)
+    con m = (c2 - c1)/s1, g_i = (s1_i/s2_i)², w_i = g_i m_i²
+    """
+    m = (centros2 - centros1) / semiejes1
+    g = (semiejes1 / semiejes2)**2
+    w = g * m * m
+    g1, g2, g3 = g.T
+    w1, w2, w3 = w.T
+
+    # Π(λ - g_i) = λ³ + P1 λ² + P2 λ + P3
+    P1 = -(g1 + g2 + g3)
+    P2 = g1*g2 + g1*g3 + g2*g3
+    P3 = -g1*g2*g3
+    # Σ w_i Π_{k≠i}(λ - g_k) = S0 λ² + S1 λ + S2
+    S0 = w1 + w2 + w3
+    S1 = -(w1*(g2 + g3) + w2*(g1 + g3) + w3*(g1 + g2))
+    S2 = w1*g2*g3 + w2*g1*g3 + w3*g1*g2
+    return np.column_stack((-np.ones(len(m)), 1 - P1 - S0, P1 - P2 - S1, P2 - P3 - S2, P3))
+
+def colision_elipsoides_lote(centros1, semiejes1, centros2, semiejes2, tolerancia=1e-9):
+    """
+    Prueba exacta para arreglos de pares de elipsoides (m, 3)
+    Las tangencias y las raíces casi dobles se reportan como colisión (sin falsos negativos)
+    """
+    raices = _raices_lote(_cuartica_separacion(centros1, semiejes1, centros2, semiejes2))
+    escala = 1 + np.abs(raices.real)
+    negativas = (np.abs(raices.imag) <= 1e-12 * escala) & (raices.real < 0)
+    valores = np.sort(np.where(negativas, raices.real, -np.inf), axis=1)
+    # Dos raíces negativas reales y distintas: las dos mayores, separadas más que la tolerancia
+    dos_negativas = np.isfinite(valores[:, -2])
+    separadas = np.zeros(len(valores), dtype=bool)
+    mayor, segunda = valores[dos_negativas, -1], valores[dos_negativas, -2]
+    separadas[dos_negativas] = mayor - segunda > tolerancia * (1 + np.abs(segunda))
+    return ~separadas
+
+def pares_colision_3d(centros, semiejes, tolerancia=1e-9):
+    """Pares (i, j), i < j, en orden lexicográfico, de elipsoides que se intersectan"""
+    vacio = np.empty(0, dtype=np.intp)
+    if len(centros) < 2:
+        return vacio, vacio
+
+    # Fase amplia: esferas circunscritas
+    alcance = 2 * semiejes.max() * (1 + 1e-9)
+    pares = cKDTree(centros).query_pairs(alcance, output_type='ndarray')
+    if len(pares) == 0:
+        return vacio, vacio
+    pares = np.sort(pares, axis=1)
+    i, j = pares[:, 0], pares[:, 1]
+
+    # Cajas envolventes 3D
+    cerca = np.all(np.abs(centros[i] - centros[j]) <= (semiejes[i] + semiejes[j]) * (1 + 1e-6), axis=1)
+    i, j = i[cerca], j[cerca]
+
+    colision = colision_elipsoides_lote(centros[i], semiejes[i], centros[j], semiejes[j], tolerancia)
+    i, j = i[colision], j[colision]
+    orden = np.lexsort((j, i))
+    return i[orden].astype(np.intp), j[orden].astype(np.intp)
+
+def colisiones_3d(elipses, altitudes=0.0, semieje_vertical=None, escala=1.0):
+    """Pares en colisión de la flota modelada como elipsoides"""
+    return pares_colision_3d(*elipsoides_desde_flota(elipses, altitudes, semieje_vertical, escala))
+
+def drones_en_colision(n, i, j):
+    """Máscara (n,) con True para ambos integrantes de cada par en colisión"""
+    mascara = np.zeros(n, dtype=bool)
+    mascara[i] = True
+    mascara[j] = True
+    return mascara
@@ -3,10 +3,102 @@
 Módulo para el análisis detallado de colisiones entre elipses
 Utiliza las funciones mejoradas de CollisionDetection e incluye puntos de intersección
 """
+from collections.abc import Mapping
 from math import pi
-from .CollisionDetection import (distancia_centros, hay_colision_mejorada, hay_colision_precisa,
-    distancia_minima_entre_elipses, punto_dentro_de_elipse)
-from .IntersectionPoints import encontrar_puntos_interseccion, formatear_puntos_interseccion
+import numpy as np
+from core.Math_ellipse import Elipse
+from .CollisionDetection import distancia_centros, hay_colision_mejorada, hay_colision_precisa
+from .DistanceSolver import distancia_minima_precisa
+from .CollisionClassification import centro_contenido, clasificar_colision, nivel_riesgo
+from .CollisionMatrix import pares_colisiones_matriz
+from .SpatialIndex import pares_candidatos
+from .CollisionGraph import GrafoColisiones
+from .CollisionTable import tabla_resultados
+from .IntersectionPoints import puntos_interseccion_algebraicos, formatear_puntos_interseccion
+from .ParallelAnalysis import analizar_pares_paralelo, TAMANO_BLOQUE_PARES
+
+# ==================== RESULTADO PEREZOSO ====================
+def _campos_puntos(elipse1, elipse2, colision):
+    puntos_interseccion = []
+    puntos_interseccion_str = "No hay intersección"
+    if colision:
+        # Solución algebraica exacta; se redondea solo para mostrar
+        puntos_interseccion = [(round(x, 3), round(y, 3))
+                               for x, y in puntos_interseccion_algebraicos(elipse1, elipse2)]
+        puntos_interseccion_str = formatear_puntos_interseccion(puntos_interseccion)
+    return {
+        'puntos_interseccion': puntos_interseccion,
+        'puntos_interseccion_str': puntos_interseccion_str,
+        'numero_puntos_interseccion': len(puntos_interseccion)
+    }
+
+def _campo_distancia_minima(elipse1, elipse2, colision):
+    # Distancia mínima entre perímetros (solver de Newton en vez de fuerza bruta)
+    distancia_minima = 0 if colision else distancia_minima_precisa(elipse1, elipse2)[0]
+    return {'distancia_minima_perimetros': round(distancia_minima, 2)}
+
+def _campo_colision_precisa(elipse1, elipse2, colision):
+    return {'colision_precisa': hay_colision_precisa(elipse1, elipse2) if colision else False}
+
+# Orden de las claves (el mismo del diccionario original) y función que calcula cada campo perezoso
+_CLAVES_ANALISIS = (
+    'distancia_centros', 'suma_radios_maximos', 'suma_radios_minimos', 'diferencia_radios',
+    'porcentaje_solapamiento', 'distancia_minima_perimetros', 'tipo', 'nivel_riesgo',
+    'area_elipse1', 'area_elipse2', 'orientacion_1', 'orientacion_2', 'colision_precisa',
+    'puntos_interseccion', 'puntos_interseccion_str', 'numero_puntos_interseccion'
+)
+_CAMPOS_PEREZOSOS = {
+    'distancia_minima_perimetros': _campo_distancia_minima,
+    'colision_precisa': _campo_colision_precisa,
+    'puntos_interseccion': _campos_puntos,
+    'puntos_interseccion_str': _campos_puntos,
+    'numero_puntos_interseccion': _campos_puntos,
+}
+
+class AnalisisColision(Mapping):
+    """
+    Resultado de analizar_colision_detallada compatible con dict (solo lectura).
+    Los campos baratos se reciben ya calculados; los costosos se calculan
+    la primera vez que se leen y quedan guardados.
+    Al serializarse (p. ej. al volver de un proceso trabajador) se calculan todos los
+    campos antes de empaquetar, así el costo queda en el proceso que lo generó.
+    """
+    __slots__ = ('_datos', '_elipse1', '_elipse2', '_colision')
+
+    def __init__(self, datos, elipse1, elipse2, colision):
+        self._datos = dict(datos)
+        # Copias independientes: la flota original puede moverse después
+        self._elipse1 = Elipse(elipse1.h, elipse1.k, elipse1.a, elipse1.b, elipse1.orientacion)
+        self._elipse2 = Elipse(elipse2.h, elipse2.k, elipse2.a, elipse2.b, elipse2.orientacion)
+        self._colision = colision
+
+    def __getitem__(self, clave):
+        if clave not in self._datos:
+            if clave not in _CAMPOS_PEREZOSOS:
+                raise KeyError(clave)
+            self._datos.update(_CAMPOS_PEREZOSOS[clave](self._elipse1, self._elipse2, self._colision))
+        return self._datos[clave]
+
+    def __iter__(self):
+        return iter(_CLAVES_ANALISIS)
+
+    def __len__(self):
+        return len(_CLAVES_ANALISIS)
+
+    def __contains__(self, clave):
+        return clave in _CLAVES_ANALISIS
+
+    def calculado(self, clave):
+        """True si el campo ya está disponible sin cálculos adicionales"""
+        return clave in self._datos
+
+    def __reduce__(self):
+        for clave in _CAMPOS_PEREZOSOS:
+            self[clave]
+        return (AnalisisColision, (self._datos, self._elipse1, self._elipse2, self._colision))
+
+    def __repr__(self):
+        return f"AnalisisColision({dict(self)!r})"
 
 def tipo_colision(elipse1, elipse2):
     """
@@ -17,33 +109,18 @@ def tipo_colision(elipse1, elipse2):
     
     # Usar la función mejorada de distancia entre centros
     distancia_centros_val = distancia_centros(elipse1, elipse2)
-    
-    # Radios efectivos, se estima el el radio medio (a+b)/2
-    radio_efectivo_1 = (elipse1.a + elipse1.b) / 2
-    radio_efectivo_2 = (elipse2.a + elipse2.b) / 2
-    
-    # Verificar si hay inclusión completa
-    if punto_dentro_de_elipse(elipse1.h, elipse1.k, elipse2) or \
-       punto_dentro_de_elipse(elipse2.h, elipse2.k, elipse1):
-        return "🔴 Colisión por inclusión"
-    
-    # Clasificar tipo de colisión basado en distancia
-    if distancia_centros_val < abs(radio_efectivo_1 - radio_efectivo_2):
-        return "🔴 Colisión por inclusión"
-    elif distancia_centros_val < (radio_efectivo_1 + radio_efectivo_2) * 0.3:
-        return "🟠 Colisión severa"
-    elif distancia_centros_val < (radio_efectivo_1 + radio_efectivo_2) * 0.7:
-        return "🟡 Colisión moderada"
-    else:
-        return "🟢 Colisión leve"
+    return clasificar_colision(elipse1, elipse2, distancia_centros_val, centro_contenido(elipse1, elipse2))
 
 def analizar_colision_detallada(elipse1, elipse2):
     """
     Proporciona un análisis detallado de la colisión entre dos elipses
     Utiliza las funciones mejoradas de detección e incluye puntos de intersección
+    (cada prueba se evalúa una sola vez por par)
     """
     # Usar la función mejorada de distancia entre centros
     distancia_centros_val = distancia_centros(elipse1, elipse2)
+    colision = hay_colision_mejorada(elipse1, elipse2)
+    centro_incluido = centro_contenido(elipse1, elipse2)
     
     # Radios máximos y mínimos
     radio_max_1 = elipse1.a
@@ -63,93 +140,106 @@ def analizar_colision_detallada(elipse1, elipse2):
         solapamiento = 0
     
     # Determinar tipo de colisión
-    tipo = tipo_colision(elipse1, elipse2)
-    
-    # NUEVA FUNCIONALIDAD: Encontrar puntos de intersección
-    puntos_interseccion = []
-    puntos_interseccion_str = "No hay intersección"
-    
-    if hay_colision_mejorada(elipse1, elipse2):
-        puntos_interseccion = encontrar_puntos_interseccion(elipse1, elipse2)
-        puntos_interseccion_str = formatear_puntos_interseccion(puntos_interseccion)
-    
-    # Análisis de riesgo mejorado
-    if distancia_centros_val == 0:
-        riesgo = "CRÍTICO - Centros coincidentes"
-    elif punto_dentro_de_elipse(elipse1.h, elipse1.k, elipse2) or \
-         punto_dentro_de_elipse(elipse2.h, elipse2.k, elipse1):
-        riesgo = "CRÍTICO - Una elipse contiene el centro de la otra"
-    elif distancia_centros_val < diferencia_radios:
-        riesgo = "ALTO - Posible inclusión de elipses"
-    elif solapamiento > 50:
-        riesgo = "MEDIO-ALTO - Solapamiento significativo"
-    elif solapamiento > 20:
-        riesgo = "MEDIO - Solapamiento moderado"
-    elif solapamiento > 0:
-        riesgo = "BAJO - Solapamiento mínimo"
+    if colision:
+        tipo = clasificar_colision(elipse1, elipse2, distancia_centros_val, centro_incluido)
     else:
-        riesgo = "NULO - Sin solapamiento"
+        tipo = "Sin colisión"
     
-    # Calcular distancia mínima entre perímetros
-    distancia_minima = 0
-    if not hay_colision_mejorada(elipse1, elipse2):
-        distancia_minima = distancia_minima_entre_elipses(elipse1, elipse2)
+    # Análisis de riesgo mejorado
+    riesgo = nivel_riesgo(distancia_centros_val, centro_incluido, diferencia_radios, solapamiento)
     
-    return {
+    # Los campos costosos (puntos, distancia mínima, colisión precisa) se calculan al leerlos
+    return AnalisisColision({
         'distancia_centros': round(distancia_centros_val, 2),
         'suma_radios_maximos': round(suma_radios_maximos, 2),
         'suma_radios_minimos': round(suma_radios_minimos, 2),
         'diferencia_radios': round(diferencia_radios, 2),
         'porcentaje_solapamiento': round(solapamiento, 1),
-        'distancia_minima_perimetros': round(distancia_minima, 2),
         'tipo': tipo,
         'nivel_riesgo': riesgo,
         'area_elipse1': round(pi * elipse1.a * elipse1.b, 2),
         'area_elipse2': round(pi * elipse2.a * elipse2.b, 2),
         'orientacion_1': elipse1.orientacion,
         'orientacion_2': elipse2.orientacion,
-        'colision_precisa': hay_colision_precisa(elipse1, elipse2) if hay_colision_mejorada(elipse1, elipse2) else False,
-        # NUEVOS CAMPOS
-        'puntos_interseccion': puntos_interseccion,
-        'puntos_interseccion_str': puntos_interseccion_str,
-        'numero_puntos_interseccion': len(puntos_interseccion)
-    }
+    }, elipse1, elipse2, colision)
 
-def analizar_multiples_colisiones(elipses, identificadores=None):
+def analizar_multiples_colisiones(elipses, identificadores=None, trabajadores=1,
+                                  tamano_bloque=TAMANO_BLOQUE_PARES, columnar=False):
     """
     FUNCIÓN ACTUALIZADA: Analiza colisiones entre múltiples elipses incluyendo puntos de intersección
+    Acepta una lista de Elipse o una ElipseFleet
+    Con trabajadores > 1 (o None = todos los núcleos) los pares se analizan en procesos paralelos
+    Con columnar=True devuelve una tabla estructurada (ver CollisionTable) en lugar de diccionarios por par
     """
     if identificadores is None:
         identificadores = [f"Elipse_{i+1}" for i in range(len(elipses))]
     
+    if columnar:
+        return _analizar_multiples_columnar(elipses, identificadores)
+    
+    # Pares en colisión con la matriz por bloques (memoria acotada a un bloque, sin matriz n x n);
+    # el análisis detallado sí recorre los n(n-1)/2 pares
+    colision_i, colision_j = pares_colisiones_matriz(elipses)
+    en_colision = set(zip(colision_i.tolist(), colision_j.tolist()))
+    pares_i, pares_j = np.triu_indices(len(elipses), k=1)
+    analisis_pares = analizar_pares_paralelo(elipses, pares_i, pares_j, analizar_colision_detallada,
+                                             trabajadores, tamano_bloque)
+    
     resultados = []
     matriz_colisiones = {}
     
-    for i in range(len(elipses)):
-        for j in range(i + 1, len(elipses)):
-            analisis = analizar_colision_detallada(elipses[i], elipses[j])
-            
-            resultado = {
-                'id1': identificadores[i],
-                'id2': identificadores[j],
-                'tiene_colision': hay_colision_mejorada(elipses[i], elipses[j]),
-                'analisis': analisis
-            }
-            
-            resultados.append(resultado)
-            matriz_colisiones[f"{identificadores[i]}-{identificadores[j]}"] = resultado['tiene_colision']
+    for i, j, analisis in zip(pares_i.tolist(), pares_j.tolist(), analisis_pares):
+        resultado = {
+            'id1': identificadores[i],
+            'id2': identificadores[j],
+            'tiene_colision': (i, j) in en_colision,
+            'analisis': analisis
+        }
+        
+        resultados.append(resultado)
+        matriz_colisiones[f"{identificadores[i]}-{identificadores[j]}"] = resultado['tiene_colision']
     
     # Estadísticas generales
     total_comparaciones = len(resultados)
-    total_colisiones = sum(1 for r in resultados if r['tiene_colision'])
+    total_colisiones = len(en_colision)
+    
+    # Grafo disperso para consultas de vecinos, grados y clusters de conflicto
+    grafo = GrafoColisiones(len(elipses), colision_i, colision_j, identificadores)
+    estadisticas = _estadisticas_generales(total_comparaciones, total_colisiones)
+    estadisticas['clusters_conflicto'] = len(grafo.clusters())
     
     return {
         'resultados_detallados': resultados,
         'matriz_colisiones': matriz_colisiones,
-        'estadisticas': {
-            'total_comparaciones': total_comparaciones,
-            'total_colisiones': total_colisiones,
-            'total_sin_colisiones': total_comparaciones - total_colisiones,
-            'porcentaje_colisiones': round((total_colisiones / total_comparaciones) * 100, 1) if total_comparaciones > 0 else 0
-        }
-    }
\ No newline at end of file
+        'grafo_colisiones': grafo,
+        'estadisticas': estadisticas
+    }
+
+def _estadisticas_generales(total_comparaciones, total_colisiones):
+    return {
+        'total_comparaciones': total_comparaciones,
+        'total_colisiones': total_colisiones,
+        'total_sin_colisiones': total_comparaciones - total_colisiones,
+        'porcentaje_colisiones': round((total_colisiones / total_comparaciones) * 100, 1) if total_comparaciones > 0 else 0
+    }
+
+def _analizar_multiples_columnar(elipses, identificadores):
+    """
+    Modo columnar: una fila por par candidato de la fase amplia (centros a menos de dos radios
+    efectivos máximos) con códigos enteros; el texto se genera al mostrar (filas_legibles).
+    Los demás pares no se guardan: se cuentan como comparaciones sin colisión.
+    """
+    pares_i, pares_j = pares_candidatos(elipses)
+    tabla = tabla_resultados(elipses, pares_i, pares_j)
+    colision = tabla['colision']
+    grafo = GrafoColisiones(len(elipses), tabla['i'][colision], tabla['j'][colision], identificadores)
+    
+    total_comparaciones = len(elipses) * (len(elipses) - 1) // 2
+    estadisticas = _estadisticas_generales(total_comparaciones, int(colision.sum()))
+    estadisticas['clusters_conflicto'] = len(grafo.clusters())
+    return {
+        'tabla': tabla,
+        'identificadores': identificadores,
+        'grafo_colisiones': grafo,
+        'estadisticas': estadisticas
+    }
@@ -0,0 +1,107 @@
+# core/collision/CollisionCache.py
+"""
+Caché LRU de resultados por par de elipses
+La clave son las tuplas inmutables (h, k, a, b, orientacion) de ambas elipses,
+de modo que cada par se analiza una sola vez por conjunto de parámetros
+(el módulo persiste entre reejecuciones de Streamlit).
+La caché es compartida por todas las sesiones y hilos del servidor: cada operación
+sobre el diccionario se hace bajo un candado.
+"""
+from collections import OrderedDict
+from threading import Lock
+import numpy as np
+from .CollisionAnalysis import analizar_colision_detallada
+from .ParallelAnalysis import analizar_pares_paralelo, TAMANO_BLOQUE_PARES
+
+def clave_elipse(elipse):
+    return (elipse.h, elipse.k, elipse.a, elipse.b, elipse.orientacion)
+
+class CachePares:
+    """
+    Caché de tamaño acotado (se descarta el par usado hace más tiempo)
+    con contadores de aciertos y fallos.
+    Los resultados se comparten entre llamadas: no deben modificarse.
+    Es segura entre hilos; el cálculo de un par faltante se hace fuera del candado.
+    """
+
+    def __init__(self, maxsize=10_000):
+        if maxsize <= 0:
+            raise ValueError("El tamaño máximo de la caché debe ser positivo.")
+        self.maxsize = maxsize
+        self.aciertos = 0
+        self.fallos = 0
+        self._datos = OrderedDict()
+        self._candado = Lock()
+
+    def __len__(self):
+        with self._candado:
+            return len(self._datos)
+
+    def __contains__(self, clave):
+        with self._candado:
+            return clave in self._datos
+
+    def buscar(self, elipse1, elipse2):
+        """Resultado guardado del par o None (cuenta como acierto o fallo)"""
+        clave = (clave_elipse(elipse1), clave_elipse(elipse2))
+        with self._candado:
+            if clave in self._datos:
+                self.aciertos += 1
+                self._datos.move_to_end(clave)
+                return self._datos[clave]
+            self.fallos += 1
+            return None
+
+    def guardar(self, elipse1, elipse2, resultado):
+        clave = (clave_elipse(elipse1), clave_elipse(elipse2))
+        with self._candado:
+            self._datos[clave] = resultado
+            self._datos.move_to_end(clave)
+            if len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)
+
+    def obtener(self, elipse1, elipse2, calcular):
+        """Devuelve el resultado del par, llamando a calcular(elipse1, elipse2) solo si no está guardado"""
+        resultado = self.buscar(elipse1, elipse2)
+        if resultado is None:
+            resultado = calcular(elipse1, elipse2)
+            self.guardar(elipse1, elipse2, resultado)
+        return resultado
+
+    def limpiar(self):
+        with self._candado:
+            self._datos.clear()
+            self.aciertos = 0
+            self.fallos = 0
+
+    def estadisticas(self):
+        with self._candado:
+            aciertos, fallos, tamano = self.aciertos, self.fallos, len(self._datos)
+        consultas = aciertos + fallos
+        return {
+            'aciertos': aciertos,
+            'fallos': fallos,
+            'tamano': tamano,
+            'maxsize': self.maxsize,
+            'tasa_aciertos': round(aciertos / consultas * 100, 1) if consultas > 0 else 0
+        }
+
+# Caché compartida por la interfaz y el simulador
+CACHE_ANALISIS = CachePares()
+
+def analisis_pares_en_cache(elipses, i, j, trabajadores=1, tamano_bloque=TAMANO_BLOQUE_PARES):
+    """
+    Análisis de los pares (i[p], j[p]) en orden: los que no están en la caché
+    se calculan (en paralelo si trabajadores > 1) y se guardan
+    """
+    vistas = list(elipses)
+    i, j = np.asarray(i, dtype=np.intp), np.asarray(j, dtype=np.intp)
+    resultados = [CACHE_ANALISIS.buscar(vistas[p], vistas[q]) for p, q in zip(i.tolist(), j.tolist())]
+    faltantes = np.array([n for n, resultado in enumerate(resultados) if resultado is None], dtype=np.intp)
+
+    calculados = analizar_pares_paralelo(elipses, i[faltantes], j[faltantes], analizar_colision_detallada,
+                                         trabajadores, tamano_bloque)
+    for n, analisis in zip(faltantes.tolist(), calculados):
+        resultados[n] = analisis
+        CACHE_ANALISIS.guardar(vistas[i[n]], vistas[j[n]], analisis)
+    return resultados
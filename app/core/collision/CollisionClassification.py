@@ -0,0 +1,144 @@
+# core/collision/CollisionClassification.py
+"""
+Clasificación de colisiones entre pares de elipses:
+- tipo de colisión (sin colisión / leve / moderada / severa / inclusión)
+- nivel de riesgo según el solapamiento
+Las etiquetas legibles están en tablas; su posición es el código entero del resultado.
+"""
+import numpy as np
+from core.Fleet_ellipse import como_flota
+from .CollisionDetection import punto_dentro_de_elipse
+
+# Tablas de etiquetas: el código es la posición en la tupla
+TIPOS_COLISION = (
+    "Sin colisión",
+    "🟢 Colisión leve",
+    "🟡 Colisión moderada",
+    "🟠 Colisión severa",
+    "🔴 Colisión por inclusión",
+)
+NIVELES_RIESGO = (
+    "NULO - Sin solapamiento",
+    "BAJO - Solapamiento mínimo",
+    "MEDIO - Solapamiento moderado",
+    "MEDIO-ALTO - Solapamiento significativo",
+    "ALTO - Posible inclusión de elipses",
+    "CRÍTICO - Una elipse contiene el centro de la otra",
+    "CRÍTICO - Centros coincidentes",
+)
+CODIGO_TIPO = {etiqueta: codigo for codigo, etiqueta in enumerate(TIPOS_COLISION)}
+CODIGO_RIESGO = {etiqueta: codigo for codigo, etiqueta in enumerate(NIVELES_RIESGO)}
+
+# Códigos de tipo
+SIN_COLISION, COLISION_LEVE, COLISION_MODERADA, COLISION_SEVERA, COLISION_INCLUSION = range(len(TIPOS_COLISION))
+# Códigos de riesgo
+(RIESGO_NULO, RIESGO_BAJO, RIESGO_MEDIO, RIESGO_MEDIO_ALTO, RIESGO_ALTO,
+ RIESGO_CENTRO_CONTENIDO, RIESGO_CENTROS_COINCIDENTES) = range(len(NIVELES_RIESGO))
+
+# Claves de estadísticas del simulador por código de tipo
+CLAVES_ESTADISTICAS = ('sin_colision', 'colision_leve', 'colision_moderada', 'colision_severa', 'colision_inclusion')
+
+def clasificar_colision(elipse1, elipse2, distancia_centros_val, centro_incluido):
+    """
+    Clasificación compartida por tipo_colision y analizar_colision_detallada
+    (recibe la distancia y la prueba de centros ya calculadas para no repetirlas)
+    """
+    # Radios efectivos, se estima el el radio medio (a+b)/2
+    radio_efectivo_1 = (elipse1.a + elipse1.b) / 2
+    radio_efectivo_2 = (elipse2.a + elipse2.b) / 2
+    
+    # Verificar si hay inclusión completa
+    if centro_incluido:
+        return "🔴 Colisión por inclusión"
+    
+    # Clasificar tipo de colisión basado en distancia
+    if distancia_centros_val < abs(radio_efectivo_1 - radio_efectivo_2):
+        return "🔴 Colisión por inclusión"
+    elif distancia_centros_val < (radio_efectivo_1 + radio_efectivo_2) * 0.3:
+        return "🟠 Colisión severa"
+    elif distancia_centros_val < (radio_efectivo_1 + radio_efectivo_2) * 0.7:
+        return "🟡 Colisión moderada"
+    else:
+        return "🟢 Colisión leve"
+
+def centro_contenido(elipse1, elipse2):
+    """True si alguna de las elipses contiene el centro de la otra"""
+    return punto_dentro_de_elipse(elipse1.h, elipse1.k, elipse2) or \
+           punto_dentro_de_elipse(elipse2.h, elipse2.k, elipse1)
+
+def nivel_riesgo(distancia_centros_val, centro_incluido, diferencia_radios, solapamiento):
+    """Banda de riesgo a partir de las métricas ya calculadas del par"""
+    if distancia_centros_val == 0:
+        return "CRÍTICO - Centros coincidentes"
+    elif centro_incluido:
+        return "CRÍTICO - Una elipse contiene el centro de la otra"
+    elif distancia_centros_val < diferencia_radios:
+        return "ALTO - Posible inclusión de elipses"
+    elif solapamiento > 50:
+        return "MEDIO-ALTO - Solapamiento significativo"
+    elif solapamiento > 20:
+        return "MEDIO - Solapamiento moderado"
+    elif solapamiento > 0:
+        return "BAJO - Solapamiento mínimo"
+    else:
+        return "NULO - Sin solapamiento"
+
+# ==================== CLASIFICACIÓN VECTORIZADA ====================
+def _dentro_lote(x, y, h, k, sx, sy):
+    """punto_dentro_de_elipse para arreglos (mismas operaciones, mismo redondeo)"""
+    return (x - h)**2 / sx**2 + (y - k)**2 / sy**2 <= 1.0
+
+def clasificar_lote(elipses, i, j):
+    """
+    Códigos de tipo y de riesgo (uint8) para los pares (i[p], j[p]) de una flota
+    Equivalente a tipo_colision y al nivel de riesgo de analizar_colision_detallada
+    """
+    flota = como_flota(elipses)
+    i, j = np.asarray(i, dtype=np.intp), np.asarray(j, dtype=np.intp)
+    sx, sy = flota.semiejes_xy()
+    h1, k1, h2, k2 = flota.h[i], flota.k[i], flota.h[j], flota.k[j]
+
+    distancia = np.sqrt((h1 - h2)**2 + (k1 - k2)**2)
+    radios = flota.radios_efectivos()
+    radio_1, radio_2 = radios[i], radios[j]
+    suma_efectivos = radio_1 + radio_2
+    colision = distancia < suma_efectivos
+    centro = _dentro_lote(h1, k1, h2, k2, sx[j], sy[j]) | _dentro_lote(h2, k2, h1, k1, sx[i], sy[i])
+
+    tipo = np.select(
+        [~colision,
+         centro | (distancia < np.abs(radio_1 - radio_2)),
+         distancia < suma_efectivos * 0.3,
+         distancia < suma_efectivos * 0.7],
+        [SIN_COLISION, COLISION_INCLUSION, COLISION_SEVERA, COLISION_MODERADA],
+        default=COLISION_LEVE).astype(np.uint8)
+
+    suma_maximos = flota.a[i] + flota.a[j]
+    solapamiento = np.where(distancia < suma_maximos, (suma_maximos - distancia) / suma_maximos * 100, 0.0)
+    riesgo = np.select(
+        [distancia == 0,
+         centro,
+         distancia < np.abs(flota.a[i] - flota.a[j]),
+         solapamiento > 50,
+         solapamiento > 20,
+         solapamiento > 0],
+        [RIESGO_CENTROS_COINCIDENTES, RIESGO_CENTRO_CONTENIDO, RIESGO_ALTO,
+         RIESGO_MEDIO_ALTO, RIESGO_MEDIO, RIESGO_BAJO],
+        default=RIESGO_NULO).astype(np.uint8)
+    return tipo, riesgo
+
+def etiquetas(codigos, tabla=TIPOS_COLISION):
+    """Etiquetas legibles para un arreglo de códigos (por defecto, tipos de colisión)"""
+    return np.asarray(tabla, dtype=object)[np.asarray(codigos, dtype=np.intp)]
+
+def estadisticas_tipos(codigos_tipo, total_comparaciones=None):
+    """
+    Conteo por tipo con un bincount; si total_comparaciones es mayor que el número de códigos,
+    los pares no incluidos se cuentan como sin colisión
+    """
+    conteo = np.bincount(np.asarray(codigos_tipo, dtype=np.intp), minlength=len(TIPOS_COLISION))
+    estadisticas = {'total_comparaciones': int(conteo.sum()) if total_comparaciones is None else total_comparaciones}
+    for clave, cantidad in zip(CLAVES_ESTADISTICAS, conteo.tolist()):
+        estadisticas[clave] = cantidad
+    estadisticas['sin_colision'] += estadisticas['total_comparaciones'] - int(conteo.sum())
+    return estadisticas
@@ -3,18 +3,20 @@
 Módulo para la detección de colisiones entre elipses
 Integra funcionalidades de cálculo de distancias
 """
-from math import sqrt, cos, sin, pi
-from core.Math_ellipse import Elipse
+from math import sqrt
+import numpy as np
+from core.Math_ellipse import Elipse, semiejes_xy
+from core.Fleet_ellipse import como_flota
+from .Collision3D import distancia_centros_3d
 
-def distancia_centros(e1: Elipse, e2: Elipse, dimensiones: int = 2) -> float:
+def distancia_centros(e1: Elipse, e2: Elipse, dimensiones: int = 2, altitudes=(0.0, 0.0)) -> float:
     # Calcula la distancia euclidiana entre centros de dos elipses
+    # (en 3D, altitudes = (z1, z2) de los centros)
+    if dimensiones == 3:
+        return distancia_centros_3d(e1, e2, *altitudes)
+
     dx = e1.h - e2.h
     dy = e1.k - e2.k
-    
-    if dimensiones == 3:
-        dz = getattr(e1, 'z', 0) - getattr(e2, 'z', 0)
-        return sqrt(dx**2 + dy**2 + dz**2)
-    
     return sqrt(dx**2 + dy**2)
 
 # ==================== FUNCIONES DE DETECCIÓN DE COLISIÓN ====================
@@ -39,40 +41,89 @@ def hay_colision_precisa(elipse1, elipse2, precision=100):
     """
     NUEVA FUNCIÓN: Detección de colisión más precisa
     Verifica múltiples puntos en el perímetro de una elipse contra la otra
+    (muestreo vectorizado con las tablas cos/sin compartidas)
     """
     if not hay_colision_mejorada(elipse1, elipse2):
         # Si la detección rápida dice que no hay colisión, confiamos en ella
         return False
     
-    # Verificación más precisa: revisar puntos en el perímetro
-    for i in range(0, precision):
-        angulo = 2 * pi * i / precision
-        
-        # Punto en elipse1
-        if elipse1.orientacion == "horizontal":
-            x1 = elipse1.h + elipse1.a * cos(angulo)
-            y1 = elipse1.k + elipse1.b * sin(angulo)
-        else:
-            x1 = elipse1.h + elipse1.b * cos(angulo)
-            y1 = elipse1.k + elipse1.a * sin(angulo)
-        
-        # Verificar si este punto está dentro de elipse2
-        if punto_dentro_de_elipse(x1, y1, elipse2):
-            return True
-        
-        # Punto en elipse2
-        if elipse2.orientacion == "horizontal":
-            x2 = elipse2.h + elipse2.a * cos(angulo)
-            y2 = elipse2.k + elipse2.b * sin(angulo)
-        else:
-            x2 = elipse2.h + elipse2.b * cos(angulo)
-            y2 = elipse2.k + elipse2.a * sin(angulo)
-        
-        # Verificar si este punto está dentro de elipse1
-        if punto_dentro_de_elipse(x2, y2, elipse1):
-            return True
+    # Verificación más precisa: revisar puntos en el perímetro de ambas elipses
+    if np.any(puntos_dentro_de_elipse(elipse1.calcular_puntos(precision), elipse2)):
+        return True
+    return bool(np.any(puntos_dentro_de_elipse(elipse2.calcular_puntos(precision), elipse1)))
+
+# ==================== PRUEBA EXACTA (HAZ DE CÓNICAS) ====================
+# Para dos elipses alineadas a los ejes, con matrices cónicas A y B (interior negativo),
+# el polinomio característico f(λ) = det(λA - B) es cúbico. Las elipses están separadas
+# si y solo si f tiene dos raíces reales negativas distintas.
+# Normalizando A al círculo unitario el polinomio mónico queda
+#   g(λ) = λ³ + b2·λ² + b1·λ + b0,  con b0 = -γδ < 0,
+# por lo que g(0) < 0 y basta revisar el máximo local λ₋: hay separación si λ₋ < 0 y g(λ₋) > 0.
+
+def _margen_separacion(h1, k1, sx1, sy1, h2, k2, sx2, sy2):
+    """
+    Margen adimensional g(λ₋)/|b0| (escalares de Python).
+    > 0: elipses separadas; 0: tangentes; < 0: se intersectan o una contiene a la otra
+    """
+    u = (h2 - h1) / sx1
+    v = (k2 - k1) / sy1
+    g = (sx1 / sx2)**2
+    d = (sy1 / sy2)**2
+    c = u*u*g + v*v*d - 1
+    
+    b2 = c - g - d
+    b1 = g*d + v*v*d*d + u*u*g*g - (g + d)*c
+    b0 = -g*d
+    
+    # Máximo local de g(λ); si no existe o no es negativo, evaluar en 0 (margen = -1)
+    lam = 0.0
+    discriminante = b2*b2 - 3*b1
+    if discriminante > 0:
+        lam_max = (-b2 - sqrt(discriminante)) / 3
+        if lam_max < 0:
+            lam = lam_max
+    return (((lam + b2)*lam + b1)*lam + b0) / -b0
+
+def _margen_separacion_lote(h1, k1, sx1, sy1, h2, k2, sx2, sy2):
+    """Versión vectorizada de _margen_separacion para arreglos de pares"""
+    u = (h2 - h1) / sx1
+    v = (k2 - k1) / sy1
+    g = (sx1 / sx2)**2
+    d = (sy1 / sy2)**2
+    c = u*u*g + v*v*d - 1
+    
+    b2 = c - g - d
+    b1 = g*d + v*v*d*d + u*u*g*g - (g + d)*c
+    b0 = -g*d
     
-    return False
+    discriminante = b2*b2 - 3*b1
+    lam_max = (-b2 - np.sqrt(np.maximum(discriminante, 0))) / 3
+    lam = np.where((discriminante > 0) & (lam_max < 0), lam_max, 0.0)
+    return (((lam + b2)*lam + b1)*lam + b0) / -b0
+
+def colision_exacta(elipse1, elipse2, tolerancia=1e-9):
+    """
+    NUEVA FUNCIÓN: Prueba exacta de colisión entre dos elipses alineadas a los ejes
+    Basada en el polinomio característico del haz de cónicas (sin muestreo del perímetro)
+    Devuelve (hay_colision, margen); las tangencias y los márgenes <= tolerancia
+    se reportan como colisión para no producir falsos negativos
+    """
+    sx1, sy1 = semiejes_xy(elipse1)
+    sx2, sy2 = semiejes_xy(elipse2)
+    margen = _margen_separacion(elipse1.h, elipse1.k, sx1, sy1, elipse2.h, elipse2.k, sx2, sy2)
+    return margen <= tolerancia, margen
+
+def colision_exacta_flota(elipses, i, j, tolerancia=1e-9):
+    """
+    Versión vectorizada de colision_exacta para los pares (i[p], j[p]) de una flota
+    Devuelve (arreglo booleano de colisión, arreglo de márgenes)
+    """
+    flota = como_flota(elipses)
+    i, j = np.asarray(i, dtype=np.intp), np.asarray(j, dtype=np.intp)
+    sx, sy = flota.semiejes_xy()
+    margen = _margen_separacion_lote(flota.h[i], flota.k[i], sx[i], sy[i],
+                                     flota.h[j], flota.k[j], sx[j], sy[j])
+    return margen <= tolerancia, margen
 
 def punto_dentro_de_elipse(x, y, elipse):
     """
@@ -90,43 +141,25 @@ def punto_dentro_de_elipse(x, y, elipse):
     
     return valor <= 1.0
 
+def puntos_dentro_de_elipse(puntos, elipse):
+    """
+    Versión vectorizada de punto_dentro_de_elipse para un arreglo (..., 2) de puntos
+    """
+    return punto_dentro_de_elipse(puntos[..., 0], puntos[..., 1], elipse)
+
 def distancia_minima_entre_elipses(elipse1, elipse2, precision=360):
     """
     NUEVA FUNCIÓN: Calcula la distancia mínima entre los perímetros de dos elipses
+    Evalúa todos los pares de puntos muestreados de una sola vez (precision x precision)
     """
     if hay_colision_mejorada(elipse1, elipse2):
         return 0.0  # Si hay colisión, la distancia mínima es 0
     
-    distancia_minima = float('inf')
+    puntos1 = elipse1.calcular_puntos(precision)
+    puntos2 = elipse2.calcular_puntos(precision)
     
-    # Generar puntos en el perímetro de la primera elipse
-    for i in range(precision):
-        angulo = 2 * pi * i / precision
-        
-        # Punto en elipse1
-        if elipse1.orientacion == "horizontal":
-            x1 = elipse1.h + elipse1.a * cos(angulo)
-            y1 = elipse1.k + elipse1.b * sin(angulo)
-        else:
-            x1 = elipse1.h + elipse1.b * cos(angulo)
-            y1 = elipse1.k + elipse1.a * sin(angulo)
-        
-        # Encontrar el punto más cercano en elipse2
-        for j in range(precision):
-            angulo2 = 2 * pi * j / precision
-            
-            # Punto en elipse2
-            if elipse2.orientacion == "horizontal":
-                x2 = elipse2.h + elipse2.a * cos(angulo2)
-                y2 = elipse2.k + elipse2.b * sin(angulo2)
-            else:
-                x2 = elipse2.h + elipse2.b * cos(angulo2)
-                y2 = elipse2.k + elipse2.a * sin(angulo2)
-            
-            # Calcular distancia entre puntos
-            distancia = sqrt((x1 - x2)**2 + (y1 - y2)**2)
-            
-            if distancia < distancia_minima:
-                distancia_minima = distancia
+    # Distancias al cuadrado entre todos los pares de puntos
+    diferencias = puntos1[:, None, :] - puntos2[None, :, :]
+    distancias2 = np.einsum('ijk,ijk->ij', diferencias, diferencias)
     
-    return distancia_minima
\ No newline at end of file
+    return float(sqrt(distancias2.min()))
\ No newline at end of file
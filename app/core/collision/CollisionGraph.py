@@ -0,0 +1,86 @@
+# core/collision/CollisionGraph.py
+"""
+Grafo de colisiones disperso (matriz de adyacencia CSR de scipy.sparse)
+Reemplaza el diccionario de cadenas "Elipse_1-Elipse_2" por una estructura consultable:
+- vecinos de un dron
+- grados y ranking de drones con más conflictos
+- componentes conexas (clusters de conflicto) para trabajar cluster por cluster
+"""
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from .SpatialIndex import pares_en_colision
+
+class GrafoColisiones:
+    """
+    Grafo no dirigido de n drones con una arista por par en colisión.
+    Se construye a partir de arreglos de pares (i, j) con i < j.
+    """
+
+    def __init__(self, n, i, j, identificadores=None):
+        i = np.asarray(i, dtype=np.intp)
+        j = np.asarray(j, dtype=np.intp)
+        self.n = n
+        self.identificadores = identificadores
+        filas = np.concatenate((i, j))
+        columnas = np.concatenate((j, i))
+        self.adyacencia = csr_matrix((np.ones(len(filas), dtype=bool), (filas, columnas)), shape=(n, n))
+        self._componentes = None
+
+    @classmethod
+    def desde_flota(cls, elipses, identificadores=None):
+        """Grafo con el criterio de hay_colision_mejorada (fase amplia + fase estrecha)"""
+        i, j = pares_en_colision(elipses)
+        return cls(len(elipses), i, j, identificadores)
+
+    @classmethod
+    def desde_matriz(cls, colision, identificadores=None):
+        """Grafo a partir de una matriz booleana simétrica (n, n)"""
+        i, j = np.nonzero(np.triu(colision, k=1))
+        return cls(colision.shape[0], i, j, identificadores)
+
+    @property
+    def numero_colisiones(self):
+        return self.adyacencia.nnz // 2
+
+    def aristas(self):
+        """Pares (i, j), i < j, en orden lexicográfico"""
+        superior = self.adyacencia.tocoo()
+        mascara = superior.row < superior.col
+        i, j = superior.row[mascara], superior.col[mascara]
+        orden = np.lexsort((j, i))
+        return i[orden].astype(np.intp), j[orden].astype(np.intp)
+
+    def vecinos(self, indice):
+        """Índices de los drones en colisión con el dado (ordenados)"""
+        inicio, fin = self.adyacencia.indptr[indice], self.adyacencia.indptr[indice + 1]
+        return np.sort(self.adyacencia.indices[inicio:fin])
+
+    def grados(self):
+        """Número de colisiones de cada dron"""
+        return np.diff(self.adyacencia.indptr)
+
+    def ranking_grados(self, cantidad=None):
+        """Índices de drones ordenados por número de colisiones (mayor primero, empates por índice)"""
+        orden = np.argsort(-self.grados(), kind='stable')
+        return orden if cantidad is None else orden[:cantidad]
+
+    def componentes(self):
+        """(número de componentes, etiqueta de componente por dron); los aislados son componentes de 1"""
+        if self._componentes is None:
+            self._componentes = connected_components(self.adyacencia, directed=False)
+        return self._componentes
+
+    def clusters(self, minimo=2):
+        """Lista de arreglos de índices, uno por cluster de conflicto con al menos `minimo` drones"""
+        _, etiquetas = self.componentes()
+        orden = np.argsort(etiquetas, kind='stable')
+        cortes = np.flatnonzero(np.diff(etiquetas[orden])) + 1
+        grupos = np.split(orden, cortes) if len(orden) else []
+        return [grupo for grupo in grupos if len(grupo) >= minimo]
+
+    def etiquetas(self, indices):
+        """Identificadores de los drones (o los índices si no hay identificadores)"""
+        if self.identificadores is None:
+            return np.asarray(indices).tolist()
+        return [self.identificadores[indice] for indice in np.asarray(indices).tolist()]
@@ -0,0 +1,85 @@
+# core/collision/CollisionMatrix.py
+"""
+Matriz de colisiones de todos los pares de una flota mediante broadcasting
+Aplica el mismo criterio de hay_colision_mejorada (distancia entre centros <
+suma de radios efectivos) sin llamar a la función par por par.
+La evaluación se hace por bloques (tiles) para acotar la memoria con flotas grandes.
+"""
+import numpy as np
+from core.Fleet_ellipse import como_flota
+
+# Filas/columnas por bloque: 1024 x 1024 float64 ≈ 8 MB por matriz temporal
+BLOQUE_MATRIZ = 1024
+
+def _bloques(h, k, radios, bloque):
+    """Recorre los bloques del triángulo superior (incluida la diagonal de bloques)"""
+    n = len(h)
+    for inicio_i in range(0, n, bloque):
+        filas = slice(inicio_i, min(inicio_i + bloque, n))
+        for inicio_j in range(inicio_i, n, bloque):
+            columnas = slice(inicio_j, min(inicio_j + bloque, n))
+            dx = h[filas, None] - h[None, columnas]
+            dy = k[filas, None] - k[None, columnas]
+            distancias = np.sqrt(dx * dx + dy * dy)
+            suma_radios = radios[filas, None] + radios[None, columnas]
+            yield inicio_i, inicio_j, distancias < suma_radios, distancias, suma_radios
+
+def _arreglos(elipses):
+    flota = como_flota(elipses)
+    return flota.h, flota.k, flota.radios_efectivos()
+
+def bloques_colisiones(elipses, bloque=BLOQUE_MATRIZ):
+    """
+    Generador de bloques (fila_inicial, columna_inicial, colision, distancias, suma_radios)
+    que cubren el triángulo superior de la matriz; memoria acotada a un bloque por vez
+    """
+    yield from _bloques(*_arreglos(elipses), bloque)
+
+def matriz_colisiones(elipses, bloque=BLOQUE_MATRIZ):
+    """
+    Matrices completas (n, n) para flotas moderadas (algunos miles de drones):
+    - colision: True si hay_colision_mejorada (la diagonal se deja en False)
+    - distancias: distancia entre centros
+    - suma_radios: suma de radios efectivos (a+b)/2
+    """
+    h, k, radios = _arreglos(elipses)
+    n = len(h)
+    colision = np.zeros((n, n), dtype=bool)
+    distancias = np.zeros((n, n))
+    suma_radios = np.zeros((n, n))
+
+    for inicio_i, inicio_j, col, dist, suma in _bloques(h, k, radios, bloque):
+        filas = slice(inicio_i, inicio_i + col.shape[0])
+        columnas = slice(inicio_j, inicio_j + col.shape[1])
+        for matriz, valores in ((colision, col), (distancias, dist), (suma_radios, suma)):
+            matriz[filas, columnas] = valores
+            matriz[columnas, filas] = valores.T
+
+    np.fill_diagonal(colision, False)
+    return colision, distancias, suma_radios
+
+def pares_colisiones_matriz(elipses, bloque=BLOQUE_MATRIZ):
+    """
+    Pares (i, j), i < j, en orden lexicográfico, en colisión evaluando la flota por bloques
+    (memoria acotada a un bloque; no se construye la matriz completa)
+    """
+    lista_i, lista_j = [], []
+    for inicio_i, inicio_j, colision, _, _ in bloques_colisiones(elipses, bloque):
+        if inicio_i == inicio_j:
+            colision = np.triu(colision, k=1)
+        filas, columnas = np.nonzero(colision)
+        lista_i.append(filas + inicio_i)
+        lista_j.append(columnas + inicio_j)
+
+    if not lista_i:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    i, j = np.concatenate(lista_i), np.concatenate(lista_j)
+    orden = np.lexsort((j, i))
+    return i[orden], j[orden]
+
+def contar_colisiones(elipses, bloque=BLOQUE_MATRIZ):
+    """Número de pares en colisión sin construir la matriz completa"""
+    total = 0
+    for inicio_i, inicio_j, colision, _, _ in bloques_colisiones(elipses, bloque):
+        total += int(np.triu(colision, k=1).sum()) if inicio_i == inicio_j else int(colision.sum())
+    return total
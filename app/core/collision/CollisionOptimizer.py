@@ -0,0 +1,125 @@
+# core/collision/CollisionOptimizer.py
+"""
+Resolución de colisiones por optimización (minimización de desplazamientos)
+Minimiza la suma de los desplazamientos al cuadrado de los centros sujeta a
+distancia(i, j) >= margen_seguridad * (r_i + r_j) para todo par (radios efectivos).
+- Lagrangiano aumentado: cada subproblema sin restricciones se resuelve con L-BFGS-B
+  (scipy.optimize) usando el gradiente analítico 2(z - z0) + Jᵀw
+- Los pares restringidos se recalculan en cada evaluación a partir de las posiciones actuales
+  (el término max(0, ·)² es C¹, así que un par que entra o sale no rompe el gradiente).
+  Una lista de vecinos con holgura (cKDTree) evita reconstruir el árbol en cada evaluación:
+  solo se reconstruye cuando algún dron se movió más de la mitad de la holgura
+- Los multiplicadores se guardan por par (claves i * n + j) entre iteraciones externas
+- Con tiempo_limite se detiene (también dentro de L-BFGS-B) y devuelve la configuración alcanzada
+"""
+from time import perf_counter
+import numpy as np
+from scipy.optimize import minimize
+from scipy.spatial import cKDTree
+from core.Fleet_ellipse import ElipseFleet, como_flota
+
+class _ListaVecinos:
+    """Pares candidatos a menos de alcance + holgura; se reconstruye solo si hace falta"""
+
+    def __init__(self, n, alcance, holgura):
+        self.n = n
+        self.alcance = alcance
+        self.holgura = holgura
+        self.z = None
+
+    def pares(self, z):
+        n = self.n
+        if self.z is None or np.max(np.hypot(z[:n] - self.z[:n], z[n:] - self.z[n:])) > self.holgura / 2:
+            pares = cKDTree(np.column_stack((z[:n], z[n:]))).query_pairs(
+                self.alcance + self.holgura, output_type='ndarray')
+            self.i, self.j = pares[:, 0], pares[:, 1]
+            self.z = z.copy()
+        return self.i, self.j
+
+def _restricciones_separacion(z, n, i, j, distancias_minimas):
+    """Restricciones g = D - d <= 0 de los pares (i, j) y direcciones unitarias de j hacia i"""
+    dx = z[i] - z[j]
+    dy = z[n + i] - z[n + j]
+    distancias = np.maximum(np.sqrt(dx * dx + dy * dy), 1e-12)
+    return distancias_minimas - distancias, dx / distancias, dy / distancias
+
+def _multiplicadores(claves, valores, n, i, j):
+    """Multiplicador guardado de cada par (i, j); 0 si el par no tiene"""
+    if len(claves) == 0:
+        return np.zeros(len(i))
+    buscadas = i.astype(np.int64) * n + j
+    posicion = np.minimum(np.searchsorted(claves, buscadas), len(claves) - 1)
+    return np.where(claves[posicion] == buscadas, valores[posicion], 0.0)
+
+def resolver_colisiones_optimizado(elipses, margen_seguridad=1.1, holgura=0.2, penalizacion=100.0,
+                                   crecimiento=4.0, tolerancia=1e-3, max_iter=30, max_iter_interno=100,
+                                   tiempo_limite=None):
+    """
+    Desplazamiento mínimo que deja a la flota sin colisiones (criterio de hay_colision_mejorada)
+    - margen_seguridad: distancia mínima exigida = margen_seguridad * suma de radios efectivos
+    - holgura: margen de la lista de vecinos, como fracción del alcance de los pares
+    - penalizacion, crecimiento, tolerancia, max_iter: parámetros del lagrangiano aumentado; la
+      penalización se multiplica por `crecimiento` en cada iteración externa y la tolerancia es
+      relativa a la distancia mínima (debe ser menor que margen_seguridad - 1)
+    - max_iter_interno: iteraciones de L-BFGS-B por subproblema (no hace falta resolverlos
+      con precisión: los multiplicadores corrigen en la iteración siguiente)
+    - tiempo_limite: segundos de reloj; al agotarse se devuelve la configuración alcanzada,
+      que puede conservar colisiones (ver resolver_colisiones_optimizado_con_plazo)
+    Acepta una lista de Elipse o una ElipseFleet y devuelve el mismo tipo
+    """
+    if len(elipses) < 2:
+        return elipses
+
+    fin = np.inf if tiempo_limite is None else perf_counter() + tiempo_limite
+    flota = como_flota(elipses).copia()
+    n = len(flota)
+    radios = flota.radios_efectivos() * margen_seguridad
+    alcance = 2 * radios.max()
+    vecinos = _ListaVecinos(n, alcance, holgura * alcance)
+
+    z0 = np.concatenate((flota.h, flota.k))
+    z = z0.copy()
+    # Centros coincidentes: el gradiente no define dirección; separar levemente en X
+    i, j = vecinos.pares(z)
+    coincidentes = (z[i] == z[j]) & (z[n + i] == z[n + j])
+    z[j[coincidentes]] += 1e-6 * (radios[i] + radios[j])[coincidentes]
+
+    claves = np.empty(0, dtype=np.int64)
+    valores = np.empty(0)
+
+    def lagrangiano(z):
+        i, j = vecinos.pares(z)
+        g, ux, uy = _restricciones_separacion(z, n, i, j, radios[i] + radios[j])
+        multiplicadores = _multiplicadores(claves, valores, n, i, j)
+        w = np.maximum(0, multiplicadores + penalizacion * g)
+        valor = np.sum((z - z0)**2) + np.sum(w * w - multiplicadores**2) / (2 * penalizacion)
+        gradiente = 2 * (z - z0)
+        gradiente[:n] += np.bincount(j, w * ux, n) - np.bincount(i, w * ux, n)
+        gradiente[n:] += np.bincount(j, w * uy, n) - np.bincount(i, w * uy, n)
+        return valor, gradiente
+
+    def plazo(_):
+        if perf_counter() >= fin:
+            raise StopIteration
+
+    for _ in range(max_iter):
+        if perf_counter() >= fin:
+            break
+        z = minimize(lagrangiano, z, jac=True, method='L-BFGS-B', callback=plazo,
+                     options={'maxiter': max_iter_interno, 'gtol': 1e-6, 'ftol': 1e-9}).x
+        i, j = vecinos.pares(z)
+        distancias_minimas = radios[i] + radios[j]
+        g, _, _ = _restricciones_separacion(z, n, i, j, distancias_minimas)
+        multiplicadores = np.maximum(0, _multiplicadores(claves, valores, n, i, j) + penalizacion * g)
+        activos = multiplicadores > 0
+        claves = i[activos].astype(np.int64) * n + j[activos]
+        orden = np.argsort(claves)
+        claves, valores = claves[orden], multiplicadores[activos][orden]
+        if np.max(g / distancias_minimas, initial=0) < tolerancia:
+            break
+        penalizacion *= crecimiento
+
+    flota.h[:], flota.k[:] = z[:n], z[n:]
+    if isinstance(elipses, ElipseFleet):
+        return flota
+    return flota.a_lista()
@@ -0,0 +1,138 @@
+# core/collision/CollisionPipeline.py
+"""
+Detección de colisiones por etapas, de la más barata a la más costosa:
+0. fase amplia: cKDTree sobre los centros (descarta pares lejanos sin evaluarlos)
+1. caja envolvente (AABB): rechaza si las cajas alineadas a los ejes no se tocan
+2. círculos: rechaza si los círculos circunscritos (radio max(a, b)) no se tocan,
+   acepta si los círculos inscritos (radio min(a, b)) se tocan
+3. prueba exacta del haz de cónicas (colision_exacta_flota)
+Cada etapa registra cuántos pares decidió y cuánto tiempo tomó, para ajustar los umbrales
+con datos reales de la flota.
+"""
+from threading import Lock
+from time import perf_counter
+import numpy as np
+from core.Fleet_ellipse import como_flota
+from .CollisionDetection import _margen_separacion_lote
+from .SpatialIndex import pares_candidatos
+
+ETAPAS = ('fase_amplia', 'aabb', 'circulos', 'exacta')
+
+class PipelineColisiones:
+    """
+    Clasificador de pares por etapas con contadores acumulados.
+    - holgura: margen relativo de las etapas de rechazo (evita rechazar tangencias por redondeo)
+    - factor_inscrito: fracción de min(a, b) usada en la aceptación por círculos inscritos (0 < f <= 1)
+    - tolerancia: la misma de colision_exacta
+    Las etapas son conservadoras: el resultado coincide con la prueba exacta.
+    Los contadores se actualizan bajo un candado (la instancia compartida la usan varias sesiones).
+    """
+
+    def __init__(self, holgura=1e-6, factor_inscrito=1.0, tolerancia=1e-9, usar_fase_amplia=True):
+        if holgura < 0:
+            raise ValueError("La holgura de rechazo no puede ser negativa.")
+        if not 0 < factor_inscrito <= 1:
+            raise ValueError("El factor de los círculos inscritos debe estar en (0, 1].")
+        self.holgura = holgura
+        self.factor_inscrito = factor_inscrito
+        self.tolerancia = tolerancia
+        self.usar_fase_amplia = usar_fase_amplia
+        self._candado = Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        with self._candado:
+            self.contadores = {etapa: {'evaluados': 0, 'aceptados': 0, 'rechazados': 0, 'tiempo': 0.0}
+                               for etapa in ETAPAS}
+
+    def _registrar(self, etapa, evaluados, aceptados, rechazados, inicio):
+        tiempo = perf_counter() - inicio
+        with self._candado:
+            contador = self.contadores[etapa]
+            contador['evaluados'] += int(evaluados)
+            contador['aceptados'] += int(aceptados)
+            contador['rechazados'] += int(rechazados)
+            contador['tiempo'] += tiempo
+
+    def evaluar(self, elipses, i=None, j=None):
+        """
+        Clasifica los pares (i[p], j[p]); sin índices se evalúan todos los pares i < j
+        (con la fase amplia solo llegan a las etapas siguientes los pares cercanos).
+        Devuelve (i, j, colision) para los pares que superaron la fase amplia.
+        """
+        flota = como_flota(elipses)
+        sx, sy = flota.semiejes_xy()
+        # Los semiejes pueden venir con a < b: los círculos usan el mayor y el menor de los dos
+        radios_maximos = flota.radios_maximos()
+        radios_minimos = np.minimum(flota.a, flota.b)
+        holgura = 1 + self.holgura
+
+        inicio = perf_counter()
+        if i is None:
+            n = len(flota)
+            total = n * (n - 1) // 2
+            if self.usar_fase_amplia:
+                # Alcance del círculo circunscrito más grande: ningún par en colisión queda fuera
+                i, j = pares_candidatos(flota, 2 * radios_maximos.max() * holgura if n else 0)
+            else:
+                i, j = np.triu_indices(n, k=1)
+            self._registrar('fase_amplia', total, 0, total - len(i), inicio)
+        i, j = np.asarray(i, dtype=np.intp), np.asarray(j, dtype=np.intp)
+        colision = np.zeros(len(i), dtype=bool)
+        pendientes = np.arange(len(i))
+
+        # Etapa 1: cajas envolventes
+        inicio = perf_counter()
+        dx = np.abs(flota.h[i] - flota.h[j])
+        dy = np.abs(flota.k[i] - flota.k[j])
+        rechazo = (dx > (sx[i] + sx[j]) * holgura) | (dy > (sy[i] + sy[j]) * holgura)
+        pendientes = pendientes[~rechazo]
+        self._registrar('aabb', len(i), 0, rechazo.sum(), inicio)
+
+        # Etapa 2: círculos circunscritos (rechazo) e inscritos (aceptación)
+        inicio = perf_counter()
+        ip, jp = i[pendientes], j[pendientes]
+        distancia = np.hypot(dx[pendientes], dy[pendientes])
+        rechazo = distancia > (radios_maximos[ip] + radios_maximos[jp]) * holgura
+        acepta = distancia <= (radios_minimos[ip] + radios_minimos[jp]) * self.factor_inscrito
+        colision[pendientes[acepta]] = True
+        evaluados = len(pendientes)
+        pendientes = pendientes[~(rechazo | acepta)]
+        self._registrar('circulos', evaluados, acepta.sum(), rechazo.sum(), inicio)
+
+        # Etapa 3: prueba exacta solo para los pares indecisos
+        inicio = perf_counter()
+        ip, jp = i[pendientes], j[pendientes]
+        margen = _margen_separacion_lote(flota.h[ip], flota.k[ip], sx[ip], sy[ip],
+                                         flota.h[jp], flota.k[jp], sx[jp], sy[jp])
+        acepta = margen <= self.tolerancia
+        colision[pendientes[acepta]] = True
+        self._registrar('exacta', len(pendientes), acepta.sum(), (~acepta).sum(), inicio)
+
+        return i, j, colision
+
+    def pares_en_colision(self, elipses):
+        """Pares (i, j), i < j, que se intersectan según la prueba exacta"""
+        i, j, colision = self.evaluar(elipses)
+        return i[colision], j[colision]
+
+    def resumen(self):
+        """Pares decididos por etapa, porcentaje sobre el total y tiempo en milisegundos"""
+        with self._candado:
+            contadores = {etapa: dict(contador) for etapa, contador in self.contadores.items()}
+        total = contadores['fase_amplia']['evaluados'] or contadores['aabb']['evaluados']
+        resumen = []
+        for etapa in ETAPAS:
+            contador = contadores[etapa]
+            decididos = contador['aceptados'] + contador['rechazados']
+            resumen.append({
+                'etapa': etapa,
+                'evaluados': contador['evaluados'],
+                'decididos': decididos,
+                'porcentaje_decididos': round(decididos / total * 100, 2) if total else 0,
+                'tiempo_ms': round(contador['tiempo'] * 1000, 3)
+            })
+        return resumen
+
+# Instancia compartida: acumula estadísticas de todas las consultas
+PIPELINE_COLISIONES = PipelineColisiones()
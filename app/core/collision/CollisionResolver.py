@@ -3,46 +3,427 @@
 Algoritmos para resolución automática de colisiones entre elipses
 """
 from core.Math_ellipse import Elipse
-from core.collision.CollisionDetection import hay_colision_mejorada, distancia_centros
+from core.Fleet_ellipse import ElipseFleet, como_flota, listas_parametros
+from core.collision.CollisionDetection import distancia_centros
+from core.collision.SpatialIndex import pares_en_colision
+from core.collision.CollisionGraph import GrafoColisiones
+from core.collision.CollisionOptimizer import resolver_colisiones_optimizado
+from core.collision.ParallelAnalysis import numero_trabajadores
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
 from math import sqrt
+from time import perf_counter
+import numpy as np
 
-def resolver_colisiones_automatico(elipses: list, max_iter=100, factor_ajuste=0.3, margen_seguridad=1.1):
+# Drones por tarea al resolver clusters en paralelo
+TAMANO_LOTE_CLUSTERS = 2_000
+
+# Segundos que el modo 'optimizado' dedica al optimizador antes de terminar con la heurística
+TIEMPO_LIMITE_OPTIMIZADO = 5.0
+
+DTYPE_TRAZA = np.dtype([
+    ('iteracion', np.int32),
+    ('colisiones', np.int64),                 # pares en colisión
+    ('solapamiento_maximo', np.float64),      # mayor (suma de radios efectivos - distancia)
+    ('desplazamiento_total', np.float64),     # suma de desplazamientos desde la configuración inicial
+    ('tiempo', np.float64),                   # segundos desde el inicio
+])
+
+def resolver_colisiones_automatico(elipses, max_iter=100, factor_ajuste=0.3, margen_seguridad=1.1):
     """
     Algoritmo mejorado para resolver colisiones entre múltiples elipses
+    Acepta una lista de Elipse o una ElipseFleet y devuelve el mismo tipo
     """
     if len(elipses) < 2:
         return elipses
     
-    # Crear copias de las elipses para trabajar
-    elipses_ajustadas = [Elipse(e.h, e.k, e.a, e.b, e.orientacion) for e in elipses]
+    # Trabajar sobre copias de los parámetros (listas planas, sin objetos por dron)
+    h, k, a, b, orientaciones = listas_parametros(elipses)
+    _separar_listas(h, k, a, b, max_iter, factor_ajuste, margen_seguridad)
+    n = len(h)
+    
+    if isinstance(elipses, ElipseFleet):
+        return ElipseFleet(h, k, a, b, elipses.horizontal)
+    return [Elipse(h[i], k[i], a[i], b[i], orientaciones[i]) for i in range(n)]
+
+def _separar_listas(h: list, k: list, a: list, b: list, max_iter, factor_ajuste, margen_seguridad, grupos=None):
+    """
+    Iteraciones de resolver_colisiones_automatico sobre listas de centros (modifica h y k)
+    Con grupos solo se separan pares de drones del mismo grupo (ver _IndiceColisiones)
+    """
+    radios_efectivos = [(ai + bi) / 2 for ai, bi in zip(a, b)]
+    radios_maximos = [max(ai, bi) * margen_seguridad for ai, bi in zip(a, b)]
+    
+    # Hash espacial de centros: cada iteración solo reevalúa los pares de los drones movidos
+    indice = _IndiceColisiones(h, k, radios_efectivos, grupos)
     
     for iteracion in range(max_iter):
-        colisiones_detectadas = 0
-        
         # Primera pasada: detectar todas las colisiones
-        pares_en_colision = []
-        for i in range(len(elipses_ajustadas)):
-            for j in range(i + 1, len(elipses_ajustadas)):
-                if hay_colision_mejorada(elipses_ajustadas[i], elipses_ajustadas[j]):
-                    pares_en_colision.append((i, j))
-                    colisiones_detectadas += 1
+        # (mismos pares y orden lexicográfico que el doble bucle)
+        pares_en_colision = indice.pares()
         
         # Si no hay colisiones, terminar
-        if colisiones_detectadas == 0:
+        if not pares_en_colision:
             break
         
         # Segunda pasada: resolver colisiones con un factor de ajuste adaptativo
         factor_actual = factor_ajuste * (1 + iteracion / max_iter)  # Aumenta gradualmente
         
         for i, j in pares_en_colision:
-            separar_elipses(
-                elipses_ajustadas[i], 
-                elipses_ajustadas[j], 
-                factor_actual,
-                margen_seguridad
-            )
+            _separar_par(h, k, radios_maximos, i, j, factor_actual)
+        indice.mover(indice.drones_en_colision(), h, k)
+
+def resolver_colisiones_por_cluster(elipses, max_iter=100, factor_ajuste=0.3, margen_seguridad=1.1, max_rondas=10,
+                                    trabajadores=1, tamano_lote=TAMANO_LOTE_CLUSTERS):
+    """
+    Resuelve cada cluster de conflicto (componente conexa del grafo de colisiones) por separado
+    Los drones sin colisiones no se tocan. Tras cada ronda se revisa toda la flota (fase amplia);
+    si al separar un cluster aparecen colisiones con drones de otro, ambos se fusionan y se
+    resuelven juntos en la ronda siguiente. Los clusters ya resueltos sin colisiones nuevas
+    no se vuelven a procesar.
+    - trabajadores: procesos para resolver los clusters en paralelo (None = todos los núcleos)
+    - tamano_lote: drones por tarea enviada a un proceso (los clusters pequeños se agrupan)
+    Acepta una lista de Elipse o una ElipseFleet y devuelve el mismo tipo
+    """
+    if len(elipses) < 2:
+        return elipses
+    
+    flota = como_flota(elipses).copia()
+    n = len(flota)
+    # Cluster en el que se resolvió cada dron por última vez (-1: nunca)
+    etiquetas = np.full(n, -1, dtype=np.intp)
+    siguiente_etiqueta = 0
+    with _EjecutorClusters(trabajadores, tamano_lote, (max_iter, factor_ajuste, margen_seguridad)) as ejecutor:
+        for _ in range(max_rondas):
+            i, j = pares_en_colision(flota)
+            if len(i) == 0:
+                break
+            clusters = _clusters_fusionados(n, i, j, etiquetas)
+            for indices, (h, k) in zip(clusters, ejecutor.resolver(flota, clusters)):
+                flota.h[indices] = h
+                flota.k[indices] = k
+                etiquetas[indices] = siguiente_etiqueta
+                siguiente_etiqueta += 1
+    
+    if isinstance(elipses, ElipseFleet):
+        return flota
+    return flota.a_lista()
+
+def _clusters_fusionados(n, i, j, etiquetas):
+    """
+    Clusters a resolver: componentes del grafo de colisiones actuales más aristas que unen a
+    cada dron con los demás integrantes de su cluster anterior. Solo se devuelven los que
+    tienen alguna colisión; el mayor primero (así el más costoso empieza antes).
+    """
+    miembros = np.flatnonzero(etiquetas >= 0)
+    representantes = np.full(etiquetas.max() + 1, -1, dtype=np.intp)
+    # El menor índice de cada cluster anterior lo representa (miembros está ordenado)
+    _, primeros = np.unique(etiquetas[miembros], return_index=True)
+    representantes[etiquetas[miembros[primeros]]] = miembros[primeros]
+    grafo = GrafoColisiones(n, np.concatenate((i, miembros)),
+                            np.concatenate((j, representantes[etiquetas[miembros]])))
+    _, componentes = grafo.componentes()
+
+    con_colision = np.zeros(n, dtype=bool)
+    con_colision[componentes[i]] = True
+    seleccionados = np.flatnonzero(con_colision[componentes])
+    orden = np.argsort(componentes[seleccionados], kind='stable')
+    seleccionados = seleccionados[orden]
+    cortes = np.flatnonzero(np.diff(componentes[seleccionados])) + 1
+    clusters = np.split(seleccionados, cortes)
+    return sorted(clusters, key=len, reverse=True)
+
+def _resolver_lote(lote, max_iter, factor_ajuste, margen_seguridad):
+    """
+    Resuelve un lote de clusters (h, k, a, b, horizontal) en una sola llamada; se ejecuta en los
+    procesos. Solo se separan pares del mismo cluster: cada uno avanza exactamente como si se
+    resolviera solo (el resultado no depende de cómo se agrupan en lotes). Si dos clusters
+    terminan chocando, la revisión de la ronda siguiente los fusiona.
+    """
+    tamanos = [len(h) for h, *_ in lote]
+    h, k, a, b = (np.concatenate(valores).tolist() for valores in list(zip(*lote))[:4])
+    _separar_listas(h, k, a, b, max_iter, factor_ajuste, margen_seguridad,
+                    grupos=np.repeat(np.arange(len(lote)), tamanos))
+    cortes = np.cumsum(tamanos)[:-1]
+    return list(zip(np.split(np.array(h), cortes), np.split(np.array(k), cortes)))
+
+class _EjecutorClusters:
+    """
+    Reparte clusters entre procesos (ProcessPoolExecutor creado una sola vez por resolución)
+    Los clusters se agrupan en lotes de ~tamano_lote drones. Con un trabajador, con pocos
+    drones en conflicto o sin soporte de procesos se resuelve en el proceso actual.
+    """
+
+    def __init__(self, trabajadores, tamano_lote, parametros):
+        self.trabajadores = numero_trabajadores(trabajadores)
+        self.tamano_lote = tamano_lote
+        self.parametros = parametros
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def _lotes(self, flota, clusters):
+        lotes, actual, drones = [], [], 0
+        for indices in clusters:
+            actual.append((flota.h[indices], flota.k[indices], flota.a[indices], flota.b[indices],
+                           flota.horizontal[indices]))
+            drones += len(indices)
+            if drones >= self.tamano_lote:
+                lotes.append(actual)
+                actual, drones = [], 0
+        if actual:
+            lotes.append(actual)
+        return lotes
+
+    def resolver(self, flota, clusters):
+        """Lista de (h, k) resueltos, en el orden de los clusters"""
+        lotes = self._lotes(flota, clusters)
+        if self.trabajadores > 1 and len(lotes) > 1:
+            try:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.trabajadores)
+                parametros = [repeat(valor, len(lotes)) for valor in self.parametros]
+                return [resultado for lote in self._executor.map(_resolver_lote, lotes, *parametros)
+                        for resultado in lote]
+            except (OSError, NotImplementedError, BrokenProcessPool):
+                # Entorno sin procesos disponibles: seguir en secuencia
+                self.trabajadores = 1
+        return [resultado for lote in lotes for resultado in _resolver_lote(lote, *self.parametros)]
+
+def resolver_colisiones_vectorizado(elipses, max_iter=100, factor_ajuste=0.5, margen_seguridad=1.1):
+    """
+    Resolución por fuerzas sobre toda la flota: en cada iteración se calculan a la vez los
+    vectores de separación de todos los pares en colisión, se suman por dron y cada dron
+    se mueve una sola vez. El resultado no depende del orden de los pares.
+    - factor_ajuste: fracción del solapamiento (con margen) que corrige cada dron de un par;
+      con 0.5 un par aislado queda a la distancia objetivo en una sola iteración
+    - La suma de empujes de cada dron se limita a su mayor empuje individual, así los drones
+      con muchos vecinos no se pasan de largo (ver _desplazamientos_separacion)
+    Frente a resolver_colisiones_automatico: en promedio necesita menos iteraciones, pero no en
+    todas las flotas (en flotas sintéticas de 1000 drones fue más lento en 10 de 36), y desplaza
+    más a los drones (desplazamiento medio ~20 % mayor en flotas de 500 drones), porque cada par
+    se corrige por completo en vez de en fracciones crecientes.
+    Acepta una lista de Elipse o una ElipseFleet y devuelve el mismo tipo
+    """
+    if len(elipses) < 2:
+        return elipses
+    
+    flota = como_flota(elipses).copia()
+    radios_maximos = np.maximum(flota.a, flota.b) * margen_seguridad
     
-    return elipses_ajustadas
+    for _ in range(max_iter):
+        i, j = pares_en_colision(flota)
+        if len(i) == 0:
+            break
+        
+        desplazamiento_x, desplazamiento_y = _desplazamientos_separacion(
+            flota.h, flota.k, radios_maximos, i, j, factor_ajuste)
+        flota.h += desplazamiento_x
+        flota.k += desplazamiento_y
+    
+    if isinstance(elipses, ElipseFleet):
+        return flota
+    return flota.a_lista()
+
+def resolver_colisiones_con_plazo(elipses, tiempo_limite=2.0, max_iter=1000, factor_ajuste=0.5,
+                                  margen_seguridad=1.1, paciencia=20):
+    """
+    Resolución "anytime" con el paso vectorizado: se detiene al resolver todas las colisiones,
+    al agotar tiempo_limite (segundos de reloj), al cumplir max_iter o cuando la mejor
+    configuración no mejora durante `paciencia` iteraciones (menos colisiones o, a igual
+    número, menor solapamiento máximo). Devuelve siempre la mejor configuración encontrada.
+    Resultado: diccionario con
+    - elipses_resueltas: mejor configuración (mismo tipo que la entrada)
+    - traza: arreglo estructurado (DTYPE_TRAZA) con una fila por configuración evaluada
+    - motivo_parada: 'resuelto', 'plazo', 'estancado' o 'max_iter'
+    - mejor_iteracion: iteración de la configuración devuelta
+    """
+    inicio = perf_counter()
+    flota = como_flota(elipses).copia()
+    h0, k0 = flota.h.copy(), flota.k.copy()
+    radios = flota.radios_efectivos()
+    radios_maximos = np.maximum(flota.a, flota.b) * margen_seguridad
+    
+    filas = []
+    mejor = mejor_h = mejor_k = None
+    mejor_iteracion = sin_mejora = 0
+    for iteracion in range(max_iter + 1):
+        i, j = pares_en_colision(flota)
+        solapamientos = radios[i] + radios[j] - np.hypot(flota.h[i] - flota.h[j], flota.k[i] - flota.k[j])
+        estado = (len(i), float(solapamientos.max()) if len(i) else 0.0)
+        filas.append((iteracion, *estado, float(np.hypot(flota.h - h0, flota.k - k0).sum()),
+                      perf_counter() - inicio))
+        
+        if mejor is None or estado < mejor:
+            mejor, mejor_iteracion, sin_mejora = estado, iteracion, 0
+            mejor_h, mejor_k = flota.h.copy(), flota.k.copy()
+        else:
+            sin_mejora += 1
+        
+        if len(i) == 0:
+            motivo = 'resuelto'
+        elif perf_counter() - inicio >= tiempo_limite:
+            motivo = 'plazo'
+        elif sin_mejora >= paciencia:
+            motivo = 'estancado'
+        elif iteracion == max_iter:
+            motivo = 'max_iter'
+        else:
+            desplazamiento_x, desplazamiento_y = _desplazamientos_separacion(
+                flota.h, flota.k, radios_maximos, i, j, factor_ajuste)
+            flota.h += desplazamiento_x
+            flota.k += desplazamiento_y
+            continue
+        break
+    
+    flota.h[:], flota.k[:] = mejor_h, mejor_k
+    return {
+        'elipses_resueltas': flota if isinstance(elipses, ElipseFleet) else flota.a_lista(),
+        'traza': np.array(filas, dtype=DTYPE_TRAZA),
+        'motivo_parada': motivo,
+        'mejor_iteracion': mejor_iteracion,
+    }
+
+def _desplazamientos_separacion(h, k, radios_maximos, i, j, factor):
+    """
+    Desplazamiento neto (x, y) de cada dron: suma de los empujes de _separar_par
+    de todos sus pares (i, j), calculados sobre las mismas posiciones.
+    La norma de la suma se limita al mayor empuje individual del dron: sin el tope, un dron
+    empujado por varios vecinos a la vez recorre la suma de todos los empujes y cae sobre otros.
+    """
+    dx = h[j] - h[i]
+    dy = k[j] - k[i]
+    distancias = np.sqrt(dx * dx + dy * dy)
+    
+    # Centros coincidentes: separación artificial a lo largo de X
+    coincidentes = distancias == 0
+    dx[coincidentes], dy[coincidentes], distancias[coincidentes] = 1.0, 0.0, 1.0
+    
+    movimiento = np.maximum(0, radios_maximos[i] + radios_maximos[j] - distancias) * factor
+    movimiento_x = dx / distancias * movimiento
+    movimiento_y = dy / distancias * movimiento
+    
+    n = len(h)
+    desplazamiento_x = np.bincount(j, movimiento_x, n) - np.bincount(i, movimiento_x, n)
+    desplazamiento_y = np.bincount(j, movimiento_y, n) - np.bincount(i, movimiento_y, n)
+    
+    tope = np.zeros(n)
+    np.maximum.at(tope, i, movimiento)
+    np.maximum.at(tope, j, movimiento)
+    norma = np.hypot(desplazamiento_x, desplazamiento_y)
+    escala = np.minimum(1, tope / np.maximum(norma, 1e-300))
+    return desplazamiento_x * escala, desplazamiento_y * escala
+
+class _IndiceColisiones:
+    """
+    Pares en colisión (criterio de hay_colision_mejorada) sobre centros que cambian
+    Hash espacial en arreglos: cada dron guarda la celda de su centro (celdas de dos radios
+    máximos, así todo par en colisión queda en celdas vecinas). Al mover drones solo se
+    actualizan sus celdas y se reevalúan sus pares con los drones de las 3 x 3 celdas cercanas.
+    Los pares se guardan como claves i * n + j (i < j) ordenadas.
+    Con grupos (etiqueta por dron) solo se consideran pares de drones del mismo grupo.
+    """
+
+    def __init__(self, h: list, k: list, radios: list, grupos=None):
+        self.n = len(h)
+        self.grupos = grupos
+        self.x = np.array(h, dtype=np.float64)
+        self.y = np.array(k, dtype=np.float64)
+        self.radios = np.array(radios, dtype=np.float64)
+        self.tamano_celda = 2 * self.radios.max()
+        self.celda_x = np.empty(self.n, dtype=np.int64)
+        self.celda_y = np.empty(self.n, dtype=np.int64)
+        todos = np.arange(self.n)
+        self._asignar_celdas(todos)
+        self.claves = self._claves_en_colision(todos)
+
+    def _asignar_celdas(self, indices):
+        self.celda_x[indices] = np.floor(self.x[indices] / self.tamano_celda)
+        self.celda_y[indices] = np.floor(self.y[indices] / self.tamano_celda)
+
+    def _claves_en_colision(self, indices):
+        """Claves de los pares en colisión en los que participa algún dron de `indices`"""
+        # Clave de celda única para la grilla actual (con un borde de una celda)
+        cx = self.celda_x - self.celda_x.min() + 1
+        cy = self.celda_y - self.celda_y.min() + 1
+        ancho = int(cy.max()) + 2
+        celdas = cx * ancho + cy
+        orden = np.argsort(celdas, kind='stable')
+        ordenadas = celdas[orden]
+
+        lista_i, lista_j = [], []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                buscadas = celdas[indices] + dx * ancho + dy
+                inicio = np.searchsorted(ordenadas, buscadas, side='left')
+                cantidad = np.searchsorted(ordenadas, buscadas, side='right') - inicio
+                total = int(cantidad.sum())
+                if total == 0:
+                    continue
+                desplazamiento = np.arange(total) - np.repeat(np.cumsum(cantidad) - cantidad, cantidad)
+                lista_i.append(np.repeat(indices, cantidad))
+                lista_j.append(orden[np.repeat(inicio, cantidad) + desplazamiento])
+        if not lista_i:
+            return np.empty(0, dtype=np.int64)
+
+        i, j = np.concatenate(lista_i), np.concatenate(lista_j)
+        # Misma expresión que la matriz de colisiones (resultados idénticos bit a bit)
+        dx = self.x[i] - self.x[j]
+        dy = self.y[i] - self.y[j]
+        colision = (i != j) & (np.sqrt(dx * dx + dy * dy) < self.radios[i] + self.radios[j])
+        if self.grupos is not None:
+            colision &= self.grupos[i] == self.grupos[j]
+        i, j = i[colision], j[colision]
+        return np.unique(np.minimum(i, j).astype(np.int64) * self.n + np.maximum(i, j))
+
+    def pares(self) -> list:
+        """Pares (i, j), i < j, en orden lexicográfico"""
+        return list(zip((self.claves // self.n).tolist(), (self.claves % self.n).tolist()))
+
+    def drones_en_colision(self):
+        """Índices (ordenados) de los drones que participan en algún par en colisión"""
+        return np.unique(np.concatenate((self.claves // self.n, self.claves % self.n)))
+
+    def mover(self, indices, h: list, k: list):
+        """Actualiza celdas y colisiones de los drones cuyos centros cambiaron"""
+        if len(indices) == 0:
+            return
+        self.x[indices] = [h[i] for i in indices.tolist()]
+        self.y[indices] = [k[i] for i in indices.tolist()]
+        self._asignar_celdas(indices)
+
+        movido = np.zeros(self.n, dtype=bool)
+        movido[indices] = True
+        conservadas = self.claves[~(movido[self.claves // self.n] | movido[self.claves % self.n])]
+        self.claves = np.union1d(conservadas, self._claves_en_colision(indices))
+
+def _separar_par(h: list, k: list, radios_maximos: list, i: int, j: int, factor: float):
+    """
+    Equivalente a separar_elipses operando sobre listas de centros
+    (radios_maximos ya incluye el margen de seguridad)
+    """
+    dx = h[j] - h[i]
+    dy = k[j] - k[i]
+    distancia_actual = sqrt((h[i] - h[j])**2 + (k[i] - k[j])**2)
+    
+    if distancia_actual == 0:
+        dx, dy = 1.0, 0.0
+        distancia_actual = 1.0
+    
+    movimiento_necesario = max(0, (radios_maximos[i] + radios_maximos[j] - distancia_actual)) * factor
+    movimiento_x = dx / distancia_actual * movimiento_necesario
+    movimiento_y = dy / distancia_actual * movimiento_necesario
+    
+    h[i] -= movimiento_x
+    k[i] -= movimiento_y
+    h[j] += movimiento_x
+    k[j] += movimiento_y
 
 def separar_elipses(elipse1: Elipse, elipse2: Elipse, factor=0.3, margen_seguridad=1.1):
     """
@@ -82,15 +463,27 @@ def separar_elipses(elipse1: Elipse, elipse2: Elipse, factor=0.3, margen_segurid
     elipse2.h += movimiento_x
     elipse2.k += movimiento_y
 
-def verificar_resolucion(elipses: list):
+def resolver_colisiones_optimizado_con_plazo(elipses, tiempo_limite=TIEMPO_LIMITE_OPTIMIZADO,
+                                            margen_seguridad=1.1, **opciones):
+    """
+    Modo 'optimizado': desplazamiento mínimo (resolver_colisiones_optimizado) con un tope de
+    tiempo. El costo del optimizador crece con el tamaño y la densidad de la flota (alrededor de
+    un segundo para miles de drones, varios para decenas de miles o flotas muy densas); si se
+    agota el plazo con colisiones pendientes, la heurística secuencial las resuelve partiendo
+    de la configuración alcanzada.
+    """
+    resueltas = resolver_colisiones_optimizado(elipses, margen_seguridad, tiempo_limite=tiempo_limite,
+                                               **opciones)
+    if verificar_resolucion(resueltas):
+        return resueltas
+    return resolver_colisiones_automatico(resueltas, margen_seguridad=margen_seguridad)
+
+def verificar_resolucion(elipses):
     """
     Verifica si todas las colisiones han sido resueltas
+    (solo se evalúan los pares cercanos entregados por la fase amplia)
     """
-    for i in range(len(elipses)):
-        for j in range(i + 1, len(elipses)):
-            if hay_colision_mejorada(elipses[i], elipses[j]):
-                return False
-    return True
+    return len(pares_en_colision(elipses)[0]) == 0
 
 def obtener_estadisticas_resolucion(elipses_originales: list, elipses_resueltas: list):
     """
@@ -109,4 +502,22 @@ def obtener_estadisticas_resolucion(elipses_originales: list, elipses_resueltas:
         'desplazamiento_maximo': max(desplazamientos),
         'desplazamiento_minimo': min(desplazamientos),
         'colisiones_resueltas': verificar_resolucion(elipses_resueltas)
-    }
\ No newline at end of file
+    }
+
+# Modos disponibles para resolver_colisiones
+MODOS_RESOLUCION = {
+    'secuencial': resolver_colisiones_automatico,
+    'vectorizado': resolver_colisiones_vectorizado,
+    'cluster': resolver_colisiones_por_cluster,
+    'optimizado': resolver_colisiones_optimizado_con_plazo,
+}
+
+def resolver_colisiones(elipses, modo='secuencial', **opciones):
+    """
+    Resuelve las colisiones con el algoritmo indicado por `modo` (ver MODOS_RESOLUCION)
+    Las opciones se pasan al resolvedor (max_iter, factor_ajuste, margen_seguridad, ...)
+    """
+    if modo not in MODOS_RESOLUCION:
+        raise ValueError(f"Modo de resolución desconocido: {modo!r}. "
+                         f"Opciones: {', '.join(MODOS_RESOLUCION)}")
+    return MODOS_RESOLUCION[modo](elipses, **opciones)
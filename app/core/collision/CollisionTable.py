@@ -0,0 +1,68 @@
+# core/collision/CollisionTable.py
+"""
+Resultados de análisis de múltiples pares en formato columnar (arreglo estructurado de NumPy)
+Cada fila guarda índices enteros del par, métricas float y códigos enteros pequeños para
+el tipo de colisión y el nivel de riesgo. Las cadenas legibles (RUTs, emojis, etiquetas)
+se generan solo al mostrar los resultados.
+"""
+import numpy as np
+from core.Fleet_ellipse import como_flota
+from .CollisionClassification import TIPOS_COLISION, NIVELES_RIESGO, clasificar_lote
+
+DTYPE_RESULTADOS = np.dtype([
+    ('i', np.int32),
+    ('j', np.int32),
+    ('colision', np.bool_),
+    ('tipo', np.uint8),
+    ('riesgo', np.uint8),
+    ('distancia_centros', np.float64),
+    ('suma_radios_maximos', np.float64),
+    ('suma_radios_minimos', np.float64),
+    ('diferencia_radios', np.float64),
+    ('porcentaje_solapamiento', np.float64),
+])
+
+def tabla_resultados(elipses, i, j):
+    """
+    Arreglo estructurado (DTYPE_RESULTADOS) con una fila por par (i[p], j[p])
+    Las métricas son las de analizar_colision_detallada, sin redondear
+    """
+    flota = como_flota(elipses)
+    i, j = np.asarray(i, dtype=np.intp), np.asarray(j, dtype=np.intp)
+    tabla = np.zeros(len(i), dtype=DTYPE_RESULTADOS)
+    tabla['i'] = i
+    tabla['j'] = j
+
+    distancia = np.sqrt((flota.h[i] - flota.h[j])**2 + (flota.k[i] - flota.k[j])**2)
+    radios = flota.radios_efectivos()
+    suma_maximos = flota.a[i] + flota.a[j]
+    tabla['colision'] = distancia < radios[i] + radios[j]
+    tabla['distancia_centros'] = distancia
+    tabla['suma_radios_maximos'] = suma_maximos
+    tabla['suma_radios_minimos'] = flota.b[i] + flota.b[j]
+    tabla['diferencia_radios'] = np.abs(flota.a[i] - flota.a[j])
+    tabla['porcentaje_solapamiento'] = np.where(distancia < suma_maximos,
+                                                (suma_maximos - distancia) / suma_maximos * 100, 0.0)
+    tabla['tipo'], tabla['riesgo'] = clasificar_lote(flota, i, j)
+    return tabla
+
+def fila_legible(fila, identificadores=None):
+    """Convierte una fila de la tabla al formato de texto usado por la interfaz"""
+    i, j = int(fila['i']), int(fila['j'])
+    return {
+        'id1': identificadores[i] if identificadores is not None else i,
+        'id2': identificadores[j] if identificadores is not None else j,
+        'tiene_colision': bool(fila['colision']),
+        'tipo': TIPOS_COLISION[fila['tipo']],
+        'nivel_riesgo': NIVELES_RIESGO[fila['riesgo']],
+        'distancia_centros': round(float(fila['distancia_centros']), 2),
+        'suma_radios_maximos': round(float(fila['suma_radios_maximos']), 2),
+        'suma_radios_minimos': round(float(fila['suma_radios_minimos']), 2),
+        'diferencia_radios': round(float(fila['diferencia_radios']), 2),
+        'porcentaje_solapamiento': round(float(fila['porcentaje_solapamiento']), 1),
+    }
+
+def filas_legibles(tabla, identificadores=None, solo_colisiones=False):
+    """Generador de filas formateadas (para mostrar solo lo que se va a ver)"""
+    for fila in tabla[tabla['colision']] if solo_colisiones else tabla:
+        yield fila_legible(fila, identificadores)
@@ -0,0 +1,129 @@
+# core/collision/CollisionTracker.py
+"""
+Seguimiento incremental de colisiones (criterio de hay_colision_mejorada)
+Mantiene el conjunto de pares en colisión y, cuando se agregan, mueven o eliminan
+algunas elipses, reevalúa solo los pares de esas elipses con sus vecinas del hash espacial:
+O(k · vecinos) para k elipses modificadas en vez de O(n²).
+"""
+from core.Math_ellipse import Elipse
+from .CollisionDetection import hay_colision_mejorada
+from .SpatialIndex import HashEspacial
+
+def _copia(elipse):
+    return Elipse(elipse.h, elipse.k, elipse.a, elipse.b, elipse.orientacion)
+
+def _radio_efectivo(elipse):
+    return (elipse.a + elipse.b) / 2
+
+def claves_por_ocurrencia(valores):
+    """Claves únicas para valores repetidos: 'x', 'x#2', 'x#3', ..."""
+    vistos = {}
+    claves = []
+    for valor in valores:
+        vistos[valor] = vistos.get(valor, 0) + 1
+        claves.append(valor if vistos[valor] == 1 else f"{valor}#{vistos[valor]}")
+    return claves
+
+class SeguidorColisiones:
+    """
+    Conjunto de colisiones actualizable por elipse.
+    Las claves identifican a cada dron (por ejemplo su RUT); se guardan copias de las elipses.
+    """
+
+    def __init__(self, elipses=None, tamano_celda=None):
+        self._elipses = {}
+        self._vecinos = {}
+        self._radio_maximo = 0.0
+        self._hash = None
+        self._tamano_celda = tamano_celda
+        if elipses:
+            self.sincronizar(elipses)
+
+    def __len__(self):
+        return len(self._elipses)
+
+    def __contains__(self, clave):
+        return clave in self._elipses
+
+    def _asegurar_hash(self, elipse):
+        if self._hash is None:
+            # Celda del tamaño de un par típico de elipses (2 radios efectivos)
+            self._hash = HashEspacial(self._tamano_celda or 2 * _radio_efectivo(elipse))
+
+    def _conectar(self, clave):
+        """Evalúa la elipse contra sus vecinas del hash y registra las colisiones"""
+        elipse = self._elipses[clave]
+        alcance = _radio_efectivo(elipse) + self._radio_maximo
+        vecinos = self._vecinos[clave]
+        for otra in self._hash.consultar(elipse.h, elipse.k, alcance):
+            if otra != clave and hay_colision_mejorada(elipse, self._elipses[otra]):
+                vecinos.add(otra)
+                self._vecinos[otra].add(clave)
+
+    def _desconectar(self, clave):
+        for otra in self._vecinos[clave]:
+            self._vecinos[otra].discard(clave)
+        self._vecinos[clave] = set()
+
+    def agregar(self, clave, elipse):
+        if clave in self._elipses:
+            raise KeyError(f"La clave {clave!r} ya existe; use actualizar.")
+        elipse = _copia(elipse)
+        self._asegurar_hash(elipse)
+        self._elipses[clave] = elipse
+        self._vecinos[clave] = set()
+        self._radio_maximo = max(self._radio_maximo, _radio_efectivo(elipse))
+        self._hash.insertar(clave, elipse.h, elipse.k)
+        self._conectar(clave)
+
+    def actualizar(self, clave, elipse):
+        """Reemplaza la elipse (posición, semiejes u orientación) y reevalúa solo sus pares"""
+        elipse = _copia(elipse)
+        self._desconectar(clave)
+        self._elipses[clave] = elipse
+        self._radio_maximo = max(self._radio_maximo, _radio_efectivo(elipse))
+        self._hash.mover(clave, elipse.h, elipse.k)
+        self._conectar(clave)
+
+    def eliminar(self, clave):
+        self._desconectar(clave)
+        del self._vecinos[clave]
+        del self._elipses[clave]
+        self._hash.eliminar(clave)
+
+    def sincronizar(self, elipses):
+        """
+        Lleva el seguidor al estado de un diccionario {clave: elipse}
+        y devuelve cuántas claves se agregaron, actualizaron o eliminaron
+        """
+        sobrantes = [clave for clave in self._elipses if clave not in elipses]
+        for clave in sobrantes:
+            self.eliminar(clave)
+
+        cambios = len(sobrantes)
+        for clave, elipse in elipses.items():
+            actual = self._elipses.get(clave)
+            if actual is None:
+                self.agregar(clave, elipse)
+                cambios += 1
+            elif (actual.h, actual.k, actual.a, actual.b, actual.orientacion) != \
+                    (elipse.h, elipse.k, elipse.a, elipse.b, elipse.orientacion):
+                self.actualizar(clave, elipse)
+                cambios += 1
+        return cambios
+
+    def vecinos(self, clave):
+        """Claves de las elipses en colisión con la dada"""
+        return set(self._vecinos[clave])
+
+    def hay_colision(self, clave1, clave2):
+        return clave2 in self._vecinos[clave1]
+
+    def colisiones(self):
+        """Pares (clave1, clave2) en colisión, en el orden de inserción de las claves"""
+        orden = {clave: n for n, clave in enumerate(self._elipses)}
+        return sorted(((c1, c2) for c1, vecinos in self._vecinos.items() for c2 in vecinos
+                       if orden[c1] < orden[c2]), key=lambda par: (orden[par[0]], orden[par[1]]))
+
+    def total_colisiones(self):
+        return sum(len(vecinos) for vecinos in self._vecinos.values()) // 2
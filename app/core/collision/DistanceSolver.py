@@ -0,0 +1,234 @@
+# core/collision/DistanceSolver.py
+"""
+Módulo para calcular la distancia mínima entre dos elipses y sus puntos testigo
+Reemplaza la fuerza bruta de 360x360 puntos por:
+- Una semilla gruesa (proyecciones alternadas o grilla vectorizada)
+- Refinamiento de Newton sobre los ángulos de ambos perímetros
+"""
+from math import sqrt, cos, sin, atan2, copysign
+import numpy as np
+from core.Math_ellipse import semiejes_xy, tabla_trigonometrica
+from core.Fleet_ellipse import como_flota
+from .CollisionDetection import colision_exacta, colision_exacta_flota
+
+def _proyectar_en_elipse(px, py, h, k, sx, sy):
+    """
+    Punto de la región elíptica más cercano a (px, py)
+    Si el punto está fuera se resuelve la ecuación de Lagrange con Newton (monótono desde la cota inferior)
+    """
+    y0, y1 = abs(px - h), abs(py - k)
+    if (y0 / sx)**2 + (y1 / sy)**2 <= 1:
+        return px, py
+
+    a0, a1 = sx * sx, sy * sy
+    t = max(sx * y0 - a0, sy * y1 - a1, 0.0)
+    for _ in range(50):
+        r0 = sx * y0 / (t + a0)
+        r1 = sy * y1 / (t + a1)
+        f = r0 * r0 + r1 * r1 - 1
+        df = -2 * (r0 * r0 / (t + a0) + r1 * r1 / (t + a1))
+        paso = -f / df
+        t += paso
+        if abs(paso) <= 1e-15 * (1 + t):
+            break
+
+    return h + copysign(a0 * y0 / (t + a0), px - h), k + copysign(a1 * y1 / (t + a1), py - k)
+
+def _refinar_newton(e1, e2, th, ph, tolerancia, max_iter):
+    """
+    Minimiza |P1(θ) - P2(φ)|² con Newton (con retroceso) a partir de la semilla (θ, φ)
+    e1, e2 son tuplas (h, k, sx, sy); devuelve (θ, φ)
+    """
+    h1, k1, a1, b1 = e1
+    h2, k2, a2, b2 = e2
+    escala = max(a1, b1) + max(a2, b2)
+
+    def residuo(th, ph):
+        rx = h1 + a1 * cos(th) - h2 - a2 * cos(ph)
+        ry = k1 + b1 * sin(th) - k2 - b2 * sin(ph)
+        return rx, ry, rx * rx + ry * ry
+
+    rx, ry, f = residuo(th, ph)
+    for _ in range(max_iter):
+        c1, s1, c2, s2 = cos(th), sin(th), cos(ph), sin(ph)
+        d1x, d1y = -a1 * s1, b1 * c1
+        d2x, d2y = -a2 * s2, b2 * c2
+
+        # Gradiente y hessiano de f/2
+        g1 = rx * d1x + ry * d1y
+        g2 = -(rx * d2x + ry * d2y)
+        h11 = d1x * d1x + d1y * d1y - (rx * a1 * c1 + ry * b1 * s1)
+        h22 = d2x * d2x + d2y * d2y + (rx * a2 * c2 + ry * b2 * s2)
+        h12 = -(d1x * d2x + d1y * d2y)
+        det = h11 * h22 - h12 * h12
+
+        if h11 > 0 and det > 0:
+            paso_th = -(h22 * g1 - h12 * g2) / det
+            paso_ph = -(h11 * g2 - h12 * g1) / det
+        else:
+            # Hessiano no definido positivo: paso de gradiente escalado
+            escala_paso = 1 / (abs(h11) + abs(h22) + abs(h12) + 1e-300)
+            paso_th, paso_ph = -g1 * escala_paso, -g2 * escala_paso
+
+        # Retroceso para garantizar descenso
+        factor = 1.0
+        while True:
+            nrx, nry, nf = residuo(th + factor * paso_th, ph + factor * paso_ph)
+            if nf <= f or factor < 1e-6:
+                break
+            factor *= 0.5
+
+        th += factor * paso_th
+        ph += factor * paso_ph
+        rx, ry, f = nrx, nry, nf
+        if (abs(paso_th) + abs(paso_ph)) * factor * escala < tolerancia:
+            break
+
+    return th, ph
+
+def distancia_minima_precisa(elipse1, elipse2, tolerancia=1e-9, max_iter=50):
+    """
+    NUEVA FUNCIÓN: Distancia mínima entre dos elipses y los puntos donde se alcanza
+    Devuelve (distancia, punto1, punto2); si las elipses se intersectan la distancia es 0
+    y ambos puntos coinciden en un punto común a las dos
+    """
+    sx1, sy1 = semiejes_xy(elipse1)
+    sx2, sy2 = semiejes_xy(elipse2)
+    e1 = (elipse1.h, elipse1.k, sx1, sy1)
+    e2 = (elipse2.h, elipse2.k, sx2, sy2)
+
+    if colision_exacta(elipse1, elipse2)[0]:
+        return 0.0, *_punto_comun(e1, e2)
+
+    # Semilla: dos rondas de proyecciones alternadas partiendo del centro de elipse1
+    p1 = (elipse1.h, elipse1.k)
+    for _ in range(2):
+        p2 = _proyectar_en_elipse(*p1, *e2)
+        p1 = _proyectar_en_elipse(*p2, *e1)
+    th = atan2((p1[1] - e1[1]) / sy1, (p1[0] - e1[0]) / sx1)
+    ph = atan2((p2[1] - e2[1]) / sy2, (p2[0] - e2[0]) / sx2)
+
+    th, ph = _refinar_newton(e1, e2, th, ph, tolerancia, max_iter)
+    punto1 = (e1[0] + sx1 * cos(th), e1[1] + sy1 * sin(th))
+    punto2 = (e2[0] + sx2 * cos(ph), e2[1] + sy2 * sin(ph))
+    return sqrt((punto1[0] - punto2[0])**2 + (punto1[1] - punto2[1])**2), punto1, punto2
+
+def _punto_comun(e1, e2):
+    """Un punto que pertenece a ambas elipses (ya se sabe que se intersectan)"""
+    # Si un centro está dentro de la otra elipse, ese centro sirve (incluye la inclusión completa)
+    for (h, k, _, _), (ho, ko, sxo, syo) in ((e1, e2), (e2, e1)):
+        if ((h - ho) / sxo)**2 + ((k - ko) / syo)**2 <= 1:
+            return (h, k), (h, k)
+    # Si no, los perímetros se cortan: proyecciones alternadas hasta caer en la intersección
+    p = (e1[0], e1[1])
+    for _ in range(200):
+        q = _proyectar_en_elipse(*_proyectar_en_elipse(*p, *e2), *e1)
+        if q == p:
+            break
+        p = q
+    return p, p
+
+# ==================== VERSIÓN VECTORIZADA PARA MUCHOS PARES ====================
+
+def distancias_minimas_flota(elipses, i, j, tolerancia=1e-9, max_iter=20, n_semilla=16, bloque=4096):
+    """
+    Distancias mínimas para los pares (i[p], j[p]) de una flota
+    Semilla gruesa vectorizada (grilla n_semilla x n_semilla de ángulos) + Newton vectorizado
+    Devuelve (distancias (m,), puntos1 (m, 2), puntos2 (m, 2)); los pares que se
+    intersectan tienen distancia 0 y un punto común como testigo
+    """
+    flota = como_flota(elipses)
+    i, j = np.asarray(i, dtype=np.intp), np.asarray(j, dtype=np.intp)
+    m = len(i)
+    distancias = np.zeros(m)
+    puntos1 = np.zeros((m, 2))
+    puntos2 = np.zeros((m, 2))
+
+    sx, sy = flota.semiejes_xy()
+    cosenos, senos = tabla_trigonometrica(n_semilla)
+    angulos = 2 * np.pi * np.arange(n_semilla) / n_semilla
+
+    for inicio in range(0, m, bloque):
+        a, b = i[inicio:inicio + bloque], j[inicio:inicio + bloque]
+        e1 = (flota.h[a], flota.k[a], sx[a], sy[a])
+        e2 = (flota.h[b], flota.k[b], sx[b], sy[b])
+
+        # Semilla: mejor par de la grilla gruesa de ángulos
+        x1 = e1[0][:, None] + e1[2][:, None] * cosenos
+        y1 = e1[1][:, None] + e1[3][:, None] * senos
+        x2 = e2[0][:, None] + e2[2][:, None] * cosenos
+        y2 = e2[1][:, None] + e2[3][:, None] * senos
+        d2 = (x1[:, :, None] - x2[:, None, :])**2 + (y1[:, :, None] - y2[:, None, :])**2
+        mejor = d2.reshape(len(a), -1).argmin(axis=1)
+        th, ph = angulos[mejor // n_semilla], angulos[mejor % n_semilla]
+
+        th, ph = _refinar_newton_lote(e1, e2, th, ph, tolerancia, max_iter)
+        p1 = np.column_stack((e1[0] + e1[2] * np.cos(th), e1[1] + e1[3] * np.sin(th)))
+        p2 = np.column_stack((e2[0] + e2[2] * np.cos(ph), e2[1] + e2[3] * np.sin(ph)))
+        distancias[inicio:inicio + len(a)] = np.hypot(*(p1 - p2).T)
+        puntos1[inicio:inicio + len(a)] = p1
+        puntos2[inicio:inicio + len(a)] = p2
+
+    # Pares que se intersectan: distancia 0 y un punto común como testigo
+    # (centro incluido en la otra elipse o, si no, el punto de corte hallado por Newton)
+    colision, _ = colision_exacta_flota(flota, i, j)
+    centro1_en_2 = ((flota.h[i] - flota.h[j]) / sx[j])**2 + ((flota.k[i] - flota.k[j]) / sy[j])**2 <= 1
+    centro2_en_1 = ((flota.h[j] - flota.h[i]) / sx[i])**2 + ((flota.k[j] - flota.k[i]) / sy[i])**2 <= 1
+    centros1 = np.column_stack((flota.h[i], flota.k[i]))
+    centros2 = np.column_stack((flota.h[j], flota.k[j]))
+    comun = np.where(centro1_en_2[:, None], centros1, np.where(centro2_en_1[:, None], centros2, puntos1))
+    puntos1[colision] = comun[colision]
+    puntos2[colision] = comun[colision]
+    distancias[colision] = 0.0
+
+    return distancias, puntos1, puntos2
+
+def _refinar_newton_lote(e1, e2, th, ph, tolerancia, max_iter):
+    """Versión vectorizada de _refinar_newton (mismo esquema con retroceso por par)"""
+    h1, k1, a1, b1 = e1
+    h2, k2, a2, b2 = e2
+    escala = np.maximum(a1, b1) + np.maximum(a2, b2)
+
+    def residuo(th, ph):
+        rx = h1 + a1 * np.cos(th) - h2 - a2 * np.cos(ph)
+        ry = k1 + b1 * np.sin(th) - k2 - b2 * np.sin(ph)
+        return rx, ry, rx * rx + ry * ry
+
+    rx, ry, f = residuo(th, ph)
+    for _ in range(max_iter):
+        c1, s1, c2, s2 = np.cos(th), np.sin(th), np.cos(ph), np.sin(ph)
+        d1x, d1y = -a1 * s1, b1 * c1
+        d2x, d2y = -a2 * s2, b2 * c2
+
+        g1 = rx * d1x + ry * d1y
+        g2 = -(rx * d2x + ry * d2y)
+        h11 = d1x * d1x + d1y * d1y - (rx * a1 * c1 + ry * b1 * s1)
+        h22 = d2x * d2x + d2y * d2y + (rx * a2 * c2 + ry * b2 * s2)
+        h12 = -(d1x * d2x + d1y * d2y)
+        det = h11 * h22 - h12 * h12
+
+        newton = (h11 > 0) & (det > 0)
+        det_seguro = np.where(newton, det, 1.0)
+        escala_paso = 1 / (np.abs(h11) + np.abs(h22) + np.abs(h12) + 1e-300)
+        paso_th = np.where(newton, -(h22 * g1 - h12 * g2) / det_seguro, -g1 * escala_paso)
+        paso_ph = np.where(newton, -(h11 * g2 - h12 * g1) / det_seguro, -g2 * escala_paso)
+
+        # Retroceso por par: reducir a la mitad donde la función no disminuye
+        factor = np.ones_like(th)
+        nrx, nry, nf = residuo(th + paso_th, ph + paso_ph)
+        for _ in range(20):
+            sube = nf > f
+            if not sube.any():
+                break
+            factor = np.where(sube, factor * 0.5, factor)
+            nrx, nry, nf = residuo(th + factor * paso_th, ph + factor * paso_ph)
+        acepta = nf <= f
+        factor = np.where(acepta, factor, 0.0)
+
+        th = th + factor * paso_th
+        ph = ph + factor * paso_ph
+        rx, ry, f = np.where(acepta, nrx, rx), np.where(acepta, nry, ry), np.where(acepta, nf, f)
+        if np.all((np.abs(paso_th) + np.abs(paso_ph)) * factor * escala < tolerancia):
+            break
+
+    return th, ph
@@ -4,7 +4,9 @@ Módulo para calcular puntos de intersección específicos entre elipses
 VERSIÓN OPTIMIZADA: Código factorizado y acortado
 """
 from math import cos, sin, pi, sqrt
+import numpy as np
 from core.Math_ellipse import Elipse
+from core.Fleet_ellipse import como_flota
 
 def _calcular_punto_elipse(elipse: Elipse, angulo: float):
     """Calcula un punto en el perímetro de una elipse dado un ángulo (ecuacion general)"""
@@ -59,26 +61,21 @@ def encontrar_puntos_interseccion(elipse1: Elipse, elipse2: Elipse, precision: i
     """
     Encuentra los puntos específicos donde dos elipses se intersectan
     ALGORITMO CORREGIDO: Solo encuentra puntos de intersección real
+    (muestreo y transiciones evaluados en bloque con las tablas cos/sin compartidas)
     """
-    puntos_interseccion = []
-    delta_angulo = 2 * pi / precision
+    puntos = elipse1.calcular_puntos(precision)
+    valores = _valor_elipse(puntos[:, 0], puntos[:, 1], elipse2)
     
-    for i in range(precision):
-        angulo = delta_angulo * i
-        punto_actual = _calcular_punto_elipse(elipse1, angulo)
-        
-        # Verificar si está cerca del borde de elipse2
-        if not _punto_cerca_borde(*punto_actual, elipse2):
-            continue
-        
-        # Calcular puntos adyacentes para verificar transición
-        punto_anterior = _calcular_punto_elipse(elipse1, angulo - delta_angulo)
-        punto_siguiente = _calcular_punto_elipse(elipse1, angulo + delta_angulo)
-        
-        # Verificar transición y evitar duplicados
-        if (_es_transicion(punto_actual, punto_anterior, punto_siguiente, elipse2) and
-            not _hay_punto_cercano(puntos_interseccion, *punto_actual)):
-            puntos_interseccion.append((round(punto_actual[0], 3), round(punto_actual[1], 3)))
+    # Puntos cerca del borde de elipse2 con transición dentro/fuera respecto a sus vecinos
+    cerca_borde = np.abs(valores - 1.0) <= 0.01
+    dentro = valores < 0.99
+    transicion = (np.roll(dentro, 1) != dentro) | (dentro != np.roll(dentro, -1))
+    
+    puntos_interseccion = []
+    for x, y in puntos[cerca_borde & transicion].tolist():
+        # Evitar duplicados
+        if not _hay_punto_cercano(puntos_interseccion, x, y):
+            puntos_interseccion.append((round(x, 3), round(y, 3)))
     
     return puntos_interseccion
 
@@ -101,24 +98,160 @@ def encontrar_puntos_interseccion_mejorado(elipse1: Elipse, elipse2: Elipse):
 def _encontrar_puntos_direccional(elipse_origen: Elipse, elipse_destino: Elipse, precision: int = 2000):
     """Encuentra puntos de intersección en una dirección específica"""
     puntos = []
-    estado_anterior = None
     delta_angulo = 2 * pi / precision
     
-    for i in range(precision + 1):
+    # Estados dentro/fuera de todo el perímetro (cerrando la vuelta en el ángulo 2π)
+    muestras = elipse_origen.calcular_puntos(precision)
+    estados = _punto_dentro_elipse(muestras[:, 0], muestras[:, 1], elipse_destino)
+    estados = np.append(estados, estados[0])
+    
+    # Detectar cambios de estado y refinarlos
+    for i in np.flatnonzero(estados[1:] != estados[:-1]) + 1:
         angulo = delta_angulo * i
-        x, y = _calcular_punto_elipse(elipse_origen, angulo)
-        estado_actual = _punto_dentro_elipse(x, y, elipse_destino)
-        
-        # Detectar cambio de estado
-        if estado_anterior is not None and estado_anterior != estado_actual:
-            punto_refinado = _refinar_interseccion(elipse_origen, elipse_destino, angulo - delta_angulo, angulo)
-            if punto_refinado:
-                puntos.append(punto_refinado)
-        
-        estado_anterior = estado_actual
+        punto_refinado = _refinar_interseccion(elipse_origen, elipse_destino, angulo - delta_angulo, angulo)
+        if punto_refinado:
+            puntos.append(punto_refinado)
     
     return puntos
 
+# ==================== SOLUCIÓN ALGEBRAICA (CUÁRTICA) ====================
+# Con la elipse 1 centrada en el origen y coordenadas normalizadas:
+#   E1: A1·x² + C1·y² - 1 = 0
+#   E2: A2·(x-u)² + C2·(y-v)² - 1 = 0
+# Combinando C2·E1 - C1·E2 desaparece y²:  P·x² + Q·x + R·y + S = 0,
+# se despeja y y al sustituir en E1 queda una cuártica en x. Si R es casi 0 se intercambian
+# los ejes (se elimina x); si ambos son casi 0 las elipses son concéntricas y basta una cuadrática.
+
+def _raices_lote(coeficientes):
+    """
+    Raíces (complejas) de polinomios por filas, coeficientes de mayor a menor grado (m, g+1)
+    Se resuelven como valores propios de matrices compañeras, agrupando por grado efectivo
+    Devuelve (m, g) con NaN donde el grado efectivo es menor
+    """
+    m, columnas = coeficientes.shape
+    grado_max = columnas - 1
+    raices = np.full((m, grado_max), np.nan, dtype=complex)
+
+    escala = np.abs(coeficientes).max(axis=1, keepdims=True)
+    escala[escala == 0] = 1
+    significativo = np.abs(coeficientes) > 1e-12 * escala
+    inicio = np.where(significativo.any(axis=1), significativo.argmax(axis=1), columnas)
+
+    for primero in range(grado_max):
+        filas = np.flatnonzero(inicio == primero)
+        if len(filas) == 0:
+            continue
+        grado = grado_max - primero
+        monicos = coeficientes[filas, primero + 1:] / coeficientes[filas, primero:primero + 1]
+        companera = np.zeros((len(filas), grado, grado))
+        companera[:, 0, :] = -monicos
+        companera[:, np.arange(1, grado), np.arange(grado - 1)] = 1
+        raices[filas, :grado] = np.linalg.eigvals(companera)
+    return raices
+
+def _intersecciones_normalizadas(A1, C1, A2, C2, u, v):
+    """
+    Candidatos (x, y) para E1 ∩ E2 en coordenadas normalizadas, arreglos (m, 4)
+    Elimina y (requiere |R| no despreciable); las filas sin solución quedan en NaN
+    """
+    P = A1 * C2 - A2 * C1
+    Q = 2 * u * A2 * C1
+    R = 2 * v * C2 * C1
+    S = -C2 - (u*u*A2 + v*v*C2 - 1) * C1
+
+    cuartica = np.column_stack((C1 * P * P, 2 * C1 * P * Q, C1 * (Q * Q + 2 * P * S) + A1 * R * R,
+                                2 * C1 * Q * S, C1 * S * S - R * R))
+    raices = _raices_lote(cuartica)
+    x = np.where(np.abs(raices.imag) <= 1e-6 * (1 + np.abs(raices.real)), raices.real, np.nan)
+    R_seguro = np.where(R == 0, 1.0, R)[:, None]
+    y = -(P[:, None] * x * x + Q[:, None] * x + S[:, None]) / R_seguro
+    return x, y
+
+def _intersecciones_concentricas(A1, C1, A2, C2):
+    """Candidatos para elipses concéntricas: x² y y² salen de un sistema lineal 2x2"""
+    det = A1 * C2 - A2 * C1
+    det_seguro = np.where(det == 0, 1.0, det)
+    x2 = np.where(det == 0, np.nan, (C2 - C1) / det_seguro)
+    y2 = np.where(det == 0, np.nan, (A1 - A2) / det_seguro)
+    valido = (x2 >= 0) & (y2 >= 0)
+    x0 = np.sqrt(np.where(valido, x2, np.nan))
+    y0 = np.sqrt(np.where(valido, y2, np.nan))
+    signos = np.array([[1, 1], [1, -1], [-1, 1], [-1, -1]])
+    return x0[:, None] * signos[:, 0], y0[:, None] * signos[:, 1]
+
+def puntos_interseccion_flota(elipses, i, j, tolerancia=1e-8):
+    """
+    NUEVA FUNCIÓN: Puntos de intersección exactos para los pares (i[p], j[p]) de una flota
+    Devuelve (puntos (m, 4, 2) con NaN de relleno, cantidad (m,)) con 0 a 4 puntos por par
+    Las elipses idénticas (infinitos puntos comunes) se reportan sin puntos
+    """
+    flota = como_flota(elipses)
+    i, j = np.asarray(i, dtype=np.intp), np.asarray(j, dtype=np.intp)
+    sx, sy = flota.semiejes_xy()
+
+    # Trasladar a la elipse 1 y normalizar por el semieje más grande del par
+    escala = np.maximum.reduce([sx[i], sy[i], sx[j], sy[j]])
+    u = (flota.h[j] - flota.h[i]) / escala
+    v = (flota.k[j] - flota.k[i]) / escala
+    A1, C1 = (escala / sx[i])**2, (escala / sy[i])**2
+    A2, C2 = (escala / sx[j])**2, (escala / sy[j])**2
+
+    # Eliminar la variable con mejor condicionamiento (intercambiando ejes si conviene)
+    R_y = np.abs(v * C2 * C1)
+    R_x = np.abs(u * A2 * A1)
+    intercambiar = R_x > R_y
+    concentricas = np.maximum(R_x, R_y) <= 1e-12 * np.maximum.reduce([A1, C1, A2, C2])**2
+
+    x = np.full((len(i), 4), np.nan)
+    y = np.full((len(i), 4), np.nan)
+    directo = ~intercambiar & ~concentricas
+    if directo.any():
+        x[directo], y[directo] = _intersecciones_normalizadas(A1[directo], C1[directo], A2[directo],
+                                                              C2[directo], u[directo], v[directo])
+    cruzado = intercambiar & ~concentricas
+    if cruzado.any():
+        y[cruzado], x[cruzado] = _intersecciones_normalizadas(C1[cruzado], A1[cruzado], C2[cruzado],
+                                                              A2[cruzado], v[cruzado], u[cruzado])
+    if concentricas.any():
+        x[concentricas], y[concentricas] = _intersecciones_concentricas(A1[concentricas], C1[concentricas],
+                                                                        A2[concentricas], C2[concentricas])
+
+    # Pulir con Newton sobre el sistema 2x2 (precisión de máquina)
+    A1, C1, A2, C2, u, v = (arr[:, None] for arr in (A1, C1, A2, C2, u, v))
+    for _ in range(3):
+        g1 = A1 * x * x + C1 * y * y - 1
+        g2 = A2 * (x - u)**2 + C2 * (y - v)**2 - 1
+        j11, j12 = 2 * A1 * x, 2 * C1 * y
+        j21, j22 = 2 * A2 * (x - u), 2 * C2 * (y - v)
+        det = j11 * j22 - j12 * j21
+        regular = np.abs(det) > 1e-14
+        det = np.where(regular, det, 1.0)
+        x = x - np.where(regular, (j22 * g1 - j12 * g2) / det, 0.0)
+        y = y - np.where(regular, (j11 * g2 - j21 * g1) / det, 0.0)
+
+    # Descartar candidatos que no satisfacen ambas ecuaciones y duplicados
+    g1 = A1 * x * x + C1 * y * y - 1
+    g2 = A2 * (x - u)**2 + C2 * (y - v)**2 - 1
+    valido = (np.abs(g1) <= tolerancia**0.5) & (np.abs(g2) <= tolerancia**0.5)
+    for a in range(1, 4):
+        for b in range(a):
+            cercano = np.hypot(x[:, a] - x[:, b], y[:, a] - y[:, b]) <= tolerancia**0.5
+            valido[:, a] &= ~(cercano & valido[:, b])
+
+    # Volver a las coordenadas originales y compactar los puntos válidos al inicio
+    escala, h0, k0 = escala[:, None], flota.h[i][:, None], flota.k[i][:, None]
+    puntos = np.stack((h0 + x * escala, k0 + y * escala), axis=-1)
+    orden = np.argsort(~valido, axis=1, kind='stable')
+    puntos = np.take_along_axis(puntos, orden[:, :, None], axis=1)
+    cantidad = valido.sum(axis=1)
+    puntos[np.arange(4) >= cantidad[:, None]] = np.nan
+    return puntos, cantidad
+
+def puntos_interseccion_algebraicos(elipse1: Elipse, elipse2: Elipse):
+    """Puntos de intersección exactos (sin redondear) entre dos elipses, de 0 a 4 puntos"""
+    puntos, cantidad = puntos_interseccion_flota([elipse1, elipse2], [0], [1])
+    return [tuple(punto) for punto in puntos[0, :cantidad[0]].tolist()]
+
 def formatear_puntos_interseccion(puntos):
     """Formatea la lista de puntos para mostrar en la interfaz"""
     if not puntos:
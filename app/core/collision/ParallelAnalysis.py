@@ -0,0 +1,69 @@
+# core/collision/ParallelAnalysis.py
+"""
+Análisis detallado de pares en paralelo con ProcessPoolExecutor
+El análisis por par es Python puro (limitado por el GIL), por lo que se reparte en procesos:
+- los arreglos de la flota viajan una sola vez por proceso (initializer)
+- los pares se envían en bloques de índices
+- los resultados vuelven en el mismo orden de los pares (deterministas) a medida que terminan;
+  los resultados perezosos (AnalisisColision) se completan en el trabajador al serializarse
+Con un solo trabajador, pocos pares o sin soporte de procesos se usa la versión secuencial.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from core.Fleet_ellipse import ElipseFleet, como_flota
+
+TAMANO_BLOQUE_PARES = 2_000
+
+# Estado de cada proceso trabajador (se asigna en _inicializar_trabajador)
+_FLOTA_TRABAJADOR = None
+_ANALIZADOR_TRABAJADOR = None
+
+def _inicializar_trabajador(h, k, a, b, horizontal, analizador):
+    global _FLOTA_TRABAJADOR, _ANALIZADOR_TRABAJADOR
+    _FLOTA_TRABAJADOR = ElipseFleet(h, k, a, b, horizontal)
+    _ANALIZADOR_TRABAJADOR = analizador
+
+def _analizar_bloque(i, j):
+    flota = _FLOTA_TRABAJADOR
+    return [_ANALIZADOR_TRABAJADOR(flota[p], flota[q]) for p, q in zip(i.tolist(), j.tolist())]
+
+def _analizar_secuencial(flota, i, j, analizador):
+    vistas = list(flota)
+    for p, q in zip(i.tolist(), j.tolist()):
+        yield analizador(vistas[p], vistas[q])
+
+def numero_trabajadores(trabajadores=None):
+    """None usa todos los núcleos disponibles"""
+    if trabajadores is None:
+        return os.cpu_count() or 1
+    return max(1, int(trabajadores))
+
+def analizar_pares_paralelo(elipses, i, j, analizador, trabajadores=None, tamano_bloque=TAMANO_BLOQUE_PARES):
+    """
+    Generador con analizador(elipse_i, elipse_j) para cada par (i[p], j[p]), en orden.
+    analizador debe ser una función de nivel de módulo (se envía por nombre a los procesos).
+    """
+    flota = como_flota(elipses)
+    i, j = np.asarray(i, dtype=np.intp), np.asarray(j, dtype=np.intp)
+    trabajadores = numero_trabajadores(trabajadores)
+
+    if trabajadores == 1 or len(i) <= tamano_bloque:
+        yield from _analizar_secuencial(flota, i, j, analizador)
+        return
+
+    cortes = range(0, len(i), tamano_bloque)
+    bloques_i = [i[inicio:inicio + tamano_bloque] for inicio in cortes]
+    bloques_j = [j[inicio:inicio + tamano_bloque] for inicio in cortes]
+    entregados = 0
+    try:
+        with ProcessPoolExecutor(max_workers=min(trabajadores, len(bloques_i)),
+                                 initializer=_inicializar_trabajador,
+                                 initargs=(flota.h, flota.k, flota.a, flota.b, flota.horizontal, analizador)) as executor:
+            for bloque in executor.map(_analizar_bloque, bloques_i, bloques_j):
+                yield from bloque
+                entregados += len(bloque)
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        # Entorno sin procesos disponibles: continuar en secuencia desde el último par entregado
+        yield from _analizar_secuencial(flota, i[entregados:], j[entregados:], analizador)
@@ -0,0 +1,122 @@
+# core/collision/SpatialIndex.py
+"""
+Fase amplia (broad phase) para la detección de colisiones entre muchas elipses
+Usa un cKDTree sobre los centros para obtener solo los pares cercanos y
+luego aplica el mismo criterio de hay_colision_mejorada a esos candidatos
+"""
+import numpy as np
+from scipy.spatial import cKDTree
+from core.Fleet_ellipse import como_flota
+
+def _pares_vacios():
+    return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+def pares_candidatos(elipses, alcance=None):
+    """
+    Devuelve dos arreglos (i, j) con i < j, ordenados lexicográficamente, de los pares
+    cuyos centros están a una distancia <= alcance.
+    Por defecto alcance = 2 * radio efectivo máximo: ningún par en colisión queda fuera.
+    """
+    flota = como_flota(elipses)
+    if len(flota) < 2:
+        return _pares_vacios()
+    
+    if alcance is None:
+        # Pequeño margen para no perder pares justo en el límite por redondeo
+        alcance = 2 * flota.radios_efectivos().max() * (1 + 1e-9)
+    
+    centros = np.column_stack((flota.h, flota.k))
+    pares = cKDTree(centros).query_pairs(alcance, output_type='ndarray')
+    if len(pares) == 0:
+        return _pares_vacios()
+    
+    pares = np.sort(pares, axis=1)
+    orden = np.lexsort((pares[:, 1], pares[:, 0]))
+    return pares[orden, 0], pares[orden, 1]
+
+def pares_en_colision(elipses):
+    """
+    Pares (i, j), i < j, en colisión según hay_colision_mejorada
+    (distancia entre centros < suma de radios efectivos), sin recorrer todos los pares
+    """
+    flota = como_flota(elipses)
+    return filtrar_en_colision(flota, *pares_candidatos(flota))
+
+def filtrar_en_colision(elipses, i, j):
+    """Pares de (i, j) en colisión según hay_colision_mejorada (fase estrecha vectorizada)"""
+    flota = como_flota(elipses)
+    radios = flota.radios_efectivos()
+    distancias = np.sqrt((flota.h[i] - flota.h[j])**2 + (flota.k[i] - flota.k[j])**2)
+    colision = distancias < radios[i] + radios[j]
+    return i[colision], j[colision]
+
+class HashEspacial:
+    """
+    Grilla uniforme (diccionario celda -> claves) para índices que cambian con frecuencia
+    Insertar, mover y eliminar cuestan O(1); consultar recorre solo las celdas cercanas.
+    Cada clave se guarda en la celda de su centro.
+    """
+
+    def __init__(self, tamano_celda):
+        if tamano_celda <= 0:
+            raise ValueError("El tamaño de celda debe ser positivo.")
+        self.tamano_celda = float(tamano_celda)
+        self._celdas = {}
+        self._posiciones = {}
+
+    def __len__(self):
+        return len(self._posiciones)
+
+    def __contains__(self, clave):
+        return clave in self._posiciones
+
+    def _celda(self, x, y):
+        return (int(np.floor(x / self.tamano_celda)), int(np.floor(y / self.tamano_celda)))
+
+    def insertar(self, clave, x, y):
+        if clave in self._posiciones:
+            self.eliminar(clave)
+        celda = self._celda(x, y)
+        self._posiciones[clave] = (x, y, celda)
+        self._celdas.setdefault(celda, set()).add(clave)
+
+    def eliminar(self, clave):
+        _, _, celda = self._posiciones.pop(clave)
+        claves = self._celdas[celda]
+        claves.discard(clave)
+        if not claves:
+            del self._celdas[celda]
+
+    def mover(self, clave, x, y):
+        """Actualiza la posición; solo cambia de celda si es necesario"""
+        _, _, celda = self._posiciones[clave]
+        nueva = self._celda(x, y)
+        if nueva == celda:
+            self._posiciones[clave] = (x, y, celda)
+        else:
+            self.insertar(clave, x, y)
+
+    def posicion(self, clave):
+        x, y, _ = self._posiciones[clave]
+        return x, y
+
+    def consultar(self, x, y, alcance):
+        """
+        Claves cuyo centro puede estar a distancia <= alcance de (x, y)
+        (candidatos: el llamador aplica la prueba exacta)
+        """
+        cx, cy = self._celda(x, y)
+        radio = int(np.ceil(alcance / self.tamano_celda))
+        candidatos = []
+        if (2 * radio + 1)**2 > len(self._celdas):
+            # Alcance mayor que la grilla ocupada: recorrer solo las celdas existentes
+            for (celda_x, celda_y), claves in self._celdas.items():
+                if abs(celda_x - cx) <= radio and abs(celda_y - cy) <= radio:
+                    candidatos.extend(claves)
+            return candidatos
+        for dx in range(-radio, radio + 1):
+            for dy in range(-radio, radio + 1):
+                claves = self._celdas.get((cx + dx, cy + dy))
+                if claves:
+                    candidatos.extend(claves)
+        return candidatos
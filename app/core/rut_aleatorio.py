@@ -1,17 +1,11 @@
 import random
+import numpy as np
+from .rut_vectorizado import calcular_dv_lote, digitos_desde_cuerpos
+from .Fleet_ellipse import ElipseFleet, flota_desde_digitos
 
 def calcular_dv(rut_sin_dv):
-    """Calcula el dígito verificador de un RUT chileno."""
-    reversed_digits = map(int, reversed(str(rut_sin_dv)))
-    factors = [2, 3, 4, 5, 6, 7]
-    total = sum(d * factors[i % len(factors)] for i, d in enumerate(reversed_digits))
-    remainder = 11 - (total % 11)
-    if remainder == 11:
-        return "0"
-    elif remainder == 10:
-        return "K"
-    else:
-        return str(remainder)
+    """Calcula el dígito verificador de un RUT chileno (tabla de pesos compartida)."""
+    return str(calcular_dv_lote([int(rut_sin_dv)])[0])
 
 def generar_rut():
     """Genera un RUT chileno válido y formateado."""
@@ -23,3 +17,83 @@ def generar_rut():
 def generar_varios_ruts(n=3):
     """Genera una lista de RUTs válidos."""
     return [generar_rut() for _ in range(n)]
+
+
+# ==================== GENERACIÓN MASIVA PARA PRUEBAS DE CARGA ====================
+def generar_cuerpos_ruts(n, semilla=None, minimo=10_000_000, maximo=30_000_000):
+    """
+    Genera n cuerpos de RUT únicos (enteros sin DV) en [minimo, maximo).
+    Con la misma semilla se obtiene siempre la misma secuencia.
+    """
+    if n > maximo - minimo:
+        raise ValueError("No hay suficientes RUTs distintos en el rango indicado.")
+    rng = np.random.default_rng(semilla)
+    return minimo + rng.choice(maximo - minimo, size=n, replace=False)
+
+def formatear_ruts(cuerpos, dvs=None):
+    """Formatea arreglos de cuerpos (y DVs) como 'xx.xxx.xxx-d' de forma vectorizada."""
+    cuerpos = np.asarray(cuerpos, dtype=np.int64)
+    if dvs is None:
+        dvs = calcular_dv_lote(cuerpos)
+    millones = (cuerpos // 1_000_000).astype(str)
+    miles = np.char.zfill(((cuerpos // 1000) % 1000).astype(str), 3)
+    unidades = np.char.zfill((cuerpos % 1000).astype(str), 3)
+    partes = [millones, ".", miles, ".", unidades, "-", dvs]
+    resultado = partes[0]
+    for parte in partes[1:]:
+        resultado = np.char.add(resultado, parte)
+    return resultado
+
+def generar_ruts_masivos(n, semilla=None, formatear=True):
+    """
+    Genera n RUTs válidos, únicos y reproducibles.
+    Devuelve un arreglo de strings formateados o, con formatear=False,
+    la tupla (cuerpos, dvs) sin construir strings.
+    """
+    cuerpos = generar_cuerpos_ruts(n, semilla)
+    dvs = calcular_dv_lote(cuerpos)
+    if not formatear:
+        return cuerpos, dvs
+    return formatear_ruts(cuerpos, dvs)
+
+def _cuerpos_validos(cuerpos, grupo_impar):
+    """Cuerpos cuyos dígitos generan una elipse válida (a y b mayores que 0)"""
+    _, validos = flota_desde_digitos(digitos_desde_cuerpos(cuerpos), grupo_impar)
+    return cuerpos[validos]
+
+def generar_flota_sintetica(n, semilla=None, densidad=0.05, tasa_colision=0.1, grupo_impar=True):
+    """
+    Genera un escenario de carga: n RUTs válidos y sus elipses.
+    - Los semiejes y la orientación salen de los dígitos del RUT (mismas reglas del proyecto)
+    - Los centros se reparten en un cuadrado de lado sqrt(n / densidad) (drones por unidad de área)
+    - Una fracción tasa_colision de drones se ubica intencionalmente en colisión con otro
+      (además de las colisiones accidentales propias de la densidad)
+    Devuelve (flota, cuerpos, dvs) con exactamente n drones: los RUTs que no generan elipse
+    (semieje nulo) se reemplazan por otros nuevos.
+    """
+    rng = np.random.default_rng(semilla)
+    cuerpos = _cuerpos_validos(generar_cuerpos_ruts(n, rng), grupo_impar)
+    while len(cuerpos) < n:
+        nuevos = generar_cuerpos_ruts(2 * (n - len(cuerpos)), rng)
+        nuevos = _cuerpos_validos(nuevos[~np.isin(nuevos, cuerpos)], grupo_impar)
+        cuerpos = np.concatenate((cuerpos, nuevos[:n - len(cuerpos)]))
+    dvs = calcular_dv_lote(cuerpos)
+    flota, _ = flota_desde_digitos(digitos_desde_cuerpos(cuerpos), grupo_impar)
+
+    # Distribución espacial uniforme según la densidad pedida
+    lado = np.sqrt(n / densidad) if n else 0.0
+    h = rng.uniform(0, lado, n)
+    k = rng.uniform(0, lado, n)
+
+    # Colisiones forzadas: ubicar al dron dentro del radio efectivo combinado de un compañero
+    forzados = np.flatnonzero(rng.random(n) < tasa_colision)
+    bases = np.setdiff1d(np.arange(n), forzados)
+    if len(forzados) and len(bases):
+        companeros = rng.choice(bases, size=len(forzados))
+        radios = flota.radios_efectivos()
+        distancia = rng.random(len(forzados)) * (radios[forzados] + radios[companeros])
+        angulo = rng.uniform(0, 2 * np.pi, len(forzados))
+        h[forzados] = h[companeros] + distancia * np.cos(angulo)
+        k[forzados] = k[companeros] + distancia * np.sin(angulo)
+
+    return ElipseFleet(h, k, flota.a, flota.b, flota.horizontal), cuerpos, dvs
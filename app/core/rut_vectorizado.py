@@ -0,0 +1,125 @@
+# core/rut_vectorizado.py
+"""
+Procesamiento masivo de RUTs con NumPy:
+- Conversión de una columna completa de RUTs a una matriz de dígitos (N, 8)
+- Los RUTs inválidos se informan con una máscara, sin lanzar excepciones
+- Validación del dígito verificador (módulo 11) con un vector de pesos precalculado
+
+Pensado para cargas nocturnas con millones de RUTs de operadores.
+"""
+
+import numpy as np
+
+BLOQUE_RUTS = 1_000_000  # Filas procesadas por bloque para acotar la memoria
+
+# Factores del módulo 11 leyendo el cuerpo de derecha a izquierda: 2, 3, 4, 5, 6, 7, 2, 3, ...
+CICLO_PESOS = np.array([2, 3, 4, 5, 6, 7], dtype=np.int64)
+ANCHO_CUERPO = 10  # Dígitos máximos del cuerpo al trabajar con números enteros
+PESOS_DV = CICLO_PESOS[np.arange(ANCHO_CUERPO) % 6][::-1].copy()  # Alineados a la derecha
+POTENCIAS_10 = 10 ** np.arange(ANCHO_CUERPO - 1, -1, -1, dtype=np.int64)
+
+# Dígito verificador según (suma % 11): resto = 11 - (suma % 11), 11 -> '0', 10 -> 'K'
+TABLA_DV = np.array(list("0K987654321"))
+
+
+def _matriz_codigos(ruts):
+    """Devuelve los caracteres de cada RUT como matriz (N, L) de códigos Unicode (relleno con 0)"""
+    arreglo = np.asarray(ruts, dtype=np.str_)
+    if arreglo.ndim != 1:
+        arreglo = arreglo.reshape(-1)
+    largo = max(arreglo.dtype.itemsize // 4, 1)
+    return arreglo.view(np.uint32).reshape(len(arreglo), largo)
+
+
+def _digitos_bloque(codigos, cantidad):
+    """Extrae los primeros `cantidad` dígitos ASCII de cada fila de la matriz de códigos"""
+    es_digito = (codigos >= 48) & (codigos <= 57)
+    rango = np.cumsum(es_digito, axis=1, dtype=np.int32)
+    validos = rango[:, -1] >= cantidad
+
+    filas = np.arange(len(codigos))
+    digitos = np.zeros((len(codigos), cantidad), dtype=np.int8)
+    for d in range(cantidad):
+        # La posición del dígito d+1 es la primera columna donde el conteo llega a d+1
+        columna = np.argmax(rango == d + 1, axis=1)
+        digitos[:, d] = codigos[filas, columna] - 48
+    digitos[~validos] = 0
+    return digitos, validos
+
+
+def ruts_a_matriz_digitos(ruts, cantidad=8, bloque=BLOQUE_RUTS):
+    """
+    Convierte una columna de RUTs (strings en cualquier formato) en:
+    - digitos: matriz int8 (N, cantidad) con los primeros dígitos de cada RUT
+    - validos: máscara booleana (N,), False si el RUT tiene menos de `cantidad` dígitos
+    Solo se consideran dígitos ASCII (0-9); el resto de caracteres se ignora.
+    """
+    codigos = _matriz_codigos(ruts)
+    n = len(codigos)
+    digitos = np.zeros((n, cantidad), dtype=np.int8)
+    validos = np.zeros(n, dtype=bool)
+
+    for inicio in range(0, n, bloque):
+        fin = min(inicio + bloque, n)
+        digitos[inicio:fin], validos[inicio:fin] = _digitos_bloque(codigos[inicio:fin], cantidad)
+
+    return digitos, validos
+
+
+def digitos_desde_cuerpos(cuerpos, cantidad=8):
+    """Matriz (N, cantidad) int8 con los dígitos de cuerpos enteros (alineados a la derecha)"""
+    cuerpos = np.asarray(cuerpos, dtype=np.int64).reshape(-1)
+    return ((cuerpos[:, None] // POTENCIAS_10[-cantidad:]) % 10).astype(np.int8)
+
+
+def calcular_dv_lote(cuerpos):
+    """
+    Calcula el dígito verificador de un arreglo de cuerpos de RUT (enteros sin DV).
+    Devuelve un arreglo de strings de un carácter ('0'-'9' o 'K').
+    """
+    cuerpos = np.asarray(cuerpos, dtype=np.int64).reshape(-1)
+    digitos = (cuerpos[:, None] // POTENCIAS_10) % 10
+    return TABLA_DV[(digitos @ PESOS_DV) % 11]
+
+
+def validar_ruts(ruts, bloque=BLOQUE_RUTS):
+    """
+    Valida sintácticamente una columna de RUTs (formato y dígito verificador).
+    Equivale a aplicar es_rut_valido a cada RUT: se ignoran '.' y '-', el cuerpo
+    debe tener al menos 8 dígitos y el DV puede venir en minúscula.
+    Devuelve una máscara booleana (N,).
+    """
+    codigos = _matriz_codigos(ruts)
+    n = len(codigos)
+    validos = np.zeros(n, dtype=bool)
+
+    for inicio in range(0, n, bloque):
+        fin = min(inicio + bloque, n)
+        validos[inicio:fin] = _validar_bloque(codigos[inicio:fin])
+
+    return validos
+
+
+def _validar_bloque(codigos):
+    """Valida un bloque (N, L) de códigos Unicode de RUTs"""
+    # Caracteres relevantes: todo excepto '.', '-' y el relleno
+    relevante = (codigos != 0) & (codigos != ord(".")) & (codigos != ord("-"))
+    cantidad = relevante.sum(axis=1)
+
+    # Posición contada desde el final: 0 es el DV, 1 el último dígito del cuerpo, ...
+    desde_final = cantidad[:, None] - np.cumsum(relevante, axis=1)
+    cuerpo = relevante & (desde_final > 0)
+
+    es_digito = (codigos >= 48) & (codigos <= 57)
+    cuerpo_numerico = ~np.any(cuerpo & ~es_digito, axis=1)
+
+    pesos = np.where(cuerpo, CICLO_PESOS[(desde_final - 1) % 6], 0)
+    suma = np.sum(np.where(cuerpo & es_digito, codigos.astype(np.int64) - 48, 0) * pesos, axis=1)
+    esperado = TABLA_DV[suma % 11].view(np.uint32)
+
+    # DV ingresado (último carácter relevante), en mayúscula
+    ultima = codigos.shape[1] - 1 - np.argmax(relevante[:, ::-1], axis=1)
+    dv = codigos[np.arange(len(codigos)), ultima]
+    dv = np.where(dv == ord("k"), ord("K"), dv)
+
+    return (cantidad >= 9) & cuerpo_numerico & (dv == esperado)
@@ -0,0 +1,317 @@
+'''
+# Tests para la detección de colisiones sobre flotas completas
+'''
+from time import perf_counter
+import numpy as np
+from core.rut_aleatorio import generar_flota_sintetica
+from core.collision.CollisionDetection import hay_colision_mejorada
+from core.collision.SpatialIndex import pares_en_colision
+
+FLOTA, _, _ = generar_flota_sintetica(300, semilla=3, densidad=0.02, tasa_colision=0.2)
+
+def _pares_fuerza_bruta(flota):
+    vistas = list(flota)
+    return [(i, j) for i in range(len(vistas)) for j in range(i + 1, len(vistas))
+            if hay_colision_mejorada(vistas[i], vistas[j])]
+
+def test_fase_amplia_igual_a_fuerza_bruta():
+    i, j = pares_en_colision(FLOTA)
+    esperados = _pares_fuerza_bruta(FLOTA)
+    assert len(esperados) > 0
+    assert list(zip(i.tolist(), j.tolist())) == esperados
+
+def test_fase_amplia_flota_pequena():
+    i, j = pares_en_colision(FLOTA[:1])
+    assert len(i) == len(j) == 0
+
+def test_colision_exacta_casos_conocidos():
+    from core.Math_ellipse import Elipse
+    from core.collision.CollisionDetection import colision_exacta
+    unitario = Elipse(0, 0, 1, 1, "horizontal")
+    assert colision_exacta(unitario, Elipse(2, 0, 1, 1, "horizontal"))[0]        # tangentes
+    assert not colision_exacta(unitario, Elipse(2.001, 0, 1, 1, "horizontal"))[0]
+    assert colision_exacta(Elipse(0, 0, 5, 4, "horizontal"), unitario)[0]        # inclusión
+    # Elipses alargadas paralelas: el radio efectivo dice colisión, pero están separadas
+    colision, margen = colision_exacta(Elipse(0, 0, 5, 1, "vertical"), Elipse(2.5, 0, 5, 1, "vertical"))
+    assert not colision and margen > 0
+
+def test_colision_exacta_sin_falsos_negativos():
+    from core.collision.CollisionDetection import colision_exacta_flota
+    i, j = np.triu_indices(60, 1)
+    colision, _ = colision_exacta_flota(FLOTA, i, j)
+    perimetros = FLOTA.calcular_puntos(2000)
+    sx, sy = FLOTA.semiejes_xy()
+    for p, (a, b) in enumerate(zip(i.tolist(), j.tolist())):
+        dentro_b = (((perimetros[a, :, 0] - FLOTA.h[b]) / sx[b])**2 + ((perimetros[a, :, 1] - FLOTA.k[b]) / sy[b])**2 <= 1).any()
+        dentro_a = (((perimetros[b, :, 0] - FLOTA.h[a]) / sx[a])**2 + ((perimetros[b, :, 1] - FLOTA.k[a]) / sy[a])**2 <= 1).any()
+        if dentro_a or dentro_b:
+            assert colision[p]
+
+def test_distancia_minima_precisa():
+    from core.Math_ellipse import Elipse
+    from core.collision.CollisionDetection import distancia_minima_entre_elipses
+    from core.collision.DistanceSolver import distancia_minima_precisa, distancias_minimas_flota
+    unitario = Elipse(0, 0, 1, 1, "horizontal")
+    distancia, p1, p2 = distancia_minima_precisa(unitario, Elipse(5, 0, 2, 1, "horizontal"))
+    assert abs(distancia - 2) < 1e-9
+    assert np.allclose(p1, (1, 0)) and np.allclose(p2, (3, 0))
+    assert distancia_minima_precisa(unitario, Elipse(0.5, 0, 1, 1, "horizontal"))[0] == 0.0
+
+    e1, e2 = Elipse(0, 0, 5, 2, "vertical"), Elipse(9, 4, 4, 1, "horizontal")
+    precisa = distancia_minima_precisa(e1, e2)[0]
+    assert precisa <= distancia_minima_entre_elipses(e1, e2) < precisa + 0.05
+    i, j = np.array([0, 1]), np.array([1, 2])
+    lote, _, _ = distancias_minimas_flota([unitario, e1, e2], i, j)
+    assert abs(lote[1] - precisa) < 1e-9
+
+def test_puntos_interseccion_algebraicos():
+    from core.Math_ellipse import Elipse
+    from core.collision.IntersectionPoints import puntos_interseccion_algebraicos, puntos_interseccion_flota
+    unitario = Elipse(0, 0, 1, 1, "horizontal")
+    puntos = sorted(puntos_interseccion_algebraicos(unitario, Elipse(1, 0, 1, 1, "horizontal")))
+    assert np.allclose(puntos, [(0.5, -np.sqrt(3) / 2), (0.5, np.sqrt(3) / 2)], atol=1e-12)
+    assert len(puntos_interseccion_algebraicos(Elipse(0, 0, 2, 1, "horizontal"), Elipse(0, 0, 2, 1, "vertical"))) == 4
+    assert puntos_interseccion_algebraicos(unitario, Elipse(5, 0, 1, 1, "horizontal")) == []
+    assert puntos_interseccion_algebraicos(unitario, unitario) == []
+
+    # Todos los puntos de la flota satisfacen ambas ecuaciones
+    i, j = pares_en_colision(FLOTA)
+    puntos, cantidad = puntos_interseccion_flota(FLOTA, i, j)
+    sx, sy = FLOTA.semiejes_xy()
+    for indices in (i, j):
+        residuo = (((puntos[:, :, 0] - FLOTA.h[indices, None]) / sx[indices, None])**2 +
+                   ((puntos[:, :, 1] - FLOTA.k[indices, None]) / sy[indices, None])**2 - 1)
+        assert np.nanmax(np.abs(residuo)) < 1e-9
+    assert set(np.unique(cantidad)) <= {0, 1, 2, 3, 4}
+
+def test_matriz_colisiones_por_bloques():
+    from core.collision.CollisionMatrix import matriz_colisiones, pares_colisiones_matriz, contar_colisiones
+    esperados = _pares_fuerza_bruta(FLOTA)
+    colision, distancias, suma_radios = matriz_colisiones(FLOTA, bloque=64)
+    assert np.array_equal(colision, colision.T) and not colision.diagonal().any()
+    assert sorted(zip(*np.nonzero(np.triu(colision)))) == esperados
+    assert np.array_equal(colision, (distancias < suma_radios) & ~np.eye(len(FLOTA), dtype=bool))
+    i, j = pares_colisiones_matriz(FLOTA, bloque=70)
+    assert list(zip(i.tolist(), j.tolist())) == esperados
+    assert contar_colisiones(FLOTA, bloque=50) == len(esperados)
+
+def test_cache_pares_lru():
+    from core.Math_ellipse import Elipse
+    from core.collision.CollisionCache import CachePares
+    llamadas = []
+    def calcular(e1, e2):
+        llamadas.append((e1.h, e2.h))
+        return len(llamadas)
+
+    cache = CachePares(maxsize=2)
+    e = [Elipse(i, 0, 2, 1, "horizontal") for i in range(3)]
+    assert cache.obtener(e[0], e[1], calcular) == cache.obtener(Elipse(0, 0, 2, 1, "horizontal"), e[1], calcular)
+    cache.obtener(e[1], e[2], calcular)
+    cache.obtener(e[0], e[2], calcular)          # descarta (e0, e1)
+    cache.obtener(e[0], e[1], calcular)
+    assert len(llamadas) == 4 and len(cache) == 2
+    assert cache.estadisticas()['aciertos'] == 1 and cache.estadisticas()['fallos'] == 4
+
+def test_analisis_perezoso_compatible_con_dict():
+    from core.Math_ellipse import Elipse
+    from core.collision.CollisionAnalysis import analizar_colision_detallada
+    e1, e2 = Elipse(0, 0, 2, 1, "horizontal"), Elipse(0, 0, 2, 1, "vertical")
+    analisis = analizar_colision_detallada(e1, e2)
+    assert analisis['tipo'] != "Sin colisión"
+    assert not analisis.calculado('puntos_interseccion')
+    e1.h = 50                                        # el resultado no depende de cambios posteriores
+    assert analisis['numero_puntos_interseccion'] == 4
+    assert analisis.calculado('puntos_interseccion_str')
+    assert analisis.get('no_existe', 7) == 7 and len(dict(analisis)) == len(analisis)
+
+def test_pipeline_por_etapas_igual_a_prueba_exacta():
+    from core.collision.CollisionPipeline import PipelineColisiones
+    from core.collision.CollisionDetection import colision_exacta_flota
+    pipeline = PipelineColisiones()
+    i, j = pipeline.pares_en_colision(FLOTA)
+    todos_i, todos_j = np.triu_indices(len(FLOTA), k=1)
+    colision, _ = colision_exacta_flota(FLOTA, todos_i, todos_j)
+    assert list(zip(i, j)) == list(zip(todos_i[colision], todos_j[colision]))
+
+    resumen = pipeline.resumen()
+    assert sum(etapa['decididos'] for etapa in resumen) == len(todos_i)
+    assert resumen[-1]['evaluados'] == resumen[-1]['decididos']
+
+def test_pipeline_semiejes_con_a_menor_que_b():
+    from core.Math_ellipse import Elipse
+    from core.collision.CollisionPipeline import PipelineColisiones
+    from core.collision.CollisionDetection import colision_exacta
+    # a < b: la elipse se extiende 5 unidades en Y aunque a = 1
+    elipses = [Elipse(0, 0, 1, 5, "horizontal"), Elipse(0, 5.5, 1, 1, "horizontal")]
+    assert colision_exacta(*elipses)[0]
+    i, j = PipelineColisiones().pares_en_colision(elipses)
+    assert list(zip(i.tolist(), j.tolist())) == [(0, 1)]
+
+def test_analisis_paralelo_mismo_orden_que_secuencial():
+    from core.collision.CollisionAnalysis import analizar_colision_detallada
+    from core.collision.ParallelAnalysis import analizar_pares_paralelo
+    i, j = pares_en_colision(FLOTA)
+    i, j = i[:300], j[:300]
+    inicio = perf_counter()
+    secuencial = [dict(r) for r in analizar_pares_paralelo(FLOTA, i, j, analizar_colision_detallada, trabajadores=1)]
+    tiempo_secuencial = perf_counter() - inicio
+    paralelo = list(analizar_pares_paralelo(FLOTA, i, j, analizar_colision_detallada, trabajadores=2, tamano_bloque=64))
+
+    # Los trabajadores devuelven los análisis completos: leerlos no recalcula nada en este proceso
+    assert all(r.calculado(clave) for r in paralelo for clave in r)
+    inicio = perf_counter()
+    leidos = [dict(r) for r in paralelo]
+    assert perf_counter() - inicio < 0.1 * tiempo_secuencial
+    assert leidos == secuencial
+
+def test_seguidor_incremental_igual_a_reevaluar_todo():
+    from core.Math_ellipse import Elipse
+    from core.collision.CollisionTracker import SeguidorColisiones
+    elipses = FLOTA.a_lista()
+    seguidor = SeguidorColisiones(dict(enumerate(elipses)))
+    assert seguidor.colisiones() == _pares_fuerza_bruta(FLOTA)
+
+    rng = np.random.default_rng(0)
+    for n in rng.choice(len(elipses), size=40, replace=False).tolist():
+        e = elipses[n]
+        elipses[n] = Elipse(e.h + rng.uniform(-8, 8), e.k + rng.uniform(-8, 8), e.a, e.b, e.orientacion)
+        seguidor.actualizar(n, elipses[n])
+    seguidor.eliminar(0)
+    esperados = [(i + 1, j + 1) for i, j in _pares_fuerza_bruta(elipses[1:])]
+    assert seguidor.colisiones() == esperados
+    assert seguidor.total_colisiones() == len(esperados)
+
+def test_grafo_colisiones_y_clusters():
+    from core.collision.CollisionGraph import GrafoColisiones
+    from core.collision.CollisionResolver import resolver_colisiones_por_cluster
+    grafo = GrafoColisiones.desde_flota(FLOTA)
+    esperados = _pares_fuerza_bruta(FLOTA)
+    i, j = grafo.aristas()
+    assert list(zip(i.tolist(), j.tolist())) == esperados
+    assert grafo.numero_colisiones == len(esperados)
+    assert grafo.grados()[grafo.ranking_grados(1)[0]] == grafo.grados().max()
+    assert set(grafo.vecinos(i[0]).tolist()) == {b for a, b in esperados if a == i[0]} | {a for a, b in esperados if b == i[0]}
+
+    clusters = grafo.clusters()
+    en_conflicto = np.zeros(len(FLOTA), dtype=bool)
+    for indices in clusters:
+        en_conflicto[indices] = True
+    assert set(np.flatnonzero(en_conflicto).tolist()) == {p for par in esperados for p in par}
+
+    resuelta = resolver_colisiones_por_cluster(FLOTA, max_rondas=1)
+    assert np.array_equal(resuelta.h[~en_conflicto], FLOTA.h[~en_conflicto])
+
+def test_modo_columnar_igual_a_diccionarios():
+    from core.collision.CollisionTable import filas_legibles
+    from components.simulador import analizar_colisiones_detallado
+    from core.collision.CollisionPipeline import PipelineColisiones
+    sub = FLOTA[:80]
+    ruts = [f"rut{n}" for n in range(len(sub))]
+    resultados, estadisticas = analizar_colisiones_detallado(sub, ruts)
+    tabla, estadisticas_tabla = analizar_colisiones_detallado(sub, ruts, columnar=True)
+    assert estadisticas_tabla == estadisticas
+    assert estadisticas['colisiones_geometricas'] == len(PipelineColisiones().pares_en_colision(sub)[0])
+    esperadas = [r for r in resultados if r['colision']]
+    assert len(tabla) == len(esperadas)
+    for fila, r in zip(filas_legibles(tabla, ruts), esperadas):
+        assert (fila['id1'], fila['id2'], fila['tipo']) == (r['rut1'], r['rut2'], r['tipo'])
+        for clave in ('nivel_riesgo', 'distancia_centros', 'suma_radios_maximos', 'porcentaje_solapamiento'):
+            assert fila[clave] == r['analisis_completo'][clave]
+
+def test_clasificacion_vectorizada_igual_a_escalar():
+    from core.Fleet_ellipse import ElipseFleet
+    from core.collision.CollisionAnalysis import analizar_colision_detallada, tipo_colision
+    from core.collision.CollisionClassification import (clasificar_lote, etiquetas, estadisticas_tipos,
+                                                        NIVELES_RIESGO, TIPOS_COLISION)
+    rng = np.random.default_rng(5)
+    # Coordenadas enteras pequeñas: incluye centros coincidentes y casos en el límite
+    flota = ElipseFleet(rng.integers(0, 6, 120), rng.integers(0, 6, 120), rng.integers(4, 9, 120),
+                        rng.integers(1, 5, 120), rng.random(120) < 0.5)
+    i, j = np.triu_indices(len(flota), k=1)
+    tipos, riesgos = clasificar_lote(flota, i, j)
+    vistas = list(flota)
+    for p, q, tipo, riesgo in zip(i.tolist(), j.tolist(), etiquetas(tipos), etiquetas(riesgos, NIVELES_RIESGO)):
+        assert tipo == tipo_colision(vistas[p], vistas[q])
+        assert riesgo == analizar_colision_detallada(vistas[p], vistas[q])['nivel_riesgo']
+    assert set(tipos.tolist()) == set(range(len(TIPOS_COLISION)))
+
+    estadisticas = estadisticas_tipos(tipos[tipos > 0], len(i))
+    assert estadisticas['sin_colision'] == int((tipos == 0).sum())
+    assert sum(estadisticas.values()) == 2 * len(i)
+
+def test_colision_elipsoides_esferas_y_fase_amplia():
+    from core.collision.Collision3D import colision_elipsoides_lote, pares_colision_3d
+    rng = np.random.default_rng(8)
+    # Esferas: colisión si y solo si la distancia es menor que la suma de radios
+    c1, c2 = rng.uniform(-3, 3, (500, 3)), rng.uniform(-3, 3, (500, 3))
+    r1, r2 = rng.uniform(0.3, 2, 500), rng.uniform(0.3, 2, 500)
+    colision = colision_elipsoides_lote(c1, np.repeat(r1[:, None], 3, 1), c2, np.repeat(r2[:, None], 3, 1))
+    assert np.array_equal(colision, np.linalg.norm(c1 - c2, axis=1) < r1 + r2)
+
+    # Elipsoides alargados en x: se tocan a lo largo de x pero no en diagonal
+    s = np.array([[3.0, 1.0, 1.0]])
+    assert colision_elipsoides_lote(np.zeros((1, 3)), s, np.array([[5.5, 0, 0]]), s)[0]
+    assert not colision_elipsoides_lote(np.zeros((1, 3)), s, np.array([[0, 2.5, 0]]), s)[0]
+
+    # La fase amplia no pierde pares respecto de la prueba exacta sobre todos los pares
+    centros, semiejes = rng.uniform(0, 20, (300, 3)), rng.uniform(0.3, 2, (300, 3))
+    i, j = pares_colision_3d(centros, semiejes)
+    ii, jj = np.triu_indices(300, k=1)
+    todos = colision_elipsoides_lote(centros[ii], semiejes[ii], centros[jj], semiejes[jj])
+    assert len(i) > 0
+    assert np.array_equal(i, ii[todos]) and np.array_equal(j, jj[todos])
+
+def test_colisiones_3d_por_altitud():
+    from core.Math_ellipse import Elipse
+    from core.collision.Collision3D import colisiones_3d
+    from core.collision.CollisionDetection import distancia_centros
+    elipses = [Elipse(0, 0, 2, 1, "horizontal"), Elipse(3.5, 0, 2, 1, "horizontal")]
+    assert colisiones_3d(elipses)[0].tolist() == [0]
+    assert len(colisiones_3d(elipses, altitudes=[0, 2.5])[0]) == 0
+    assert len(colisiones_3d(elipses, altitudes=[0, 2.5], semieje_vertical=3)[0]) == 1
+    assert distancia_centros(elipses[0], elipses[1], dimensiones=3) == 3.5
+    assert distancia_centros(elipses[0], elipses[1], dimensiones=3, altitudes=(4, 16)) == np.sqrt(3.5**2 + 12**2)
+    assert distancia_centros(elipses[0], elipses[1], altitudes=(4, 16)) == 3.5
+
+def test_cache_pares_entre_hilos():
+    from concurrent.futures import ThreadPoolExecutor
+    from core.Math_ellipse import Elipse
+    from core.collision.CollisionCache import CachePares
+    cache = CachePares(maxsize=50)
+    e = [Elipse(i, 0, 2, 1, "horizontal") for i in range(40)]
+    def consultar(desfase):
+        for paso in range(2000):
+            i = (paso * 7 + desfase) % 39
+            cache.obtener(e[i], e[i + 1], lambda e1, e2: e1.h)
+    with ThreadPoolExecutor(8) as ejecutor:
+        list(ejecutor.map(consultar, range(8)))
+    estadisticas = cache.estadisticas()
+    assert estadisticas['aciertos'] + estadisticas['fallos'] == 16000
+    assert len(cache) <= 50
+
+def test_analisis_multiple_columnar_solo_pares_candidatos():
+    from core.collision.CollisionAnalysis import analizar_multiples_colisiones
+    from core.collision.CollisionTable import tabla_resultados
+    from core.collision.SpatialIndex import pares_candidatos
+    sub = FLOTA[:120]
+    columnar = analizar_multiples_colisiones(sub, columnar=True)
+    detallado = analizar_multiples_colisiones(sub)
+    tabla = columnar['tabla']
+    i, j = pares_candidatos(sub)
+    assert len(tabla) == len(i) < len(sub) * (len(sub) - 1) // 2
+    assert columnar['estadisticas'] == detallado['estadisticas']
+
+    # Los pares fuera de la fase amplia no tienen colisión
+    todos_i, todos_j = np.triu_indices(len(sub), k=1)
+    completa = tabla_resultados(sub, todos_i, todos_j)
+    assert np.array_equal(completa[completa['colision']], tabla[tabla['colision']])
+
+def test_pipeline_compartido_entre_hilos():
+    from concurrent.futures import ThreadPoolExecutor
+    from core.collision.CollisionPipeline import PipelineColisiones
+    pipeline = PipelineColisiones()
+    sub = FLOTA[:60]
+    with ThreadPoolExecutor(8) as ejecutor:
+        list(ejecutor.map(lambda _: pipeline.evaluar(sub), range(200)))
+    resumen = {fila['etapa']: fila for fila in pipeline.resumen()}
+    assert resumen['fase_amplia']['evaluados'] == 200 * len(sub) * (len(sub) - 1) // 2
@@ -0,0 +1,69 @@
+'''
+# Tests para la flota vectorizada de elipses
+'''
+import numpy as np
+import pytest
+from core.Math_ellipse import Elipse
+from core.Fleet_ellipse import ElipseFleet, como_flota
+from core.collision.CollisionResolver import resolver_colisiones_automatico
+from core.collision.CollisionAnalysis import analizar_multiples_colisiones
+
+ELIPSES = [
+    Elipse(0, 0, 5, 3, "horizontal"),
+    Elipse(4, 1, 4, 2, "vertical"),
+    Elipse(20, 20, 3, 1, "horizontal"),
+    Elipse(1, 2, 6, 4, "vertical"),
+]
+
+def test_vista_compatible_con_elipse():
+    flota = como_flota(ELIPSES)
+    assert len(flota) == 4
+    vista = flota[1]
+    assert (vista.h, vista.k, vista.a, vista.b, vista.orientacion) == (4, 1, 4, 2, "vertical")
+    assert vista.ecuacion_general() == ELIPSES[1].ecuacion_general()
+    vista.h = 7.5
+    assert flota.h[1] == 7.5
+    assert flota[1:3].h.tolist() == [7.5, 20.0]
+
+def test_flota_rechaza_semiejes_invalidos():
+    with pytest.raises(ValueError):
+        ElipseFleet([0], [0], [0], [1], [True])
+
+def test_resolver_flota_igual_a_lista():
+    resueltas_lista = resolver_colisiones_automatico(ELIPSES)
+    resueltas_flota = resolver_colisiones_automatico(como_flota(ELIPSES))
+    assert isinstance(resueltas_flota, ElipseFleet)
+    assert np.array_equal(resueltas_flota.h, [e.h for e in resueltas_lista])
+    assert np.array_equal(resueltas_flota.k, [e.k for e in resueltas_lista])
+
+def test_analisis_multiple_acepta_flota():
+    desde_lista = analizar_multiples_colisiones(ELIPSES)
+    desde_flota = analizar_multiples_colisiones(como_flota(ELIPSES))
+    assert desde_lista['matriz_colisiones'] == desde_flota['matriz_colisiones']
+    assert desde_lista['estadisticas'] == desde_flota['estadisticas']
+
+def test_muestreo_vectorizado_de_perimetros():
+    from core.Math_ellipse import tabla_trigonometrica
+    puntos = ELIPSES[1].calcular_puntos(8)
+    assert puntos.shape == (8, 2)
+    # vertical: el semieje mayor queda sobre Y
+    assert np.allclose(puntos[0], (4 + 2, 1)) and np.allclose(puntos[2], (4, 1 + 4))
+    perimetros = como_flota(ELIPSES).calcular_puntos(8)
+    assert perimetros.shape == (4, 8, 2)
+    assert np.allclose(perimetros[1], puntos)
+    assert tabla_trigonometrica(8) is tabla_trigonometrica(8)
+
+def test_generacion_masiva_igual_a_individual():
+    from core.Math_ellipse import generar_elipse_desde_rut
+    from core.Fleet_ellipse import generar_flota_desde_ruts
+    ruts = ["12.345.678-5", "9.876.543-2", "123", "10.000.000-0", "21.043.987-K", "7.654.321"]
+    for grupo_impar in (True, False):
+        flota, validos = generar_flota_desde_ruts(ruts, grupo_impar)
+        esperadas = []
+        for rut in ruts:
+            try:
+                esperadas.append(generar_elipse_desde_rut(rut, grupo_impar))
+            except ValueError:
+                pass
+        assert flota.a_lista() == esperadas
+        assert validos.tolist() == [True, True, False, False, True, False]
@@ -0,0 +1,152 @@
+'''
+# Tests para los algoritmos de resolución de colisiones
+'''
+import itertools
+import numpy as np
+import pytest
+from core.Math_ellipse import Elipse
+from core.rut_aleatorio import generar_flota_sintetica
+from core.collision.CollisionDetection import hay_colision_mejorada
+from core.collision.SpatialIndex import pares_candidatos, pares_en_colision
+from core.collision.CollisionResolver import resolver_colisiones_automatico, separar_elipses, verificar_resolucion
+
+FLOTA, _, _ = generar_flota_sintetica(150, semilla=12, densidad=0.03, tasa_colision=0.3)
+
+def _resolver_referencia(elipses, max_iter=100, factor_ajuste=0.3, margen_seguridad=1.1):
+    """Algoritmo original: doble bucle con hay_colision_mejorada y separar_elipses"""
+    elipses = [Elipse(e.h, e.k, e.a, e.b, e.orientacion) for e in elipses]
+    for iteracion in range(max_iter):
+        pares = [(i, j) for i in range(len(elipses)) for j in range(i + 1, len(elipses))
+                 if hay_colision_mejorada(elipses[i], elipses[j])]
+        if not pares:
+            break
+        factor_actual = factor_ajuste * (1 + iteracion / max_iter)
+        for i, j in pares:
+            separar_elipses(elipses[i], elipses[j], factor_actual, margen_seguridad)
+    return elipses
+
+def test_resolvedor_indexado_igual_al_original():
+    elipses = FLOTA.a_lista() + [Elipse(FLOTA.h[0], FLOTA.k[0], 3, 2, "vertical")]  # centros coincidentes
+    esperadas = _resolver_referencia(elipses)
+    resueltas = resolver_colisiones_automatico(elipses)
+    assert [(e.h, e.k) for e in resueltas] == [(e.h, e.k) for e in esperadas]
+    assert verificar_resolucion(resueltas)
+
+def test_resolvedor_vectorizado_independiente_del_orden():
+    from core.collision.CollisionResolver import resolver_colisiones
+    flota, _, _ = generar_flota_sintetica(300, semilla=2, densidad=0.001, tasa_colision=0.3)
+    resuelta = resolver_colisiones(flota, modo='vectorizado')
+    assert verificar_resolucion(resuelta)
+
+    permutacion = np.random.default_rng(0).permutation(len(flota))
+    permutada = resolver_colisiones(flota[permutacion], modo='vectorizado')
+    assert np.allclose(permutada.h, resuelta.h[permutacion]) and np.allclose(permutada.k, resuelta.k[permutacion])
+
+def test_modo_de_resolucion_desconocido():
+    from core.collision.CollisionResolver import resolver_colisiones
+    with pytest.raises(ValueError):
+        resolver_colisiones(FLOTA, modo='magico')
+
+def test_resolvedor_optimizado_desplaza_menos():
+    from core.collision.CollisionResolver import resolver_colisiones, obtener_estadisticas_resolucion
+    flota, _, _ = generar_flota_sintetica(300, semilla=1, densidad=0.001, tasa_colision=0.3)
+    originales = flota.a_lista()
+    heuristica = resolver_colisiones(flota, margen_seguridad=1.1)
+    optimizada = resolver_colisiones(flota, modo='optimizado', margen_seguridad=1.1)
+    estadisticas_heuristica = obtener_estadisticas_resolucion(originales, heuristica.a_lista())
+    estadisticas_optimizada = obtener_estadisticas_resolucion(originales, optimizada.a_lista())
+    assert estadisticas_optimizada['colisiones_resueltas']
+    assert estadisticas_optimizada['desplazamiento_promedio'] < estadisticas_heuristica['desplazamiento_promedio']
+
+    # Con el mismo margen, la holgura final del optimizador no es menor que la de la heurística
+    def holgura_minima(resuelta):
+        i, j = pares_candidatos(resuelta)
+        radios = resuelta.radios_efectivos()
+        return np.min(np.hypot(resuelta.h[i] - resuelta.h[j], resuelta.k[i] - resuelta.k[j]) / (radios[i] + radios[j]))
+    assert holgura_minima(optimizada) >= holgura_minima(heuristica)
+
+def test_resolvedor_optimizado_sin_plazo_usa_la_heuristica():
+    from core.collision.CollisionResolver import resolver_colisiones
+    flota, _, _ = generar_flota_sintetica(300, semilla=1, densidad=0.001, tasa_colision=0.3)
+    resuelta = resolver_colisiones(flota, modo='optimizado', tiempo_limite=0)
+    heuristica = resolver_colisiones_automatico(flota)
+    assert verificar_resolucion(resuelta)
+    assert np.array_equal(resuelta.h, heuristica.h) and np.array_equal(resuelta.k, heuristica.k)
+
+def test_resolvedor_optimizado_flota_densa():
+    from core.collision.CollisionOptimizer import resolver_colisiones_optimizado
+    # Casi toda la flota forma un solo cluster: la heurística no termina en max_iter
+    densa, _, _ = generar_flota_sintetica(500, semilla=0, densidad=0.004)
+    assert not verificar_resolucion(resolver_colisiones_automatico(densa))
+    assert verificar_resolucion(resolver_colisiones_optimizado(densa))
+
+def test_resolvedor_optimizado_par_simetrico():
+    from core.collision.CollisionOptimizer import resolver_colisiones_optimizado
+    # Óptimo analítico: cada dron se aleja la mitad de lo que falta a lo largo de la recta de centros
+    par = [Elipse(0, 0, 3, 1, "horizontal"), Elipse(1, 0, 3, 1, "horizontal"),
+           Elipse(50, 50, 3, 1, "horizontal"), Elipse(50, 50, 3, 1, "vertical")]
+    resueltas = resolver_colisiones_optimizado(par, margen_seguridad=1.01)
+    objetivo = (4.04 - 1) / 2
+    assert np.allclose([resueltas[0].h, resueltas[1].h], [-objetivo, 1 + objetivo], atol=1e-2)
+    assert np.allclose([resueltas[0].k, resueltas[1].k], 0, atol=1e-6)
+    assert verificar_resolucion(resueltas)
+
+def test_resolvedor_con_plazo():
+    from core.collision.CollisionResolver import resolver_colisiones_con_plazo, DTYPE_TRAZA
+    flota, _, _ = generar_flota_sintetica(300, semilla=2, densidad=0.001, tasa_colision=0.3)
+    resultado = resolver_colisiones_con_plazo(flota, tiempo_limite=60)
+    traza = resultado['traza']
+    assert resultado['motivo_parada'] == 'resuelto'
+    assert traza.dtype == DTYPE_TRAZA and traza['colisiones'][0] > 0 and traza['colisiones'][-1] == 0
+    assert np.all(np.diff(traza['tiempo']) >= 0)
+    assert verificar_resolucion(resultado['elipses_resueltas'])
+
+    # Flota imposible de resolver: se detiene por plazo o estancamiento con la mejor configuración
+    densa, _, _ = generar_flota_sintetica(300, semilla=2, densidad=0.05, tasa_colision=0.3)
+    resultado = resolver_colisiones_con_plazo(densa, tiempo_limite=0.5, paciencia=5)
+    traza = resultado['traza']
+    assert resultado['motivo_parada'] in ('plazo', 'estancado')
+    assert traza['colisiones'][resultado['mejor_iteracion']] == traza['colisiones'].min()
+    assert len(pares_en_colision(resultado['elipses_resueltas'])[0]) == traza['colisiones'].min()
+
+def test_resolucion_por_cluster_en_paralelo():
+    from core.collision.CollisionResolver import resolver_colisiones_por_cluster
+    flota, _, _ = generar_flota_sintetica(400, semilla=4, densidad=0.001, tasa_colision=0.2)
+    en_conflicto = np.zeros(len(flota), dtype=bool)
+    en_conflicto[np.concatenate(pares_en_colision(flota))] = True
+
+    secuencial = resolver_colisiones_por_cluster(flota, tamano_lote=50)
+    paralela = resolver_colisiones_por_cluster(flota, trabajadores=2, tamano_lote=50)
+    assert np.array_equal(secuencial.h, paralela.h) and np.array_equal(secuencial.k, paralela.k)
+    assert verificar_resolucion(paralela)
+
+    # Solo se movieron drones de clusters en conflicto (o fusionados con ellos)
+    movidos = (paralela.h != flota.h) | (paralela.k != flota.k)
+    assert movidos[en_conflicto].any() and movidos.sum() < len(flota)
+
+def test_resolucion_por_cluster_no_depende_del_lote():
+    from core.collision.CollisionResolver import resolver_colisiones_por_cluster
+    flota, _, _ = generar_flota_sintetica(2000, semilla=7, densidad=0.002, tasa_colision=0.2)
+    resultados = [resolver_colisiones_por_cluster(flota, tamano_lote=tamano) for tamano in (2000, 200, 20)]
+    for resultado in resultados[1:]:
+        assert np.array_equal(resultado.h, resultados[0].h) and np.array_equal(resultado.k, resultados[0].k)
+    assert verificar_resolucion(resultados[0])
+
+def test_vectorizado_converge_en_menos_iteraciones(monkeypatch):
+    from core.collision import CollisionResolver
+    iteraciones = {'secuencial': 0, 'vectorizado': 0}
+    def contar(modo, funcion):
+        def contada(*argumentos):
+            iteraciones[modo] += 1
+            return funcion(*argumentos)
+        return contada
+    monkeypatch.setattr(CollisionResolver._IndiceColisiones, 'pares',
+                        contar('secuencial', CollisionResolver._IndiceColisiones.pares))
+    monkeypatch.setattr(CollisionResolver, 'pares_en_colision',
+                        contar('vectorizado', CollisionResolver.pares_en_colision))
+
+    for densidad, semilla in itertools.product((0.0005, 0.001, 0.0015), range(4)):
+        flota, _, _ = generar_flota_sintetica(1000, semilla=semilla, densidad=densidad, tasa_colision=0.2)
+        CollisionResolver.resolver_colisiones(flota, modo='secuencial')
+        CollisionResolver.resolver_colisiones(flota, modo='vectorizado')
+    assert iteraciones['vectorizado'] < iteraciones['secuencial']
@@ -0,0 +1,38 @@
+'''
+# Tests para el procesamiento masivo de RUTs
+'''
+import numpy as np
+from core.rut_aleatorio import calcular_dv
+from core.rut_vectorizado import calcular_dv_lote, validar_ruts, ruts_a_matriz_digitos
+from components.rut_parser import es_rut_valido, separar_ruts_por_validez
+
+def test_dv_lote_coincide_con_calculo_individual():
+    cuerpos = [12345678, 7654321, 11111111, 23456789, 1, 10000013]
+    assert calcular_dv_lote(cuerpos).tolist() == ["5", "6", "1", "6", "9", "K"]
+    assert [calcular_dv(c) for c in cuerpos] == calcular_dv_lote(cuerpos).tolist()
+
+def test_validacion_masiva():
+    ruts = ["12.345.678-5", "12345678-4", "10.000.013-k", "07654321-6", "7654321-6", "1234567a-5", ""]
+    assert validar_ruts(ruts).tolist() == [True, False, True, True, False, False, False]
+    assert es_rut_valido("12.345.678-5")
+    assert separar_ruts_por_validez(["12345678-5", "12345678-4"]) == (["12345678-5"], ["12345678-4"])
+
+def test_matriz_de_digitos():
+    digitos, validos = ruts_a_matriz_digitos(["12.345.678-5", "1-9"])
+    assert digitos[0].tolist() == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert validos.tolist() == [True, False]
+    assert digitos.dtype == np.int8
+
+def test_generador_masivo_reproducible_y_valido():
+    from core.rut_aleatorio import generar_ruts_masivos, generar_flota_sintetica
+    ruts = generar_ruts_masivos(5000, semilla=42)
+    assert len(set(ruts.tolist())) == 5000
+    assert validar_ruts(ruts).all()
+    assert (generar_ruts_masivos(5000, semilla=42) == ruts).all()
+
+    flota, cuerpos, dvs = generar_flota_sintetica(500, semilla=1, tasa_colision=0.5)
+    otra, _, _ = generar_flota_sintetica(500, semilla=1, tasa_colision=0.5)
+    assert len(flota) == len(cuerpos) == len(dvs) == 500
+    assert len(set(cuerpos.tolist())) == 500 and np.all(flota.b > 0)
+    assert len(generar_flota_sintetica(10_000, semilla=3)[0]) == 10_000
+    assert np.array_equal(flota.h, otra.h) and np.array_equal(flota.k, otra.k)
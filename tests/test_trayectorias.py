@@ -0,0 +1,41 @@
+'''
+# Tests para la simulación de trayectorias
+'''
+import numpy as np
+from core.rut_aleatorio import generar_flota_sintetica
+from core.Trajectory_ellipse import SimuladorTrayectorias, resumen_conflictos
+
+def _conflictos_fuerza_bruta(trayectorias, distancia_segura):
+    pasos, n, _ = trayectorias.shape
+    distancias = np.linalg.norm(trayectorias[:, :, None, :] - trayectorias[:, None, :, :], axis=-1)
+    eventos = []
+    for i in range(n):
+        for j in range(i + 1, n):
+            conflicto = distancias[:, i, j] < distancia_segura
+            paso = 0
+            while paso < pasos:
+                if conflicto[paso]:
+                    inicio = paso
+                    while paso < pasos and conflicto[paso]:
+                        paso += 1
+                    eventos.append((inicio, i, j, paso - 1))
+                else:
+                    paso += 1
+    return sorted(eventos)
+
+def test_registro_de_conflictos_igual_a_fuerza_bruta():
+    flota, _, _ = generar_flota_sintetica(50, semilla=1, densidad=0.05, tasa_colision=0.3)
+    simulador = SimuladorTrayectorias(flota, semilla=0)
+    registro = simulador.simular(120, 3.0)
+    esperados = _conflictos_fuerza_bruta(simulador.trayectorias(120), 3.0)
+    assert len(esperados) > 0
+    assert [(int(r['inicio']), int(r['i']), int(r['j']), int(r['fin'])) for r in registro] == esperados
+    assert resumen_conflictos(registro, 120)['conflictos'] == len(esperados)
+
+def test_posiciones_sobre_la_elipse():
+    flota, _, _ = generar_flota_sintetica(30, semilla=2)
+    simulador = SimuladorTrayectorias(flota, velocidad_lineal=0.5, semilla=1)
+    sx, sy = flota.semiejes_xy()
+    posiciones = simulador.posiciones(37)
+    valores = ((posiciones[:, 0] - flota.h) / sx)**2 + ((posiciones[:, 1] - flota.k) / sy)**2
+    assert np.allclose(valores, 1)